@@ -94,13 +94,40 @@ class Participant(BaseModel):
     has_history: Optional[bool] = None
 
 
+class ChampionStats(BaseModel):
+    champion: int
+    matches: int
+    wins: int
+    losses: int
+    kills: int
+    deaths: int
+    assists: int
+    cs: int
+    total_gold: int
+    last_match_end: Optional[datetime] = None
+
+
+class SummonerStats(BaseModel):
+    puu_id: str
+    matches: int
+    wins: int
+    losses: int
+    kills: int
+    deaths: int
+    assists: int
+    cs: int
+    total_gold: int
+    streak: int
+    last_match_end: Optional[datetime] = None
+    champions: Optional[list[ChampionStats]] = None
+
+
 class MatchDetail(BaseModel):
     match_creation: datetime
     match_end: Optional[datetime] = None
     match_duration: Optional[timedelta]
     game_version: str
     winning_team_red: Optional[bool] = None
-    match_timeline: Optional[dict] = None
 
 
 class Match(BaseModel):
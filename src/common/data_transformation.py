@@ -117,3 +117,80 @@ def response_to_active_match(request: Request, r: Response) -> data_models.Match
     )
 
     return match
+
+
+def db_to_match_detail(request: Request, match_id: int, rows: list[tuple]) -> data_models.Match | None:
+    """
+    Transforms finished match stored in database to data model Match.
+    :param request: Request object from FatsAPI.
+    :param match_id: Match id.
+    :param rows: Rows returned by data.select_match, one per participant.
+    :return: Match object or None if the match isn't stored.
+    """
+    if not rows:
+        return None
+
+    match_start, match_end, winning_team_red, match_creation, game_version, game_mode, game_duration = rows[0][:7]
+    match_detail = data_models.MatchDetail(
+        match_creation=match_creation,
+        match_end=match_end,
+        game_version=game_version,
+        winning_team_red=winning_team_red,
+        match_duration=datetime.timedelta(seconds=game_duration)
+    )
+    match = data_models.Match(
+        server=request.app.SERVER,
+        match_id=match_id,
+        match_type=game_mode,
+        match_start=match_start,
+        participants=[data_models.Participant(
+            summoner=data_models.Summoner(
+                puu_id=row[7],
+                name=row[8],
+                tagline=row[9],
+                server=request.app.SERVER,
+                profile_icon=row[10],
+                summoner_level=row[11]
+            ),
+            team_red=row[12],
+            role=data_models.Role(id=row[13], name=row[14]) if row[13] else None,
+            summ_spell1=row[15],
+            summ_spell2=row[16],
+            champion=row[17],
+            mastery_points=row[18],
+            bot=row[19],
+            primary_runes=row[20],
+            secondary_runes=row[21],
+            runes=row[22],
+            small_runes=row[23],
+            stats=data_models.ParticipantStats(
+                kills=row[24],
+                deaths=row[25],
+                assists=row[26],
+                item0=row[27][0],
+                item1=row[27][1],
+                item2=row[27][2],
+                item3=row[27][3],
+                item4=row[27][4],
+                item5=row[27][5],
+                item6=row[27][6],
+                total_gold=row[28],
+                cs=row[29],
+            )
+        ) for row in rows],
+        match_detail=match_detail
+    )
+
+    return match
+
+
+def response_to_masteries(r: Response) -> list[data_models.Mastery]:
+    """
+    Transforms response from RIOT with all champion masteries of a player to list of data model Mastery.
+    :param r: Response from RIOT.
+    :return: List of Mastery objects, highest mastery first.
+    """
+    return [data_models.Mastery(
+        champion_id=mastery['championId'],
+        mastery_points=mastery['championPoints']
+    ) for mastery in r.json()]
@@ -85,7 +85,9 @@ def upsert_match(riot_match_id: int,
                  match_end: datetime,
                  winning_team_red: bool,
                  match_creation: datetime,
-                 game_version: str) -> int:
+                 game_version: str,
+                 game_mode: str = None,
+                 game_duration: int = None) -> int:
     """
     Upserts information about match.
     :param riot_match_id: Match id.
@@ -95,18 +97,22 @@ def upsert_match(riot_match_id: int,
     :param winning_team_red: True = red team won, False = blue team won, None = no winner yet.
     :param match_creation: Timestamp of match creation.
     :param game_version: Patch on which the match was played.
+    :param game_mode: Game mode as reported by RIOT, e.g. CLASSIC.
+    :param game_duration: Duration of the match in seconds as reported by RIOT.
     :return: Match id.
     """
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute('SELECT data.upsert_match(%s, %s, %s, %s, %s, %s, %s)',
+            cur.execute('SELECT data.upsert_match(%s, %s, %s, %s, %s, %s, %s, %s, %s)',
                         (riot_match_id,
                          id_server,
                          match_start,
                          match_end,
                          winning_team_red,
                          match_creation,
-                         game_version))
+                         game_version,
+                         game_mode,
+                         game_duration))
 
             fetch = cur.fetchone()[0]
             return fetch
@@ -260,6 +266,141 @@ def get_tags(riot_puu_id: str) -> list[(int, int, datetime, int, int, str)]:
             return cur.fetchall()
 
 
+@db_func
+def get_match(riot_match_id: int, id_server: int, riot_puu_id: str = None) -> list[tuple]:
+    """
+    Gets finished match stored in db, one row per participant.
+    :param riot_match_id: Match id.
+    :param id_server: Id of the server.
+    :param riot_puu_id: Puu id of a participant, if given only their row is returned.
+    :return: List of participant rows, empty if the match isn't fully stored yet.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT * FROM data.select_match(%s, %s, %s)',
+                        (riot_match_id,
+                         id_server,
+                         riot_puu_id))
+
+            return cur.fetchall()
+
+
+@db_func
+def upsert_match_timeline(riot_match_id: int, id_server: int, frames: bytes) -> bool:
+    """
+    Upserts decoded timeline of a stored match.
+    :param riot_match_id: Match id.
+    :param id_server: Id of the server.
+    :param frames: Timeline serialized by common.timeline.to_bytes.
+    :return: True if saved, False if the match isn't stored yet.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT data.upsert_match_timeline(%s, %s, %s)',
+                        (riot_match_id,
+                         id_server,
+                         frames))
+
+            return cur.fetchone()[0]
+
+
+@db_func
+def get_match_timeline(riot_match_id: int, id_server: int) -> bytes | None:
+    """
+    Gets decoded timeline of a stored match.
+    :param riot_match_id: Match id.
+    :param id_server: Id of the server.
+    :return: Timeline serialized by common.timeline.to_bytes, None if not stored.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT data.select_match_timeline(%s, %s)',
+                        (riot_match_id,
+                         id_server))
+
+            return cur.fetchone()[0]
+
+
+@db_func
+def get_riot_response(cache_key: str) -> tuple[float, int, bytes] | None:
+    """
+    Gets cached response of RIOT API.
+    :param cache_key: Key of the response, made of its URL.
+    :return: Tuple of age in seconds, status code and content, None if not cached.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT * FROM data.select_riot_response(%s)',
+                        (cache_key,))
+
+            return cur.fetchone()
+
+
+@db_func
+def upsert_riot_response(cache_key: str, status_code: int, content: bytes, max_age: int) -> bool:
+    """
+    Upserts cached response of RIOT API and deletes responses too old to be used.
+    :param cache_key: Key of the response, made of its URL.
+    :param status_code: Status code of the response.
+    :param content: Content of the response.
+    :param max_age: Seconds after which responses are deleted.
+    :return: Bool representing success.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT data.upsert_riot_response(%s, %s::SMALLINT, %s, %s)',
+                        (cache_key,
+                         status_code,
+                         content,
+                         max_age))
+
+            return cur.fetchone()[0]
+
+
+@db_func
+def get_summoner_stats(riot_puu_id: str) -> tuple | None:
+    """
+    Gets aggregated stats of a summoner.
+    :param riot_puu_id: Puu id of the summoner.
+    :return: Row with stats, None if the summoner has no counted matches.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT * FROM data.select_summoner_stats(%s)',
+                        (riot_puu_id,))
+
+            return cur.fetchone()
+
+
+@db_func
+def get_summoner_champion_stats(riot_puu_id: str) -> list[tuple]:
+    """
+    Gets aggregated stats of a summoner per champion.
+    :param riot_puu_id: Puu id of the summoner.
+    :return: List of rows with stats, one per champion.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT * FROM data.select_summoner_champion_stats(%s)',
+                        (riot_puu_id,))
+
+            return cur.fetchall()
+
+
+@db_func
+def backfill_summoner_stats() -> int:
+    """
+    Rebuilds summoner stats from all stored matches.
+    :return: Number of participations counted.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT data.backfill_summoner_stats()',
+                        ())
+
+            return cur.fetchone()[0]
+
+
 @db_func
 def get_setting(setting: str) -> str:
     """
@@ -0,0 +1,115 @@
+import io
+import numpy as np
+
+"""
+Match timelines decoded into dense arrays shaped minutes x participants x metrics. Participant index i is RIOT
+participantId i + 1, so indexes 0-4 are the blue team and 5-9 the red team.
+"""
+
+METRICS = ('gold', 'xp', 'cs', 'level', 'x', 'y')
+GOLD, XP, CS, LEVEL, X, Y = range(len(METRICS))
+PARTICIPANTS = 10
+DTYPE = np.int32
+
+
+def decode_timeline(timeline: dict) -> (np.ndarray, list[str]):
+    """
+    Decodes participant frames of a RIOT match timeline.
+    :param timeline: Timeline as returned by RIOT API.
+    :return: Array of shape minutes x 10 x len(METRICS) and list of puu ids in participant order.
+    """
+    info = timeline['info']
+    frames = np.zeros((len(info['frames']), PARTICIPANTS, len(METRICS)), dtype=DTYPE)
+
+    for minute, frame in enumerate(info['frames']):
+        for participant_id, participant in frame['participantFrames'].items():
+            position = participant.get('position', {})
+            frames[minute, int(participant_id) - 1] = (participant.get('totalGold', 0),
+                                                       participant.get('xp', 0),
+                                                       participant.get('minionsKilled', 0) +
+                                                       participant.get('jungleMinionsKilled', 0),
+                                                       participant.get('level', 0),
+                                                       position.get('x', 0),
+                                                       position.get('y', 0))
+
+    puu_ids = [''] * PARTICIPANTS
+    for participant in info.get('participants', []):
+        puu_ids[participant['participantId'] - 1] = participant['puuid']
+
+    return frames, puu_ids
+
+
+def to_bytes(frames: np.ndarray, puu_ids: list[str]) -> bytes:
+    """
+    Serializes decoded timeline into compact binary form.
+    :param frames: Array returned by decode_timeline.
+    :param puu_ids: Puu ids in participant order.
+    :return: Compressed bytes.
+    """
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, frames=frames.astype(DTYPE, copy=False), puu_ids=np.array(puu_ids))
+    return buffer.getvalue()
+
+
+def from_bytes(data: bytes) -> (np.ndarray, list[str]):
+    """
+    Deserializes timeline created by to_bytes.
+    :param data: Compressed bytes.
+    :return: Array of shape minutes x 10 x len(METRICS) and list of puu ids in participant order.
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        return archive['frames'], archive['puu_ids'].tolist()
+
+
+def team_totals(frames: np.ndarray, metric: int) -> np.ndarray:
+    """
+    Sums a metric per team for every minute.
+    :param frames: Decoded timeline.
+    :param metric: Index of the metric, e.g. GOLD.
+    :return: Array of shape minutes x 2, blue team first.
+    """
+    return frames[:, :, metric].reshape(frames.shape[0], 2, PARTICIPANTS // 2).sum(axis=2)
+
+
+def team_diff(frames: np.ndarray, metric: int) -> np.ndarray:
+    """
+    Difference of a metric between teams for every minute.
+    :param frames: Decoded timeline.
+    :param metric: Index of the metric, e.g. GOLD.
+    :return: Array of length minutes, positive when blue team leads.
+    """
+    totals = team_totals(frames, metric)
+    return totals[:, 0] - totals[:, 1]
+
+
+def gold_diff_at(frames: np.ndarray, minute: int) -> int:
+    """
+    Gold difference between teams at given minute, last minute is used for shorter games.
+    :param frames: Decoded timeline.
+    :param minute: Minute of the game.
+    :return: Gold difference, positive when blue team leads, 0 for timelines without frames (e.g. remakes).
+    """
+    if frames.size == 0 or minute < 0:
+        return 0
+    return int(team_diff(frames[:minute + 1], GOLD)[-1])
+
+
+def lane_diff(frames: np.ndarray, metric: int) -> np.ndarray:
+    """
+    Difference of a metric between opponents in the same position for every minute.
+    :param frames: Decoded timeline.
+    :param metric: Index of the metric, e.g. CS.
+    :return: Array of shape minutes x 5, positive when blue player leads.
+    """
+    values = frames[:, :, metric]
+    return values[:, :PARTICIPANTS // 2] - values[:, PARTICIPANTS // 2:]
+
+
+def per_minute(frames: np.ndarray, metric: int) -> np.ndarray:
+    """
+    Metric gained by every participant during each minute.
+    :param frames: Decoded timeline.
+    :param metric: Index of the metric, e.g. GOLD.
+    :return: Array of shape minutes x 10.
+    """
+    return np.diff(frames[:, :, metric], axis=0, prepend=0)
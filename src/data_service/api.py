@@ -27,11 +27,12 @@ app.ROLE = {
     'Invalid': data_models.Role(id=6, name='UNKNOWN')
 }
 
-app.account_info_handler = handlers.RIOTAccountHandler(server=app.SERVER)
-app.player_info_handler = handlers.RIOTPlayerHandler(server=app.SERVER)
+app.response_cache = handlers.ResponseCache(persistent=os.getenv('RIOT_CACHE_PERSISTENT', '0') == '1')
+app.account_info_handler = handlers.RIOTAccountHandler(server=app.SERVER, cache=app.response_cache)
+app.player_info_handler = handlers.RIOTPlayerHandler(server=app.SERVER, cache=app.response_cache)
 app.active_match_handler = handlers.RIOTActiveMatchHandler(server=app.SERVER)
-app.match_handler = handlers.RIOTMatchHandler(server=app.SERVER)
-app.mastery_handler = handlers.RIOTMasteryHandler(server=app.SERVER)
+app.match_handler = handlers.RIOTMatchHandler(server=app.SERVER, cache=app.response_cache)
+app.mastery_handler = handlers.RIOTMasteryHandler(server=app.SERVER, cache=app.response_cache)
 app.rotation_handler = handlers.RIOTChampionRotation(server=app.SERVER)
 
 # app.my_server = None
@@ -39,6 +40,9 @@ app.my_summoner = db.get_user()
 app.active_match = data_models.Match(
     server=app.SERVER
 )
+# JSON of the active match, encoded again only after active_match_version changes.
+app.active_match_version = 0
+app.active_match_json = None
 
 
 @app.get('/healthcheck', status_code=200)
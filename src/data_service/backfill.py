@@ -0,0 +1,227 @@
+import common.lol_logging
+import common.data_models as data_models
+import common.data_transformation as data_transformations
+import common.db as db
+import argparse
+import handlers
+import json
+import logging
+import types
+from api import app
+from concurrent.futures import ThreadPoolExecutor
+from routers.match import save_match_to_db
+
+"""
+Backfills ranked match history of the configured user, and optionally of everyone they played with, from RIOT API.
+Progress is checkpointed in the database so an interrupted run continues where it stopped.
+Run inside the data_service container: python backfill.py [--co-participants] [--co-participant-matches N]
+[--max-co-participants N] [--workers N] [--restart]
+"""
+
+CHECKPOINT_SETTING = 'backfill_checkpoint'
+PAGE_SIZE = 100
+# Limits of a development RIOT API key.
+RATE_LIMITS = [(20, 1), (100, 120)]
+
+
+def load_checkpoint(root_puu_id: str, restart: bool) -> dict:
+    """
+    Loads checkpoint of the previous run or creates a new one.
+    :param root_puu_id: Puu id of the summoner the backfill starts from.
+    :param restart: If True the previous checkpoint is thrown away.
+    :return: Checkpoint dictionary.
+    """
+    checkpoint = None if restart else db.get_setting(CHECKPOINT_SETTING)
+    if checkpoint:
+        logging.info('Resuming backfill from checkpoint.')
+        return json.loads(checkpoint)
+
+    return {'root': root_puu_id, 'pending': {root_puu_id: 0}, 'done': [], 'failed': []}
+
+
+def save_checkpoint(checkpoint: dict | None) -> None:
+    """
+    Saves checkpoint to the database.
+    :param checkpoint: Checkpoint dictionary, None clears it.
+    """
+    if not db.set_setting(CHECKPOINT_SETTING, json.dumps(checkpoint) if checkpoint else None):
+        logging.warning('Backfill checkpoint was not saved!')
+
+
+def fetch_match(request: types.SimpleNamespace, match_handler: handlers.RIOTMatchHandler,
+                match_id: int) -> data_models.Match | None:
+    """
+    Gets match detail, from database if already stored, otherwise from RIOT and saves it.
+    :param request: Stand-in for FastAPI request carrying the app.
+    :param match_handler: Rate limited match handler.
+    :param match_id: Match id.
+    :return: Match object, None if it couldn't be fetched or saved.
+    """
+    match = data_transformations.db_to_match_detail(request, match_id, db.get_match(match_id, app.SERVER.id))
+    if match:
+        return match
+
+    r = match_handler.try_request(headers={'X-Riot-Token': app.riot_api_key},
+                                  url_params={'': match_id})
+    if r is None or r.status_code != 200:
+        logging.warning(f'Match {match_id} could not be fetched.')
+        return None
+
+    match = data_transformations.response_to_match_detail(request, r)
+    if not save_match_to_db(match):
+        logging.warning(f'Match {match_id} could not be saved.')
+        return None
+
+    return match
+
+
+def try_fetch_match(request: types.SimpleNamespace, match_handler: handlers.RIOTMatchHandler,
+                    match_id: int) -> data_models.Match | None:
+    """
+    Calls fetch_match, an error of one match is logged and the match marked failed instead of stopping the backfill.
+    :param request: Stand-in for FastAPI request carrying the app.
+    :param match_handler: Rate limited match handler.
+    :param match_id: Match id.
+    :return: Match object, None if it couldn't be fetched or saved.
+    """
+    try:
+        return fetch_match(request, match_handler, match_id)
+    except Exception as e:
+        logging.error(f'Unexpected error while backfilling match {match_id}: {e}', exc_info=True)
+        return None
+
+
+def backfill_summoner(request: types.SimpleNamespace, match_handler: handlers.RIOTMatchHandler,
+                      executor: ThreadPoolExecutor, checkpoint: dict, puu_id: str, co_participants: bool,
+                      max_matches: int, max_co_participants: int) -> bool:
+    """
+    Pages through ranked history of one summoner, fetching match details concurrently.
+    :param request: Stand-in for FastAPI request carrying the app.
+    :param match_handler: Rate limited match handler.
+    :param executor: Executor fetching match details.
+    :param checkpoint: Checkpoint dictionary, updated after every page.
+    :param puu_id: Puu id of the summoner.
+    :param co_participants: If True and this is the root summoner, everyone they played with is queued as well.
+    :param max_matches: Maximum number of matches fetched for the summoner.
+    :param max_co_participants: Maximum number of co-participants queued in total.
+    :return: True if the whole history was processed, False if RIOT didn't return a page of it.
+    """
+    start = checkpoint['pending'][puu_id]
+    while start < max_matches:
+        r = match_handler.try_request(headers={'X-Riot-Token': app.riot_api_key},
+                                      url_params={'puu_id': puu_id,
+                                                  'type': 'ranked',
+                                                  'start': start,
+                                                  'count': min(PAGE_SIZE, max_matches - start)})
+        if r is None or r.status_code != 200:
+            logging.error(f'Match history page {start} for summoner with puu_id {puu_id} could not be fetched.')
+            return False
+
+        match_ids = [int(match_id.split('_')[1]) for match_id in r.json()]
+        if not match_ids:
+            break
+
+        for match_id, match in zip(match_ids, executor.map(lambda m: try_fetch_match(request, match_handler, m),
+                                                           match_ids)):
+            if match is None:
+                checkpoint['failed'].append(match_id)
+            elif co_participants and puu_id == checkpoint['root']:
+                for participant in match.participants:
+                    other = participant.summoner.puu_id
+                    queued = len(checkpoint['pending']) + len(checkpoint['done']) - 1
+                    if other and other not in checkpoint['pending'] and other not in checkpoint['done'] \
+                            and queued < max_co_participants:
+                        checkpoint['pending'][other] = 0
+
+        start += len(match_ids)
+        checkpoint['pending'][puu_id] = start
+        save_checkpoint(checkpoint)
+        logging.info(f'Backfilled {start} matches of summoner with puu_id {puu_id}.')
+
+        if len(match_ids) < PAGE_SIZE:
+            break
+
+    del checkpoint['pending'][puu_id]
+    checkpoint['done'].append(puu_id)
+    save_checkpoint(checkpoint)
+    return True
+
+
+def run(co_participants: bool, workers: int, max_matches: int, co_participant_matches: int, max_co_participants: int,
+        restart: bool, rebuild_stats: bool) -> None:
+    """
+    Runs the backfill.
+    :param co_participants: If True, history of everyone the user played with is backfilled as well.
+    :param workers: Number of match details fetched concurrently.
+    :param max_matches: Maximum number of matches fetched for the user.
+    :param co_participant_matches: Maximum number of matches fetched per co-participant.
+    :param max_co_participants: Maximum number of co-participants backfilled.
+    :param restart: If True the previous checkpoint is thrown away.
+    :param rebuild_stats: If True summoner stats are rebuilt from scratch at the end.
+    """
+    if not app.my_summoner:
+        logging.error('Users summoner not set, nothing to backfill.')
+        return
+
+    # response_to_match_detail only needs the app from the request.
+    request = types.SimpleNamespace(app=app)
+    match_handler = handlers.RIOTMatchHandler(server=app.SERVER, rate_limiter=handlers.RateLimiter(RATE_LIMITS))
+    checkpoint = load_checkpoint(app.my_summoner.puu_id, restart)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # The root summoner goes first so co-participants get queued before the loop runs out of work.
+        while checkpoint['pending']:
+            puu_id = checkpoint['root'] if checkpoint['root'] in checkpoint['pending'] \
+                else next(iter(checkpoint['pending']))
+            if not backfill_summoner(request, match_handler, executor, checkpoint, puu_id, co_participants,
+                                     max_matches if puu_id == checkpoint['root'] else co_participant_matches,
+                                     max_co_participants):
+                logging.error('Backfill interrupted, run it again to resume from checkpoint.')
+                return
+
+        failed, checkpoint['failed'] = checkpoint['failed'], []
+        for match_id, match in zip(failed, executor.map(lambda m: try_fetch_match(request, match_handler, m), failed)):
+            if match is None:
+                checkpoint['failed'].append(match_id)
+
+    if checkpoint['failed']:
+        logging.warning(f'Backfill finished, {len(checkpoint["failed"])} matches failed and stay in checkpoint.')
+        save_checkpoint(checkpoint)
+    else:
+        logging.info(f'Backfill finished for {len(checkpoint["done"])} summoners.')
+        save_checkpoint(None)
+
+    if rebuild_stats:
+        logging.info(f'Summoner stats rebuilt from {db.backfill_summoner_stats()} participations.')
+
+
+def main() -> None:
+    """
+    Parses command line arguments and runs the backfill.
+    """
+    parser = argparse.ArgumentParser(description='Backfills ranked match history from RIOT API.')
+    parser.add_argument('--co-participants', action='store_true',
+                        help='backfill history of everyone the user played with as well')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='number of match details fetched concurrently')
+    parser.add_argument('--max-matches', type=int, default=1000,
+                        help='maximum number of matches fetched for the user')
+    parser.add_argument('--co-participant-matches', type=int, default=20,
+                        help='maximum number of matches fetched per co-participant')
+    parser.add_argument('--max-co-participants', type=int, default=200,
+                        help='maximum number of co-participants backfilled')
+    parser.add_argument('--restart', action='store_true',
+                        help='ignore checkpoint of the previous run')
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help='rebuild summoner stats from scratch once finished')
+    args = parser.parse_args()
+
+    run(args.co_participants, args.workers, args.max_matches, args.co_participant_matches, args.max_co_participants,
+        args.restart, args.rebuild_stats)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        logging.critical(e, exc_info=True)
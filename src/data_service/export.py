@@ -0,0 +1,221 @@
+import common.lol_logging
+import common.db as db
+import common.db_utils as db_utils
+import argparse
+import datetime
+import json
+import logging
+import os
+import psycopg
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Callable
+
+"""
+Exports stored matches, participants with their stats and tags to Parquet files partitioned by patch and month.
+Every run continues from the watermark saved in the output folder, so only matches changed since the last export are
+written. The watermark holds the snapshot of the last export too, so changes committed after it with a lower
+modified_seq are not skipped. A match changed after it was exported (e.g. tagged) is written again, readers should keep
+the row with the highest modified_seq.
+Run inside the data_service container: python export.py --output /logs/export [--full]
+"""
+
+WATERMARK_FILE = '_watermark.json'
+BATCH_SIZE = 10000
+
+TAG_NAMES = {value: key.value for key, value in db_utils.TAG.items()}
+SEVERITY_NAMES = {value: key.value for key, value in db_utils.SEVERITY.items()}
+
+DATASETS = {
+    'matches': ('data.export_matches', pa.schema([
+        ('riot_match_id', pa.int64()),
+        ('id_server', pa.int16()),
+        ('match_creation', pa.timestamp('ms')),
+        ('match_start', pa.timestamp('ms')),
+        ('match_end', pa.timestamp('ms')),
+        ('duration', pa.int32()),
+        ('winning_team_red', pa.bool_()),
+        ('game_version', pa.string()),
+        ('modified_seq', pa.int64())
+    ])),
+    'participants': ('data.export_participants', pa.schema([
+        ('riot_match_id', pa.int64()),
+        ('id_server', pa.int16()),
+        ('riot_puu_id', pa.string()),
+        ('gamename', pa.string()),
+        ('tagline', pa.string()),
+        ('team_red', pa.bool_()),
+        ('win', pa.bool_()),
+        ('role', pa.string()),
+        ('champion', pa.int32()),
+        ('summ_spell1', pa.int16()),
+        ('summ_spell2', pa.int16()),
+        ('primary_runes', pa.int32()),
+        ('secondary_runes', pa.int32()),
+        ('runes', pa.list_(pa.int32())),
+        ('small_runes', pa.list_(pa.int16())),
+        ('kills', pa.int16()),
+        ('deaths', pa.int16()),
+        ('assists', pa.int16()),
+        ('cs', pa.int16()),
+        ('total_gold', pa.int32()),
+        ('items', pa.list_(pa.int32())),
+        ('mastery_points', pa.int32()),
+        ('bot', pa.bool_()),
+        ('modified_seq', pa.int64())
+    ])),
+    'tags': ('data.export_tags', pa.schema([
+        ('riot_match_id', pa.int64()),
+        ('id_server', pa.int16()),
+        ('riot_puu_id', pa.string()),
+        ('tag', pa.string()),
+        ('severity', pa.string()),
+        ('note', pa.string()),
+        ('modified_seq', pa.int64())
+    ]))
+}
+
+TRANSFORMS = {
+    'tags': lambda row: (*row[:3], TAG_NAMES.get(row[3]), SEVERITY_NAMES.get(row[4]), *row[5:])
+}
+
+
+def read_watermark(output: str) -> tuple[int, str | None]:
+    """
+    Reads the watermark of the last successful export.
+    :param output: The output folder.
+    :return: Highest modified_seq already exported, 0 if nothing was, and snapshot the export was made from, None if
+        unknown.
+    """
+    try:
+        with open(os.path.join(output, WATERMARK_FILE)) as f:
+            watermark = json.load(f)
+            return watermark['modified_seq'], watermark.get('snapshot')
+    except FileNotFoundError:
+        return 0, None
+
+
+def write_watermark(output: str, modified_seq: int, snapshot: str) -> None:
+    """
+    Saves the watermark of a successful export.
+    :param output: The output folder.
+    :param modified_seq: Highest modified_seq exported.
+    :param snapshot: Snapshot the export was made from, as returned by pg_current_snapshot.
+    """
+    path = os.path.join(output, WATERMARK_FILE)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump({'modified_seq': modified_seq, 'snapshot': snapshot}, f)
+    os.replace(f'{path}.tmp', path)
+
+
+def export_dataset(conn: psycopg.Connection, name: str, modified_from: int, modified_to: int,
+                   exported_snapshot: str | None, output: str, run_id: str) -> list[str]:
+    """
+    Streams one dataset from the database into Parquet files, one file per patch and month partition.
+    :param conn: Connection with an open snapshot shared by all datasets.
+    :param name: Name of the dataset.
+    :param modified_from: Rows with modified_seq above this are exported.
+    :param modified_to: Rows with modified_seq up to this are exported.
+    :param exported_snapshot: Snapshot of the previous export, rows it couldn't see are exported regardless of
+        modified_from.
+    :param output: The output folder.
+    :param run_id: Identifier of the export run, keeps file names of runs with the same watermarks apart.
+    :return: List of written temporary files, renamed once the whole export succeeds.
+    """
+    function, schema = DATASETS[name]
+    transform: Callable = TRANSFORMS.get(name, lambda row: row)
+    written = []
+    writer = None
+    partition = None
+    batch = []
+
+    def flush() -> None:
+        if batch:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(zip(*batch), schema)], schema=schema))
+            batch.clear()
+
+    # Rows come ordered by partition, so only one writer is ever open.
+    with conn.cursor(name=f'export_{name}') as cur:
+        cur.itersize = BATCH_SIZE
+        cur.execute(f'SELECT * FROM {function}(%s, %s, %s::PG_SNAPSHOT)', (modified_from, modified_to,
+                                                                            exported_snapshot))
+        for row in cur:
+            if (row[0], row[1]) != partition:
+                if writer:
+                    flush()
+                    writer.close()
+                partition = (row[0], row[1])
+                folder = os.path.join(output, name, f'patch={partition[0] or "unknown"}',
+                                      f'month={partition[1] or "unknown"}')
+                os.makedirs(folder, exist_ok=True)
+                path = os.path.join(folder, f'part-{modified_from + 1}-{modified_to}-{run_id}.parquet.tmp')
+                writer = pq.ParquetWriter(path, schema, compression='zstd')
+                written.append(path)
+
+            batch.append(transform(row[2:]))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+
+        if writer:
+            flush()
+            writer.close()
+
+    logging.info(f'Exported dataset {name} into {len(written)} partitions.')
+    return written
+
+
+def run(output: str, full: bool) -> None:
+    """
+    Runs the export.
+    :param output: The output folder.
+    :param full: If True the watermark is ignored and everything is exported.
+    """
+    os.makedirs(output, exist_ok=True)
+    modified_from, exported_snapshot = (0, None) if full else read_watermark(output)
+    run_id = datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+    with db.get_conn() as conn:
+        conn.isolation_level = psycopg.IsolationLevel.REPEATABLE_READ
+        conn.read_only = True
+        with conn.cursor() as cur:
+            # Changes still being committed are not visible yet, the snapshot lets the next export pick them up even
+            # if their modified_seq is lower than the watermark.
+            cur.execute('SELECT data.select_max_modified_seq(), pg_current_snapshot()::TEXT',
+                        ())
+            modified_to, snapshot = cur.fetchone()
+
+        logging.info(f'Exporting changes between watermarks {modified_from} and {modified_to}, '
+                     f'previous snapshot {exported_snapshot}.')
+        written = []
+        for name in DATASETS:
+            written.extend(export_dataset(conn, name, modified_from, modified_to, exported_snapshot, output, run_id))
+
+    for path in written:
+        os.replace(path, path.removesuffix('.tmp'))
+    write_watermark(output, modified_to, snapshot)
+    if written:
+        logging.info(f'Export finished, watermark moved to {modified_to}.')
+    else:
+        logging.info(f'Nothing changed since watermark {modified_from}, nothing exported.')
+
+
+def main() -> None:
+    """
+    Parses command line arguments and runs the export.
+    """
+    parser = argparse.ArgumentParser(description='Exports stored matches into partitioned Parquet files.')
+    parser.add_argument('--output', required=True,
+                        help='folder the Parquet files are written to')
+    parser.add_argument('--full', action='store_true',
+                        help='ignore the watermark and export everything')
+    args = parser.parse_args()
+
+    run(args.output, args.full)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        logging.critical(e, exc_info=True)
@@ -1,9 +1,163 @@
 import common.data_models as data_models
+import common.db as db
 import common.exceptions
 import requests
 import logging
+import threading
+import time
 from abc import ABC
+from collections import OrderedDict, deque
 from requests import Response
+from typing import Callable
+
+# Responses older than this are not served even when RIOT API is unavailable, and are deleted from the database. Fresh
+# and stale windows of handlers are capped to it, so it leaves room past the longest of them for RIOT outages.
+MAX_STALE_AGE = 14 * 24 * 60 * 60
+
+
+class RateLimiter:
+    """
+    Thread safe limiter keeping the calls within RIOT API rate limits.
+    """
+
+    def __init__(self, limits: list[tuple[int, float]]) -> None:
+        """
+        Inits the RateLimiter.
+        :param limits: List of pairs (number of calls, period in seconds), all of them have to be respected.
+        """
+        self._limits = limits
+        self._longest_period = max(period for _, period in limits)
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until another call can be made without exceeding any of the limits.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self._longest_period:
+                    self._calls.popleft()
+
+                wait = 0
+                for limit, period in self._limits:
+                    in_period = [call for call in self._calls if now - call < period]
+                    if len(in_period) >= limit:
+                        wait = max(wait, in_period[-limit] + period - now)
+
+                if wait <= 0:
+                    self._calls.append(now)
+                    return
+
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """
+    Thread safe cache of RIOT API responses shared by handlers. Responses are kept in memory up to max_entries, least
+    recently used first to go, and optionally in the database as well, so they survive restart of the service. Entries
+    are (stored_at, status_code, content), how long they stay fresh is decided by the handler using them.
+    """
+
+    def __init__(self, max_entries: int = 5000, persistent: bool = False) -> None:
+        """
+        Inits the ResponseCache.
+        :param max_entries: Maximum number of responses kept in memory.
+        :param persistent: If True responses are stored in the database as well.
+        """
+        self._max_entries = max_entries
+        self._persistent = persistent
+        self._entries = OrderedDict()
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[float, int, bytes] | None:
+        """
+        Gets a cached response, from memory or from the database.
+        :param key: Key of the response.
+        :return: Tuple of stored_at, status code and content, None if not cached or older than MAX_STALE_AGE.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self._persistent:
+            row = db.get_riot_response(key)
+            if row is not None:
+                entry = (time.time() - row[0], row[1], bytes(row[2]))
+                self._remember(key, entry)
+
+        if entry is not None and time.time() - entry[0] > MAX_STALE_AGE:
+            return None
+        return entry
+
+    def set(self, key: str, status_code: int, content: bytes) -> None:
+        """
+        Caches a response.
+        :param key: Key of the response.
+        :param status_code: Status code of the response.
+        :param content: Content of the response.
+        """
+        self._remember(key, (time.time(), status_code, content))
+        if self._persistent and not db.upsert_riot_response(key, status_code, content, MAX_STALE_AGE):
+            logging.warning(f'Response {key} not saved to db.')
+
+    def revalidate(self, key: str, refresh: Callable[[], None]) -> None:
+        """
+        Refreshes a response in a background thread, unless it is already being refreshed.
+        :param key: Key of the response.
+        :param refresh: Function calling RIOT API and caching the response.
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run() -> None:
+            try:
+                refresh()
+            except Exception as e:
+                logging.warning(f'Revalidation of {key} failed: {e}')
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def record(self, outcome: str) -> None:
+        """
+        Counts a lookup, handlers of all threads share the counters.
+        :param outcome: One of 'hits', 'stale_hits' or 'misses'.
+        """
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Gets cache statistics.
+        :return: Dict with hits, stale hits, misses and number of responses in memory.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'stale_hits': self.stale_hits, 'misses': self.misses,
+                    'entries': len(self._entries)}
+
+    def _remember(self, key: str, entry: tuple[float, int, bytes]) -> None:
+        """
+        Stores an entry in memory, evicting the least recently used entries over max_entries.
+        :param key: Key of the response.
+        :param entry: Tuple of stored_at, status code and content.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
 
 
 class RIOTAPIHandler(ABC):
@@ -12,18 +166,31 @@ class RIOTAPIHandler(ABC):
     """
 
     def __init__(self, server: data_models.Server, endpoint: str, expected_statuses: dict,
-                 query_params: list = None) -> None:
+                 query_params: list = None, rate_limiter: RateLimiter = None, cache: ResponseCache = None,
+                 ttl: int = 0, stale_ttl: int = 0, not_found_ttl: int = 0) -> None:
         """
         Inits the RIOTAPIHandler.
         :param server: Server to which the handler connects to.
         :param endpoint: The endpoint this handler calls.
         :param expected_statuses: Dictionary of expected statuses of response and their meaning.
         :param query_params: List of expected query parameters.
+        :param rate_limiter: If provided, every call waits until the limiter allows it.
+        :param cache: If provided, responses with status 200 and 404 are cached.
+        :param ttl: Seconds a cached response with status 200 is served without calling RIOT API.
+        :param stale_ttl: Seconds after ttl a cached response is still served, while it is refreshed in background.
+            Older responses are only served when RIOT API is unavailable. ttl and stale_ttl together are capped to
+            MAX_STALE_AGE, as older responses are not kept.
+        :param not_found_ttl: Seconds a cached response with status 404 is served without calling RIOT API.
         """
         self._server = server
         self._endpoint = endpoint
         self._expected_statuses = expected_statuses
         self._query_params = query_params if query_params else ['']
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._ttl = min(ttl, MAX_STALE_AGE)
+        self._stale_ttl = min(stale_ttl, MAX_STALE_AGE - self._ttl)
+        self._not_found_ttl = min(not_found_ttl, MAX_STALE_AGE)
 
     def try_request(self, headers: dict = None, params: dict = None, url_params: dict = None) -> Response | None:
         """
@@ -37,9 +204,14 @@ class RIOTAPIHandler(ABC):
         try:
             full_url = self._construct_url(url_params)
             logging.debug(f'Calling RIOT API with full url: {full_url}')
-            r = self._handle_call(url=full_url,
-                                  headers=headers,
-                                  params=params)
+            if self._cache is not None and self._is_cacheable(url_params):
+                r = self._cached_call(url=full_url,
+                                      headers=headers,
+                                      params=params)
+            else:
+                r = self._handle_call(url=full_url,
+                                      headers=headers,
+                                      params=params)
             logging.info(f'Request in handler {self.__class__.__name__} successfully finished.')
             if len(r.content) < 10000:
                 logging.debug(r.json())
@@ -60,6 +232,8 @@ class RIOTAPIHandler(ABC):
         :return: Response if successfull or expected status is returned. Raises RiotAPIException if unexpected status
             is returned.
         """
+        if self._rate_limiter:
+            self._rate_limiter.acquire()
         r = requests.get(url=url, headers=headers, params=params)
         if r.status_code in self._expected_statuses:
             logging.debug(self._expected_statuses[r.status_code])
@@ -67,6 +241,85 @@ class RIOTAPIHandler(ABC):
         else:
             raise common.exceptions.RiotAPIException(r.status_code)
 
+    def _is_cacheable(self, url_params: dict = None) -> bool:
+        """
+        Decides whether response to a request may be cached.
+        :param url_params: URL parameters of the request.
+        :return: True if the response may be cached.
+        """
+        return True
+
+    def _cached_call(self, url: str, headers: dict, params: dict) -> Response | None:
+        """
+        Serves the request from cache while the cached response is fresh or stale, refreshing stale responses in
+        background. Otherwise RIOT API is called, and if it is unavailable or rate limited, the cached response is
+        served regardless of its age.
+        :param url: URL of the request including the processed parameters.
+        :param headers: Header parameters of the request.
+        :param params: URL parameters of the request.
+        :return: Response, cached or from RIOT API. Raises RiotAPIException if unexpected status is returned and
+            nothing is cached.
+        """
+        key = f"{url}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}" if params else url
+        entry = self._cache.get(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            ttl = self._not_found_ttl if entry[1] == 404 else self._ttl
+            if age <= ttl:
+                logging.debug(f'Serving cached response of {self.__class__.__name__}.')
+                self._cache.record('hits')
+                return self._cached_response(url, entry)
+            if age <= ttl + self._stale_ttl:
+                logging.debug(f'Serving stale response of {self.__class__.__name__}, refreshing in background.')
+                self._cache.record('stale_hits')
+                self._cache.revalidate(key, lambda: self._refresh(key, url, headers, params))
+                return self._cached_response(url, entry)
+
+        self._cache.record('misses')
+        try:
+            r = self._refresh(key, url, headers, params)
+        except (common.exceptions.RiotAPIException, requests.RequestException) as e:
+            if entry is None:
+                raise
+            logging.warning(f'RIOT API unavailable in {self.__class__.__name__} ({e}), serving cached response from '
+                            f'{time.time() - entry[0]:.0f} seconds ago.')
+            return self._cached_response(url, entry)
+
+        if entry is not None and (r.status_code == 429 or r.status_code >= 500):
+            logging.warning(f'RIOT API returned {r.status_code} in {self.__class__.__name__}, serving cached response '
+                            f'from {time.time() - entry[0]:.0f} seconds ago.')
+            return self._cached_response(url, entry)
+        return r
+
+    def _refresh(self, key: str, url: str, headers: dict, params: dict) -> Response | None:
+        """
+        Calls RIOT API and caches the response if its status is 200 or 404.
+        :param key: Key of the response in cache.
+        :param url: URL of the request including the processed parameters.
+        :param headers: Header parameters of the request.
+        :param params: URL parameters of the request.
+        :return: Response from RIOT API.
+        """
+        r = self._handle_call(url=url, headers=headers, params=params)
+        if r.status_code in (200, 404):
+            self._cache.set(key, r.status_code, r.content)
+        return r
+
+    @staticmethod
+    def _cached_response(url: str, entry: tuple[float, int, bytes]) -> Response:
+        """
+        Rebuilds response from a cache entry.
+        :param url: URL of the request.
+        :param entry: Tuple of stored_at, status code and content.
+        :return: Response with the cached status code and content.
+        """
+        r = Response()
+        r.url = url
+        r.status_code = entry[1]
+        r._content = entry[2]
+        r.encoding = 'utf-8'
+        return r
+
     def _construct_url(self, url_params: dict = None) -> str:
         """
         Modifies the URL based on given parameters.
@@ -103,16 +356,19 @@ class RIOTPlayerHandler(RIOTAPIHandler):
     Class handling player information.
     """
 
-    def __init__(self, server: data_models.Server) -> None:
+    def __init__(self, server: data_models.Server, cache: ResponseCache = None) -> None:
         """
         Inits the RIOTPlayerHandler.
         :param server: Server to which the handler connects to.
+        :param cache: If provided, responses are cached.
         """
         endpoint = 'summoner/v4/summoners'
         expected_statuses = {200: 'Player found.',
                              404: 'Player does not exist.'}
         query_params = ['puu_id', 'account_id', 'summoner_id', 'name']
-        super().__init__(server, endpoint, expected_statuses, query_params)
+        # Level and profile icon change a few times a day at most.
+        super().__init__(server, endpoint, expected_statuses, query_params, cache=cache,
+                         ttl=10 * 60, stale_ttl=24 * 60 * 60, not_found_ttl=10 * 60)
 
     def _construct_url(self, url_params: dict = None) -> str:
         """
@@ -140,16 +396,29 @@ class RIOTMatchHandler(RIOTAPIHandler):
     Class handling matches information.
     """
 
-    def __init__(self, server: data_models.Server) -> None:
+    def __init__(self, server: data_models.Server, rate_limiter: RateLimiter = None,
+                 cache: ResponseCache = None) -> None:
         """
         Inits the RIOTMatchHandler.
         :param server: Server to which the handler connects to.
+        :param rate_limiter: If provided, every call waits until the limiter allows it.
+        :param cache: If provided, match id lists are cached. Matches and timelines are stored in the database instead.
         """
         endpoint = 'match/v5/matches'
         expected_statuses = {200: 'Match found.',
                              404: 'Match does not exist.'}
-        query_params = ['', 'timeline', 'puu_id', 'type']
-        super().__init__(server, endpoint, expected_statuses, query_params)
+        query_params = ['', 'timeline', 'puu_id', 'type', 'start', 'count']
+        # A just finished match has to show up in history, so stale lists are only served when RIOT is unavailable.
+        super().__init__(server, endpoint, expected_statuses, query_params, rate_limiter, cache=cache,
+                         ttl=60, stale_ttl=0, not_found_ttl=60)
+
+    def _is_cacheable(self, url_params: dict = None) -> bool:
+        """
+        Decides whether response to a request may be cached.
+        :param url_params: URL parameters of the request.
+        :return: True for match id lists of a player.
+        """
+        return bool(url_params) and 'puu_id' in url_params
 
     def _construct_url(self, url_params: dict = None) -> str:
         """
@@ -163,11 +432,12 @@ class RIOTMatchHandler(RIOTAPIHandler):
         if not set(url_params.keys()) <= set(self._query_params):
             raise common.exceptions.UnexpectedQueryParamException(self.__class__.__name__,
                                                                   set(url_params.keys()) - set(self._query_params))
-        if 'type' in url_params.keys() and 'puu_id' not in url_params.keys():
-            raise common.exceptions.UnexpectedQueryParamException(self.__class__.__name__,
-                                                                  set(url_params.keys()) - set(self._query_params))
+        if set(url_params.keys()) & {'type', 'start', 'count'} and 'puu_id' not in url_params.keys():
+            raise common.exceptions.UnexpectedQueryParamCombinationException(self.__class__.__name__,
+                                                                             set(url_params.keys()))
         if 'puu_id' in url_params.keys():
-            return f"{url}/by-puuid/{url_params['puu_id']}/ids?count=10" \
+            return f"{url}/by-puuid/{url_params['puu_id']}/ids?start={url_params.get('start', 0)}" \
+                   f"&count={url_params.get('count', 10)}" \
                    f"{'&type=' + url_params['type'] if 'type' in url_params else ''}"
         else:
             return f"{url}/{self._server.server.upper()}_{url_params['']}" \
@@ -179,16 +449,19 @@ class RIOTMasteryHandler(RIOTAPIHandler):
     Class handling checking of player mastery information.
     """
 
-    def __init__(self, server: data_models.Server) -> None:
+    def __init__(self, server: data_models.Server, cache: ResponseCache = None) -> None:
         """
         Inits the RIOTMasteryHandler.
         :param server: Server to which the handler connects to.
+        :param cache: If provided, responses are cached.
         """
         endpoint = 'champion-mastery/v4/champion-masteries'
         expected_statuses = {200: 'Game found.',
                              404: 'Game does not exist.'}
         query_params = ['', 'top', 'championId']
-        super().__init__(server, endpoint, expected_statuses, query_params)
+        # Mastery points grow by a few hundred points per game.
+        super().__init__(server, endpoint, expected_statuses, query_params, cache=cache,
+                         ttl=60 * 60, stale_ttl=24 * 60 * 60, not_found_ttl=60 * 60)
 
     def _construct_url(self, url_params: dict = None) -> str:
         """
@@ -214,10 +487,11 @@ class RIOTAccountHandler(RIOTAPIHandler):
     Class handling player information in newer endpoint.
     """
 
-    def __init__(self, server: data_models.Server) -> None:
+    def __init__(self, server: data_models.Server, cache: ResponseCache = None) -> None:
         """
         Inits the RIOTAccountHandler.
         :param server: Server to which the handler connects to.
+        :param cache: If provided, responses are cached.
         """
         endpoint = 'account/v1/accounts'
         expected_statuses = {200: 'Player found.',
@@ -225,7 +499,9 @@ class RIOTAccountHandler(RIOTAPIHandler):
                              404: 'Player does not exist.',
                              503: 'Service unavailable.'}
         query_params = ['puu_id', 'gamename', 'tagline']
-        super().__init__(server, endpoint, expected_statuses, query_params)
+        # Riot ids change rarely, a mistyped one shouldn't be remembered for long.
+        super().__init__(server, endpoint, expected_statuses, query_params, cache=cache,
+                         ttl=24 * 60 * 60, stale_ttl=7 * 24 * 60 * 60, not_found_ttl=5 * 60)
 
     def _construct_url(self, url_params: dict = None) -> str:
         """
@@ -2,12 +2,17 @@ import common.data_models as data_models
 import common.db as db
 import common.db_utils as db_utils
 import common.data_transformation as data_transformations
+import common.timeline as timeline
 import logging
 import datetime
-from fastapi import APIRouter, Request, Response, status, HTTPException
+from fastapi import APIRouter, FastAPI, Request, Response, status, HTTPException
+from routers.summoner import get_masteries
 
 router = APIRouter()
 
+# Media type of timelines in the compact binary form of common.timeline.
+TIMELINE_MEDIA_TYPE = 'application/octet-stream'
+
 
 def save_match_to_db(match: data_models.Match) -> bool:
     """
@@ -24,7 +29,10 @@ def save_match_to_db(match: data_models.Match) -> bool:
         match_end=match.match_detail.match_end if match.match_detail else None,
         winning_team_red=match.match_detail.winning_team_red if match.match_detail else None,
         match_creation=match.match_detail.match_creation if match.match_detail else None,
-        game_version=match.match_detail.game_version if match.match_detail else None)
+        game_version=match.match_detail.game_version if match.match_detail else None,
+        game_mode=match.match_type,
+        game_duration=int(match.match_detail.match_duration.total_seconds())
+        if match.match_detail and match.match_detail.match_duration is not None else None)
     if match_id:
         for participant in match.participants:
             summoner_id = None
@@ -79,10 +87,32 @@ def save_match_to_db(match: data_models.Match) -> bool:
     return True
 
 
+def active_match_changed(app: FastAPI) -> None:
+    """
+    Marks the active match as changed, so its JSON is encoded again on the next request.
+    :param app: The FastAPI application.
+    """
+    app.active_match_version += 1
+    app.active_match_json = None
+
+
+def active_match_json(app: FastAPI) -> bytes:
+    """
+    Gets the active match encoded to JSON, encoding it only if it changed since the last call.
+    :param app: The FastAPI application.
+    :return: JSON of the active match.
+    """
+    if app.active_match_json is None:
+        app.active_match_json = app.active_match.model_dump_json().encode()
+        logging.debug(f'Active match {app.active_match.match_id} encoded, version {app.active_match_version}.')
+    return app.active_match_json
+
+
 @router.get('/active_match', status_code=200, response_model=data_models.Match)
 async def root(request: Request, response: Response) -> object:
     """
-    Returns data about active match, or 204 in case no match is in progress.
+    Returns data about active match, or 204 in case no match is in progress. The match is served as JSON encoded
+    only when it changes.
     """
     logging.debug('Received GET /match/active_match')
 
@@ -100,40 +130,39 @@ async def root(request: Request, response: Response) -> object:
         raise HTTPException(status_code=500)
 
     if r.status_code == 200:
-        if r.json()['gameQueueConfigId'] not in [420, 440]:
+        game = r.json()
+        if game['gameQueueConfigId'] not in [420, 440]:
             logging.info('Not a ranked match, skipping!')
             raise HTTPException(status_code=204)
         else:
-            if r.json()['gameId'] == request.app.active_match.match_id:
+            if game['gameId'] == request.app.active_match.match_id:
                 logging.info(f'Match {request.app.active_match.match_id} still in progress:')
-                if request.app.active_match.match_start is None and r.json()['gameStartTime'] != 0:
+                if request.app.active_match.match_start is None and game['gameStartTime'] != 0:
                     request.app.active_match.match_start = datetime.datetime.fromtimestamp(
-                        r.json()['gameStartTime'] / 1000)
-                    if db.upsert_match(r.json()['gameId'],
-                                       request.app.active_match.match_start,
-                                       None,
-                                       None,
-                                       None,
-                                       None,
-                                       None):
-                        logging.info(f'Start time saved for match {r.json()["gameId"]} to '
+                        game['gameStartTime'] / 1000)
+                    active_match_changed(request.app)
+                    if db.upsert_match(riot_match_id=game['gameId'],
+                                       id_server=request.app.SERVER.id,
+                                       match_start=request.app.active_match.match_start,
+                                       match_end=None,
+                                       winning_team_red=None,
+                                       match_creation=None,
+                                       game_version=None):
+                        logging.info(f'Start time saved for match {game["gameId"]} to '
                                      f'{request.app.active_match.match_start}.')
             else:
-                logging.info(f'New gameId found: {r.json()["gameId"]}')
+                logging.info(f'New gameId found: {game["gameId"]}')
                 request.app.active_match = data_transformations.response_to_active_match(request, r)
+                active_match_changed(request.app)
 
                 for participant in request.app.active_match.participants:
-                    r2 = request.app.mastery_handler.try_request(headers={'X-Riot-Token': request.app.riot_api_key},
-                                                                 url_params={'': participant.summoner.puu_id,
-                                                                             'championId': participant.champion})
-
-                    if r2 and r2.status_code == 200:
-                        participant.mastery_points = r2.json()['championPoints']
-                    else:
-                        participant.mastery_points = 0
+                    masteries = get_masteries(request, participant.summoner.puu_id)
+                    if masteries is None:
                         logging.warning(f'Unexpected response while calling RIOT mastery endpoint '
                                         f'"{participant.summoner.name}#{participant.summoner.tagline} - '
                                         f'{participant.champion}".')
+                    participant.mastery_points = next((mastery.mastery_points for mastery in masteries or []
+                                                       if mastery.champion_id == participant.champion), 0)
 
                     try:
                         participant = db_utils.enhance_participant(participant, request.app.active_match.match_id)
@@ -154,62 +183,95 @@ async def root(request: Request, response: Response) -> object:
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         raise HTTPException(status_code=500)
 
-    logging.info(f'Returning active match: {request.app.active_match.model_dump_json()}')
-    return request.app.active_match
+    content = active_match_json(request.app)
+    logging.info(f'Returning active match {request.app.active_match.match_id}, version '
+                 f'{request.app.active_match_version}, {len(content)} bytes.')
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f'Active match: {content.decode()}')
+    return Response(content=content, media_type='application/json')
 
 
 @router.get('/match_detail/{match_id}', status_code=200, response_model=data_models.Match)
-async def root(match_id: int, request: Request, response: Response) -> object:
+async def root(match_id: int, request: Request, response: Response, puu_id: str = None, lean: bool = False) -> object:
     """
-    Returns detail of the match, needs to store everything interesting in the database.
+    Returns detail of the match. Matches already stored in the database are served from there, anything else is
+    requested from RIOT and stored. With puu_id and lean only that participant is returned, without tags and other
+    enrichment, which is all that's needed for match histories.
     """
     logging.debug('Received GET /match/match_detail')
 
-    r = request.app.match_handler.try_request(headers={'X-Riot-Token': request.app.riot_api_key},
-                                              url_params={'': match_id})
-    if r is None:
-        logging.error('Unexpected error during processing of GET /match/active_match!')
-        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
-        raise HTTPException(status_code=500)
+    lean = lean and puu_id is not None
+    match = data_transformations.db_to_match_detail(request, match_id,
+                                                    db.get_match(match_id, request.app.SERVER.id,
+                                                                 puu_id if lean else None))
+    if not match and lean and db.get_match(match_id, request.app.SERVER.id):
+        logging.warning(f'Summoner with puu_id {puu_id} not found in stored match {match_id}.')
+        response.status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(status_code=404)
+
+    if match:
+        logging.info(f'Match {match_id} found in db.')
+    else:
+        r = request.app.match_handler.try_request(headers={'X-Riot-Token': request.app.riot_api_key},
+                                                  url_params={'': match_id})
+        if r is None:
+            logging.error('Unexpected error during processing of GET /match/match_detail!')
+            response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            raise HTTPException(status_code=500)
+
+        if r.status_code != 200:
+            logging.error(f'Unexpected return code from RIOT API: {r.status_code}')
+            response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+            raise HTTPException(status_code=500)
 
-    if r.status_code == 200:
-        save = False
         match = data_transformations.response_to_match_detail(request, r)
-        for participant in match.participants:
-            try:
-                if participant.summoner.puu_id == request.app.my_summoner.puu_id:
-                    save = True
-                participant = db_utils.enhance_participant(participant,
-                                                           r.json()['metadata']['matchId'].split('_')[1])
-            except Exception as e:
-                logging.error(f'Error during adding tags to participant {participant.summoner.name}#'
-                              f'{participant.summoner.tagline} : {e}', exc_info=True)
-        if save:
-            if save_match_to_db(match):
-                logging.info('Entire match succesfully saved to db')
-            else:
-                logging.warning('Something went wrong with db save.')
+        if save_match_to_db(match):
+            logging.info('Entire match succesfully saved to db')
+        else:
+            logging.warning('Something went wrong with db save.')
+
+        if lean:
+            match.participants = [p for p in match.participants if p.summoner.puu_id == puu_id]
 
-        logging.debug(f'Returning detail: {match.model_dump_json()}')
+    if lean:
+        if not match.participants:
+            logging.warning(f'Summoner with puu_id {puu_id} not found in match {match_id}.')
+            response.status_code = status.HTTP_404_NOT_FOUND
+            raise HTTPException(status_code=404)
         return match
-    else:
-        logging.error(f'Unexpected return code from RIOT API: {r.status_code}')
-        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
-        raise HTTPException(status_code=500)
+
+    for participant in match.participants:
+        try:
+            participant = db_utils.enhance_participant(participant, str(match.match_id))
+        except Exception as e:
+            logging.error(f'Error during adding tags to participant {participant.summoner.name}#'
+                          f'{participant.summoner.tagline} : {e}', exc_info=True)
+
+    logging.debug(f'Returning detail: {match.model_dump_json()}')
+    return match
 
 
 @router.get('/match_timeline/{match_id}', status_code=200)
 async def root(match_id: int, request: Request, response: Response) -> object:
     """
-    Saves timeline to database.
+    Returns timeline of the match, saves it to database in compact binary form (see common.timeline). Clients sending
+    Accept: application/octet-stream get the binary form, served from database once stored. Others get the timeline
+    JSON as returned by RIOT.
     """
     logging.debug('Received GET /match/match_timeline')
 
+    binary = TIMELINE_MEDIA_TYPE in request.headers.get('accept', '')
+    if binary:
+        frames = db.get_match_timeline(match_id, request.app.SERVER.id)
+        if frames:
+            logging.info(f'Timeline of match {match_id} found in db.')
+            return Response(content=frames, media_type=TIMELINE_MEDIA_TYPE)
+
     r = request.app.match_handler.try_request(headers={'X-Riot-Token': request.app.riot_api_key},
                                               url_params={'': match_id,
                                                           'timeline': True})
     if r is None:
-        logging.error('Unexpected error during processing of GET /match/active_match!')
+        logging.error('Unexpected error during processing of GET /match/match_timeline!')
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         raise HTTPException(status_code=500)
 
@@ -220,4 +282,12 @@ async def root(match_id: int, request: Request, response: Response) -> object:
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         raise HTTPException(status_code=500)
 
-    return r.json()
+    frames = timeline.to_bytes(*timeline.decode_timeline(r.json()))
+    if db.upsert_match_timeline(match_id, request.app.SERVER.id, frames):
+        logging.info(f'Timeline of match {match_id} saved to db.')
+    else:
+        logging.warning(f'Timeline of match {match_id} not saved, match is not stored yet.')
+
+    if not binary:
+        return Response(content=r.content, media_type='application/json')
+    return Response(content=frames, media_type=TIMELINE_MEDIA_TYPE)
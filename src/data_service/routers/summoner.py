@@ -1,5 +1,7 @@
 import common.data_models as data_models
+import common.data_transformation as data_transformations
 import common.db_utils as db_utils
+import common.db as db
 import logging
 import datetime
 from fastapi import APIRouter, Request, Response, status, HTTPException
@@ -7,6 +9,23 @@ from fastapi import APIRouter, Request, Response, status, HTTPException
 router = APIRouter()
 
 
+def get_masteries(request: Request, puu_id: str) -> list[data_models.Mastery] | None:
+    """
+    Gets all champion masteries of a player with a single call to RIOT, the response is cached by the mastery handler,
+    so mastery of any champion can be looked up without calling RIOT again.
+    :param request: Request object from FastAPI.
+    :param puu_id: Puu id of the player.
+    :return: List of masteries, highest first, empty if the player has none. None if RIOT call failed.
+    """
+    r = request.app.mastery_handler.try_request(headers={'X-Riot-Token': request.app.riot_api_key},
+                                                url_params={'': puu_id})
+    if r is None:
+        return None
+    if r.status_code == 404:
+        return []
+    return data_transformations.response_to_masteries(r)
+
+
 @router.get('/by-puuid/{puu_id}', status_code=200, response_model=data_models.Summoner)
 async def root(puu_id: str, request: Request, response: Response) -> object:
     """
@@ -86,3 +105,64 @@ async def root(puu_id: str, request: Request, response: Response) -> object:
         raise HTTPException(status_code=500)
 
     return matches
+
+
+@router.get('/stats/{puu_id}', status_code=200, response_model=data_models.SummonerStats)
+async def root(puu_id: str, request: Request, response: Response) -> object:
+    """
+    Returns aggregated stats of a summoner from all matches stored in the database.
+    """
+    logging.debug('Received GET /summoner/stats')
+
+    stats = db.get_summoner_stats(puu_id)
+    if stats is None:
+        logging.info(f'No stats stored for summoner with puu id: {puu_id}')
+        response.status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(status_code=404)
+
+    champion_stats = db.get_summoner_champion_stats(puu_id) or []
+
+    return data_models.SummonerStats(
+        puu_id=puu_id,
+        matches=stats[0],
+        wins=stats[1],
+        losses=stats[2],
+        kills=stats[3],
+        deaths=stats[4],
+        assists=stats[5],
+        cs=stats[6],
+        total_gold=stats[7],
+        streak=stats[8],
+        last_match_end=stats[9],
+        champions=[data_models.ChampionStats(
+            champion=champion[0],
+            matches=champion[1],
+            wins=champion[2],
+            losses=champion[3],
+            kills=champion[4],
+            deaths=champion[5],
+            assists=champion[6],
+            cs=champion[7],
+            total_gold=champion[8],
+            last_match_end=champion[9]
+        ) for champion in champion_stats]
+    )
+
+
+@router.get('/mastery/{puu_id}', status_code=200, response_model=list[data_models.Mastery])
+async def root(puu_id: str, request: Request, response: Response, champion_id: int = None) -> object:
+    """
+    Returns champion masteries of a summoner, highest first, or only mastery on given champion.
+    """
+    logging.debug('Received GET /summoner/mastery')
+
+    masteries = get_masteries(request, puu_id)
+    if masteries is None:
+        logging.error('Unexpected error during processing of GET /summoner/mastery')
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(status_code=500)
+
+    if champion_id is not None:
+        masteries = [mastery for mastery in masteries if mastery.champion_id == champion_id]
+
+    return masteries
@@ -42,5 +42,13 @@ BEGIN
 
     ALTER TABLE IF EXISTS data.participants OWNER TO loladmin;
 
+    ALTER TABLE IF EXISTS data.participants
+        ADD COLUMN IF NOT EXISTS stats_counted boolean NOT NULL DEFAULT FALSE;
+
+    CREATE INDEX IF NOT EXISTS ix_participants_id_summoner
+        ON data.participants USING btree
+        (id_summoner ASC NULLS LAST)
+        TABLESPACE pg_default;
+
 END
 $$;
\ No newline at end of file
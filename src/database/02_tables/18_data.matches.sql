@@ -23,5 +23,35 @@ BEGIN
 
     ALTER TABLE IF EXISTS data.matches OWNER TO loladmin;
 
+    -- Game mode and duration as reported by RIOT, so matches served from the database match the ones from RIOT.
+    ALTER TABLE IF EXISTS data.matches
+        ADD COLUMN IF NOT EXISTS game_mode character varying COLLATE pg_catalog."default";
+
+    ALTER TABLE IF EXISTS data.matches
+        ADD COLUMN IF NOT EXISTS game_duration integer;
+
+    -- Bumped on every change of the match, its participants or tags. Used as a watermark by the export.
+    CREATE SEQUENCE IF NOT EXISTS data.matches_modified_seq;
+
+    ALTER SEQUENCE IF EXISTS data.matches_modified_seq OWNER TO loladmin;
+
+    ALTER TABLE IF EXISTS data.matches
+        ADD COLUMN IF NOT EXISTS modified_seq bigint NOT NULL DEFAULT nextval('data.matches_modified_seq'::regclass);
+
+    CREATE INDEX IF NOT EXISTS ix_matches_modified_seq
+        ON data.matches USING btree
+        (modified_seq ASC NULLS LAST)
+        TABLESPACE pg_default;
+
+    -- Transaction of the last change. Sequence values are taken in call order but committed in any order, so the export
+    -- uses it to find changes that were not committed yet when the previous export took its snapshot.
+    ALTER TABLE IF EXISTS data.matches
+        ADD COLUMN IF NOT EXISTS modified_xid xid8 DEFAULT pg_current_xact_id();
+
+    CREATE INDEX IF NOT EXISTS ix_matches_modified_xid
+        ON data.matches USING btree
+        (modified_xid ASC NULLS LAST)
+        TABLESPACE pg_default;
+
 END
 $$;
\ No newline at end of file
@@ -0,0 +1,33 @@
+DO LANGUAGE plpgsql $$
+BEGIN
+
+    CREATE TABLE IF NOT EXISTS data.summoner_stats
+    (
+        id_summoner integer NOT NULL,
+        matches integer NOT NULL DEFAULT 0,
+        wins integer NOT NULL DEFAULT 0,
+        losses integer NOT NULL DEFAULT 0,
+        kills integer NOT NULL DEFAULT 0,
+        deaths integer NOT NULL DEFAULT 0,
+        assists integer NOT NULL DEFAULT 0,
+        cs integer NOT NULL DEFAULT 0,
+        total_gold bigint NOT NULL DEFAULT 0,
+        streak smallint NOT NULL DEFAULT 0,
+        last_decided_end timestamp without time zone,
+        last_match_end timestamp without time zone,
+        CONSTRAINT pk_summoner_stats PRIMARY KEY (id_summoner),
+        CONSTRAINT summoner_stats_id_summoner_fkey FOREIGN KEY (id_summoner)
+            REFERENCES data.summoners (id) MATCH SIMPLE
+            ON UPDATE NO ACTION
+            ON DELETE NO ACTION
+    )
+
+    TABLESPACE pg_default;
+
+    ALTER TABLE IF EXISTS data.summoner_stats OWNER TO loladmin;
+
+    COMMENT ON COLUMN data.summoner_stats.streak
+        IS 'Current streak, positive for wins and negative for losses.';
+
+END
+$$;
@@ -0,0 +1,29 @@
+DO LANGUAGE plpgsql $$
+BEGIN
+
+    CREATE TABLE IF NOT EXISTS data.summoner_champion_stats
+    (
+        id_summoner integer NOT NULL,
+        id_champion integer NOT NULL,
+        matches integer NOT NULL DEFAULT 0,
+        wins integer NOT NULL DEFAULT 0,
+        losses integer NOT NULL DEFAULT 0,
+        kills integer NOT NULL DEFAULT 0,
+        deaths integer NOT NULL DEFAULT 0,
+        assists integer NOT NULL DEFAULT 0,
+        cs integer NOT NULL DEFAULT 0,
+        total_gold bigint NOT NULL DEFAULT 0,
+        last_match_end timestamp without time zone,
+        CONSTRAINT pk_summoner_champion_stats PRIMARY KEY (id_summoner, id_champion),
+        CONSTRAINT summoner_champion_stats_id_summoner_fkey FOREIGN KEY (id_summoner)
+            REFERENCES data.summoners (id) MATCH SIMPLE
+            ON UPDATE NO ACTION
+            ON DELETE NO ACTION
+    )
+
+    TABLESPACE pg_default;
+
+    ALTER TABLE IF EXISTS data.summoner_champion_stats OWNER TO loladmin;
+
+END
+$$;
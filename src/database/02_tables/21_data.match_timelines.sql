@@ -0,0 +1,23 @@
+DO LANGUAGE plpgsql $$
+BEGIN
+
+    CREATE TABLE IF NOT EXISTS data.match_timelines
+    (
+        id_match integer NOT NULL,
+        frames bytea NOT NULL,
+        CONSTRAINT pk_match_timelines PRIMARY KEY (id_match),
+        CONSTRAINT match_timelines_id_match_fkey FOREIGN KEY (id_match)
+            REFERENCES data.matches (id) MATCH SIMPLE
+            ON UPDATE NO ACTION
+            ON DELETE NO ACTION
+    )
+
+    TABLESPACE pg_default;
+
+    ALTER TABLE IF EXISTS data.match_timelines OWNER TO loladmin;
+
+    COMMENT ON COLUMN data.match_timelines.frames
+        IS 'Compressed NumPy archive created by common.timeline.to_bytes.';
+
+END
+$$;
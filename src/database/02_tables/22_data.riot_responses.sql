@@ -0,0 +1,26 @@
+DO LANGUAGE plpgsql $$
+BEGIN
+
+    CREATE TABLE IF NOT EXISTS data.riot_responses
+    (
+        cache_key character varying COLLATE pg_catalog."default" NOT NULL,
+        status_code smallint NOT NULL,
+        content bytea NOT NULL,
+        stored_at timestamp without time zone NOT NULL DEFAULT NOW(),
+        CONSTRAINT pk_riot_responses PRIMARY KEY (cache_key)
+    )
+
+    TABLESPACE pg_default;
+
+    ALTER TABLE IF EXISTS data.riot_responses OWNER TO loladmin;
+
+    CREATE INDEX IF NOT EXISTS ix_riot_responses_stored_at
+        ON data.riot_responses USING btree
+        (stored_at ASC NULLS LAST)
+        TABLESPACE pg_default;
+
+    COMMENT ON TABLE data.riot_responses
+        IS 'Persistent tier of handlers.ResponseCache, RIOT API responses keyed by their URL.';
+
+END
+$$;
@@ -69,6 +69,13 @@ BEGIN
         bot                         = COALESCE(EXCLUDED.bot, participants.bot)
     RETURNING id_match, id_summoner INTO _id_match, _id_summoner;
 
+    PERFORM data.update_summoner_stats(_id_match, _id_summoner);
+
+    UPDATE data.matches
+    SET modified_seq = nextval('data.matches_modified_seq'::regclass),
+        modified_xid = pg_current_xact_id()
+    WHERE id = _id_match;
+
     RETURN;
 
 END;
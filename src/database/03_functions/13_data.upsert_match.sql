@@ -1,3 +1,5 @@
+DROP FUNCTION IF EXISTS data.upsert_match(BIGINT, INTEGER, TIMESTAMP, TIMESTAMP, BOOLEAN, TIMESTAMP, CHARACTER VARYING);
+
 CREATE OR REPLACE FUNCTION data.upsert_match(
     _riot_match_id          BIGINT,
     _id_server              INTEGER,
@@ -5,22 +7,30 @@ CREATE OR REPLACE FUNCTION data.upsert_match(
     _match_end              TIMESTAMP,
     _winning_team_red       BOOLEAN,
     _match_creation         TIMESTAMP,
-    _game_version           CHARACTER VARYING
+    _game_version           CHARACTER VARYING,
+    _game_mode              CHARACTER VARYING DEFAULT NULL,
+    _game_duration          INTEGER DEFAULT NULL
 ) RETURNS INTEGER
 AS $$
 DECLARE
     _id_match               INTEGER;
 BEGIN
 
-    INSERT INTO data.matches(riot_match_id, id_server, match_start, match_end, winning_team_red, match_creation, game_version)
-    VALUES (_riot_match_id, _id_server, _match_start, _match_end, _winning_team_red, _match_creation, _game_version)
+    INSERT INTO data.matches(riot_match_id, id_server, match_start, match_end, winning_team_red, match_creation, game_version,
+                             game_mode, game_duration)
+    VALUES (_riot_match_id, _id_server, _match_start, _match_end, _winning_team_red, _match_creation, _game_version,
+            _game_mode, _game_duration)
     ON CONFLICT (id_server, riot_match_id)
     DO UPDATE
     SET match_start         = COALESCE(EXCLUDED.match_start, matches.match_start),
         match_end           = COALESCE(EXCLUDED.match_end, matches.match_end),
         winning_team_red    = COALESCE(EXCLUDED.winning_team_red, matches.winning_team_red),
         match_creation      = COALESCE(EXCLUDED.match_creation, matches.match_creation),
-        game_version        = COALESCE(EXCLUDED.game_version, matches.game_version)
+        game_version        = COALESCE(EXCLUDED.game_version, matches.game_version),
+        game_mode           = COALESCE(EXCLUDED.game_mode, matches.game_mode),
+        game_duration       = COALESCE(EXCLUDED.game_duration, matches.game_duration),
+        modified_seq        = nextval('data.matches_modified_seq'::regclass),
+        modified_xid        = pg_current_xact_id()
     RETURNING id INTO _id_match;
 
     RETURN _id_match;
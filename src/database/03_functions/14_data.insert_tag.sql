@@ -15,6 +15,12 @@ BEGIN
     WHERE riot_match_id = _riot_match_id
       AND id_server = _id_server;
 
+    UPDATE data.matches
+    SET modified_seq = nextval('data.matches_modified_seq'::regclass),
+        modified_xid = pg_current_xact_id()
+    WHERE riot_match_id = _riot_match_id
+      AND id_server = _id_server;
+
     RETURN TRUE;
 
 END;
@@ -0,0 +1,90 @@
+DROP FUNCTION IF EXISTS data.select_match(BIGINT, INTEGER);
+DROP FUNCTION IF EXISTS data.select_match(BIGINT, INTEGER, CHARACTER VARYING);
+
+CREATE OR REPLACE FUNCTION data.select_match(
+    _riot_match_id          BIGINT,
+    _id_server              INTEGER,
+    _riot_puu_id            CHARACTER VARYING DEFAULT NULL
+) RETURNS TABLE (
+    match_start             TIMESTAMP,
+    match_end               TIMESTAMP,
+    winning_team_red        BOOLEAN,
+    match_creation          TIMESTAMP,
+    game_version            CHARACTER VARYING,
+    game_mode               CHARACTER VARYING,
+    game_duration           INTEGER,
+    riot_puu_id             CHARACTER VARYING,
+    gamename                CHARACTER VARYING,
+    tagline                 CHARACTER VARYING,
+    profile_icon            SMALLINT,
+    summoner_level          SMALLINT,
+    team_red                BOOLEAN,
+    id_role                 SMALLINT,
+    role_name               CHARACTER VARYING,
+    summ_spell_1            SMALLINT,
+    summ_spell_2            SMALLINT,
+    id_champion             INTEGER,
+    mastery_points          INTEGER,
+    bot                     BOOLEAN,
+    runes_primary           INTEGER,
+    runes_secondary         INTEGER,
+    runes                   INTEGER[],
+    small_runes             SMALLINT[],
+    kills                   SMALLINT,
+    deaths                  SMALLINT,
+    assists                 SMALLINT,
+    items                   INTEGER[],
+    total_gold              SMALLINT,
+    cs                      SMALLINT
+)
+AS $$
+BEGIN
+
+    -- Only finished matches with stats for every participant are returned, anything else has to come from RIOT. So are
+    -- matches stored before game mode and duration were, saving them again from RIOT fills these in.
+    -- With _riot_puu_id only the row of that participant is returned.
+    RETURN QUERY
+    SELECT  m.match_start,
+            m.match_end,
+            m.winning_team_red,
+            m.match_creation,
+            m.game_version,
+            m.game_mode,
+            m.game_duration,
+            s.riot_puu_id,
+            s.gamename,
+            s.tagline,
+            s.profile_icon,
+            s.summoner_level,
+            p.team_red,
+            p.id_role,
+            r.name,
+            p.summ_spell_1,
+            p.summ_spell_2,
+            p.id_champion,
+            p.mastery_points,
+            p.bot,
+            p.runes_primary,
+            p.runes_secondary,
+            p.runes,
+            p.small_runes,
+            p.kills,
+            p.deaths,
+            p.assists,
+            p.items,
+            p.total_gold,
+            p.cs
+    FROM data.matches m
+    JOIN data.participants p ON m.id = p.id_match
+    JOIN data.summoners s ON s.id = p.id_summoner
+    LEFT JOIN data.roles r ON r.id = p.id_role
+    WHERE m.riot_match_id = _riot_match_id
+      AND m.id_server = _id_server
+      AND m.match_end IS NOT NULL
+      AND m.game_duration IS NOT NULL
+      AND (_riot_puu_id IS NULL OR s.riot_puu_id = _riot_puu_id)
+      AND NOT EXISTS (SELECT FROM data.participants p2 WHERE p2.id_match = m.id AND p2.kills IS NULL)
+    ORDER BY p.team_red, p.id_role;
+
+END;
+$$ LANGUAGE plpgsql;
\ No newline at end of file
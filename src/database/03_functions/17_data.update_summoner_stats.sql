@@ -0,0 +1,94 @@
+CREATE OR REPLACE FUNCTION data.update_summoner_stats(
+    _id_match               INTEGER,
+    _id_summoner            INTEGER
+) RETURNS BOOLEAN
+AS $$
+DECLARE
+    _match_end              TIMESTAMP;
+    _win                    BOOLEAN;
+    _id_champion            INTEGER;
+    _kills                  SMALLINT;
+    _deaths                 SMALLINT;
+    _assists                SMALLINT;
+    _cs                     SMALLINT;
+    _total_gold             SMALLINT;
+    _last_decided_end       TIMESTAMP;
+BEGIN
+
+    -- Every finished participation is counted exactly once, the flag is flipped in the same statement.
+    UPDATE data.participants p
+    SET stats_counted = TRUE
+    FROM data.matches m
+    WHERE p.id_match = _id_match
+      AND p.id_summoner = _id_summoner
+      AND m.id = p.id_match
+      AND m.match_end IS NOT NULL
+      AND p.kills IS NOT NULL
+      AND NOT p.stats_counted
+    RETURNING m.match_end, p.team_red = m.winning_team_red, p.id_champion, p.kills, p.deaths, p.assists, p.cs,
+              p.total_gold
+    INTO _match_end, _win, _id_champion, _kills, _deaths, _assists, _cs, _total_gold;
+
+    IF NOT FOUND THEN
+        RETURN FALSE;
+    END IF;
+
+    SELECT last_decided_end
+    INTO _last_decided_end
+    FROM data.summoner_stats
+    WHERE id_summoner = _id_summoner
+    FOR UPDATE;
+
+    INSERT INTO data.summoner_stats(id_summoner, matches, wins, losses, kills, deaths, assists, cs, total_gold, streak,
+                                    last_decided_end, last_match_end)
+    VALUES (_id_summoner, 1, (_win IS TRUE)::INTEGER, (_win IS FALSE)::INTEGER, _kills, _deaths, _assists,
+            COALESCE(_cs, 0), COALESCE(_total_gold, 0),
+            CASE WHEN _win THEN 1 WHEN NOT _win THEN -1 ELSE 0 END,
+            CASE WHEN _win IS NOT NULL THEN _match_end END,
+            _match_end)
+    ON CONFLICT (id_summoner)
+    DO UPDATE
+    SET matches             = summoner_stats.matches + 1,
+        wins                = summoner_stats.wins + EXCLUDED.wins,
+        losses              = summoner_stats.losses + EXCLUDED.losses,
+        kills               = summoner_stats.kills + EXCLUDED.kills,
+        deaths              = summoner_stats.deaths + EXCLUDED.deaths,
+        assists             = summoner_stats.assists + EXCLUDED.assists,
+        cs                  = summoner_stats.cs + EXCLUDED.cs,
+        total_gold          = summoner_stats.total_gold + EXCLUDED.total_gold,
+        streak              = CASE
+                                  WHEN EXCLUDED.streak = 0 THEN summoner_stats.streak
+                                  WHEN SIGN(summoner_stats.streak) = EXCLUDED.streak
+                                      THEN summoner_stats.streak + EXCLUDED.streak
+                                  ELSE EXCLUDED.streak
+                              END,
+        last_decided_end    = GREATEST(summoner_stats.last_decided_end, EXCLUDED.last_decided_end),
+        last_match_end      = GREATEST(summoner_stats.last_match_end, EXCLUDED.last_match_end);
+
+    -- A decided match older than the newest one counted lands inside the history, the streak has to be recounted.
+    IF _win IS NOT NULL AND _last_decided_end > _match_end THEN
+        UPDATE data.summoner_stats
+        SET streak = data.count_summoner_streak(_id_summoner)
+        WHERE id_summoner = _id_summoner;
+    END IF;
+
+    INSERT INTO data.summoner_champion_stats(id_summoner, id_champion, matches, wins, losses, kills, deaths, assists, cs,
+                                             total_gold, last_match_end)
+    VALUES (_id_summoner, _id_champion, 1, (_win IS TRUE)::INTEGER, (_win IS FALSE)::INTEGER, _kills, _deaths,
+            _assists, COALESCE(_cs, 0), COALESCE(_total_gold, 0), _match_end)
+    ON CONFLICT (id_summoner, id_champion)
+    DO UPDATE
+    SET matches             = summoner_champion_stats.matches + 1,
+        wins                = summoner_champion_stats.wins + EXCLUDED.wins,
+        losses              = summoner_champion_stats.losses + EXCLUDED.losses,
+        kills               = summoner_champion_stats.kills + EXCLUDED.kills,
+        deaths              = summoner_champion_stats.deaths + EXCLUDED.deaths,
+        assists             = summoner_champion_stats.assists + EXCLUDED.assists,
+        cs                  = summoner_champion_stats.cs + EXCLUDED.cs,
+        total_gold          = summoner_champion_stats.total_gold + EXCLUDED.total_gold,
+        last_match_end      = GREATEST(summoner_champion_stats.last_match_end, EXCLUDED.last_match_end);
+
+    RETURN TRUE;
+
+END;
+$$ LANGUAGE plpgsql;
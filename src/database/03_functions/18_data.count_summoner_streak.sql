@@ -0,0 +1,31 @@
+CREATE OR REPLACE FUNCTION data.count_summoner_streak(
+    _id_summoner            INTEGER
+) RETURNS SMALLINT
+AS $$
+DECLARE
+    _streak                 SMALLINT;
+BEGIN
+
+    WITH results AS (
+        SELECT  p.team_red = m.winning_team_red AS win,
+                ROW_NUMBER() OVER (ORDER BY m.match_end DESC) AS match_order
+        FROM data.participants p
+        JOIN data.matches m ON m.id = p.id_match
+        WHERE p.id_summoner = _id_summoner
+          AND p.stats_counted
+          AND m.winning_team_red IS NOT NULL
+    ), latest AS (
+        SELECT win
+        FROM results
+        WHERE match_order = 1
+    )
+    SELECT  (COUNT(*) * CASE WHEN (SELECT win FROM latest) THEN 1 ELSE -1 END)::SMALLINT
+    INTO _streak
+    FROM results r
+    WHERE r.match_order < COALESCE((SELECT MIN(match_order) FROM results WHERE win <> (SELECT win FROM latest)),
+                                (SELECT MAX(match_order) FROM results) + 1);
+
+    RETURN _streak;
+
+END;
+$$ LANGUAGE plpgsql;
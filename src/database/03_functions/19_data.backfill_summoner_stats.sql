@@ -0,0 +1,34 @@
+CREATE OR REPLACE FUNCTION data.backfill_summoner_stats(
+) RETURNS INTEGER
+AS $$
+DECLARE
+    _participant            RECORD;
+    _counted                INTEGER := 0;
+BEGIN
+
+    DELETE FROM data.summoner_champion_stats;
+    DELETE FROM data.summoner_stats;
+
+    UPDATE data.participants
+    SET stats_counted = FALSE
+    WHERE stats_counted;
+
+    -- Going through matches chronologically keeps every streak update on the cheap incremental path.
+    FOR _participant IN
+        SELECT  p.id_match,
+                p.id_summoner
+        FROM data.participants p
+        JOIN data.matches m ON m.id = p.id_match
+        WHERE m.match_end IS NOT NULL
+          AND p.kills IS NOT NULL
+        ORDER BY m.match_end, p.id_match
+    LOOP
+        IF data.update_summoner_stats(_participant.id_match, _participant.id_summoner) THEN
+            _counted := _counted + 1;
+        END IF;
+    END LOOP;
+
+    RETURN _counted;
+
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,34 @@
+CREATE OR REPLACE FUNCTION data.select_summoner_stats(
+    _puu_id                 CHARACTER VARYING
+) RETURNS TABLE (
+    matches                 INTEGER,
+    wins                    INTEGER,
+    losses                  INTEGER,
+    kills                   INTEGER,
+    deaths                  INTEGER,
+    assists                 INTEGER,
+    cs                      INTEGER,
+    total_gold              BIGINT,
+    streak                  SMALLINT,
+    last_match_end          TIMESTAMP
+)
+AS $$
+BEGIN
+
+    RETURN QUERY
+    SELECT  ss.matches,
+            ss.wins,
+            ss.losses,
+            ss.kills,
+            ss.deaths,
+            ss.assists,
+            ss.cs,
+            ss.total_gold,
+            ss.streak,
+            ss.last_match_end
+    FROM data.summoners s
+    JOIN data.summoner_stats ss ON ss.id_summoner = s.id
+    WHERE s.riot_puu_id = _puu_id;
+
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,35 @@
+CREATE OR REPLACE FUNCTION data.select_summoner_champion_stats(
+    _puu_id                 CHARACTER VARYING
+) RETURNS TABLE (
+    id_champion             INTEGER,
+    matches                 INTEGER,
+    wins                    INTEGER,
+    losses                  INTEGER,
+    kills                   INTEGER,
+    deaths                  INTEGER,
+    assists                 INTEGER,
+    cs                      INTEGER,
+    total_gold              BIGINT,
+    last_match_end          TIMESTAMP
+)
+AS $$
+BEGIN
+
+    RETURN QUERY
+    SELECT  scs.id_champion,
+            scs.matches,
+            scs.wins,
+            scs.losses,
+            scs.kills,
+            scs.deaths,
+            scs.assists,
+            scs.cs,
+            scs.total_gold,
+            scs.last_match_end
+    FROM data.summoners s
+    JOIN data.summoner_champion_stats scs ON scs.id_summoner = s.id
+    WHERE s.riot_puu_id = _puu_id
+    ORDER BY scs.matches DESC;
+
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,43 @@
+DROP FUNCTION IF EXISTS data.export_matches(BIGINT, BIGINT);
+
+CREATE OR REPLACE FUNCTION data.export_matches(
+    _modified_from          BIGINT,
+    _modified_to            BIGINT,
+    _exported_snapshot      PG_SNAPSHOT DEFAULT NULL
+) RETURNS TABLE (
+    patch                   CHARACTER VARYING,
+    month                   CHARACTER VARYING,
+    riot_match_id           BIGINT,
+    id_server               SMALLINT,
+    match_creation          TIMESTAMP,
+    match_start             TIMESTAMP,
+    match_end               TIMESTAMP,
+    duration                INTEGER,
+    winning_team_red        BOOLEAN,
+    game_version            CHARACTER VARYING,
+    modified_seq            BIGINT
+)
+AS $$
+
+    -- Plain SQL so the planner can inline it and the rows are streamed instead of materialized.
+    SELECT  (split_part(m.game_version, '.', 1) || '.' || split_part(m.game_version, '.', 2))::CHARACTER VARYING,
+            to_char(m.match_end, 'YYYY-MM')::CHARACTER VARYING,
+            m.riot_match_id,
+            m.id_server,
+            m.match_creation,
+            m.match_start,
+            m.match_end,
+            EXTRACT(EPOCH FROM m.match_end - m.match_start)::INTEGER,
+            m.winning_team_red,
+            m.game_version,
+            m.modified_seq
+    FROM data.matches m
+    -- Changes the previous export couldn't see were not committed yet, they are exported even with lower modified_seq.
+    WHERE (m.modified_seq > _modified_from
+           OR (m.modified_xid >= pg_snapshot_xmin(_exported_snapshot)
+               AND NOT pg_visible_in_snapshot(m.modified_xid, _exported_snapshot)))
+      AND m.modified_seq <= _modified_to
+      AND m.match_end IS NOT NULL
+    ORDER BY 1, 2, m.modified_seq;
+
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,74 @@
+DROP FUNCTION IF EXISTS data.export_participants(BIGINT, BIGINT);
+
+CREATE OR REPLACE FUNCTION data.export_participants(
+    _modified_from          BIGINT,
+    _modified_to            BIGINT,
+    _exported_snapshot      PG_SNAPSHOT DEFAULT NULL
+) RETURNS TABLE (
+    patch                   CHARACTER VARYING,
+    month                   CHARACTER VARYING,
+    riot_match_id           BIGINT,
+    id_server               SMALLINT,
+    riot_puu_id             CHARACTER VARYING,
+    gamename                CHARACTER VARYING,
+    tagline                 CHARACTER VARYING,
+    team_red                BOOLEAN,
+    win                     BOOLEAN,
+    role                    CHARACTER VARYING,
+    id_champion             INTEGER,
+    summ_spell_1            SMALLINT,
+    summ_spell_2            SMALLINT,
+    runes_primary           INTEGER,
+    runes_secondary         INTEGER,
+    runes                   INTEGER[],
+    small_runes             SMALLINT[],
+    kills                   SMALLINT,
+    deaths                  SMALLINT,
+    assists                 SMALLINT,
+    cs                      SMALLINT,
+    total_gold              SMALLINT,
+    items                   INTEGER[],
+    mastery_points          INTEGER,
+    bot                     BOOLEAN,
+    modified_seq            BIGINT
+)
+AS $$
+
+    SELECT  (split_part(m.game_version, '.', 1) || '.' || split_part(m.game_version, '.', 2))::CHARACTER VARYING,
+            to_char(m.match_end, 'YYYY-MM')::CHARACTER VARYING,
+            m.riot_match_id,
+            m.id_server,
+            s.riot_puu_id,
+            s.gamename,
+            s.tagline,
+            p.team_red,
+            p.team_red = m.winning_team_red,
+            r.name,
+            p.id_champion,
+            p.summ_spell_1,
+            p.summ_spell_2,
+            p.runes_primary,
+            p.runes_secondary,
+            p.runes,
+            p.small_runes,
+            p.kills,
+            p.deaths,
+            p.assists,
+            p.cs,
+            p.total_gold,
+            p.items,
+            p.mastery_points,
+            p.bot,
+            m.modified_seq
+    FROM data.matches m
+    JOIN data.participants p ON m.id = p.id_match
+    JOIN data.summoners s ON s.id = p.id_summoner
+    LEFT JOIN data.roles r ON r.id = p.id_role
+    WHERE (m.modified_seq > _modified_from
+           OR (m.modified_xid >= pg_snapshot_xmin(_exported_snapshot)
+               AND NOT pg_visible_in_snapshot(m.modified_xid, _exported_snapshot)))
+      AND m.modified_seq <= _modified_to
+      AND m.match_end IS NOT NULL
+    ORDER BY 1, 2, m.modified_seq;
+
+$$ LANGUAGE sql STABLE;
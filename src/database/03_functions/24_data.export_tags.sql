@@ -0,0 +1,39 @@
+DROP FUNCTION IF EXISTS data.export_tags(BIGINT, BIGINT);
+
+CREATE OR REPLACE FUNCTION data.export_tags(
+    _modified_from          BIGINT,
+    _modified_to            BIGINT,
+    _exported_snapshot      PG_SNAPSHOT DEFAULT NULL
+) RETURNS TABLE (
+    patch                   CHARACTER VARYING,
+    month                   CHARACTER VARYING,
+    riot_match_id           BIGINT,
+    id_server               SMALLINT,
+    riot_puu_id             CHARACTER VARYING,
+    id_tag                  SMALLINT,
+    id_severity             SMALLINT,
+    note                    CHARACTER VARYING,
+    modified_seq            BIGINT
+)
+AS $$
+
+    SELECT  (split_part(m.game_version, '.', 1) || '.' || split_part(m.game_version, '.', 2))::CHARACTER VARYING,
+            to_char(m.match_end, 'YYYY-MM')::CHARACTER VARYING,
+            m.riot_match_id,
+            m.id_server,
+            s.riot_puu_id,
+            at.id_tag,
+            at.id_severity,
+            at.note,
+            m.modified_seq
+    FROM data.matches m
+    JOIN data.assigned_tags at ON m.id = at.id_match
+    JOIN data.summoners s ON s.id = at.id_summoner
+    WHERE (m.modified_seq > _modified_from
+           OR (m.modified_xid >= pg_snapshot_xmin(_exported_snapshot)
+               AND NOT pg_visible_in_snapshot(m.modified_xid, _exported_snapshot)))
+      AND m.modified_seq <= _modified_to
+      AND m.match_end IS NOT NULL
+    ORDER BY 1, 2, m.modified_seq;
+
+$$ LANGUAGE sql STABLE;
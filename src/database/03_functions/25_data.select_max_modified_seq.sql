@@ -0,0 +1,15 @@
+CREATE OR REPLACE FUNCTION data.select_max_modified_seq(
+) RETURNS BIGINT
+AS $$
+DECLARE
+    _modified_seq           BIGINT;
+BEGIN
+
+    SELECT  MAX(modified_seq)
+    INTO _modified_seq
+    FROM data.matches;
+
+    RETURN COALESCE(_modified_seq, 0);
+
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,22 @@
+CREATE OR REPLACE FUNCTION data.upsert_match_timeline(
+    _riot_match_id          BIGINT,
+    _id_server              INTEGER,
+    _frames                 BYTEA
+) RETURNS BOOLEAN
+AS $$
+BEGIN
+
+    -- Timeline can only be attached to an already stored match.
+    INSERT INTO data.match_timelines(id_match, frames)
+    SELECT id, _frames
+    FROM data.matches
+    WHERE riot_match_id = _riot_match_id
+      AND id_server = _id_server
+    ON CONFLICT (id_match)
+    DO UPDATE
+    SET frames = EXCLUDED.frames;
+
+    RETURN FOUND;
+
+END;
+$$ LANGUAGE plpgsql;
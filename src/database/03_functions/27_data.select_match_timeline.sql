@@ -0,0 +1,20 @@
+CREATE OR REPLACE FUNCTION data.select_match_timeline(
+    _riot_match_id          BIGINT,
+    _id_server              INTEGER
+) RETURNS BYTEA
+AS $$
+DECLARE
+    _frames                 BYTEA;
+BEGIN
+
+    SELECT  t.frames
+    INTO _frames
+    FROM data.matches m
+    JOIN data.match_timelines t ON m.id = t.id_match
+    WHERE m.riot_match_id = _riot_match_id
+      AND m.id_server = _id_server;
+
+    RETURN _frames;
+
+END;
+$$ LANGUAGE plpgsql;
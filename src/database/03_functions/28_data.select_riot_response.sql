@@ -0,0 +1,20 @@
+CREATE OR REPLACE FUNCTION data.select_riot_response(
+    _cache_key              CHARACTER VARYING
+) RETURNS TABLE (
+    age                     DOUBLE PRECISION,
+    status_code             SMALLINT,
+    content                 BYTEA
+)
+AS $$
+BEGIN
+
+    -- Age is computed here, so clocks of the database and the service don't have to agree.
+    RETURN QUERY
+    SELECT  EXTRACT(EPOCH FROM NOW() - r.stored_at)::DOUBLE PRECISION,
+            r.status_code,
+            r.content
+    FROM data.riot_responses r
+    WHERE r.cache_key = _cache_key;
+
+END;
+$$ LANGUAGE plpgsql;
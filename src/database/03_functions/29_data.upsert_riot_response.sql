@@ -0,0 +1,25 @@
+CREATE OR REPLACE FUNCTION data.upsert_riot_response(
+    _cache_key              CHARACTER VARYING,
+    _status_code            SMALLINT,
+    _content                BYTEA,
+    _max_age                INTEGER
+) RETURNS BOOLEAN
+AS $$
+BEGIN
+
+    INSERT INTO data.riot_responses(cache_key, status_code, content, stored_at)
+    VALUES (_cache_key, _status_code, _content, NOW())
+    ON CONFLICT (cache_key)
+    DO UPDATE
+    SET status_code = EXCLUDED.status_code,
+        content = EXCLUDED.content,
+        stored_at = EXCLUDED.stored_at;
+
+    -- Responses too old to be served even when RIOT is unavailable are of no use.
+    DELETE FROM data.riot_responses
+    WHERE stored_at < NOW() - make_interval(secs => _max_age);
+
+    RETURN TRUE;
+
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,10 @@
+DO LANGUAGE plpgsql $$
+BEGIN
+
+    -- Fills the stats tables from already stored matches the first time they are created.
+    IF NOT EXISTS (SELECT FROM data.summoner_stats) THEN
+        PERFORM data.backfill_summoner_stats();
+    END IF;
+
+END
+$$;
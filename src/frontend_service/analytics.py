@@ -0,0 +1,179 @@
+import common.data_models as data_models
+import numpy as np
+
+"""
+Batch analytics over match histories of many players at once. Histories are padded into arrays of shape
+players x games, most recent game first. Results use WIN, LOSS and UNKNOWN (undecided game or padding), stats arrays
+use NaN and champions -1 for games that are missing.
+"""
+
+WIN = 1
+LOSS = 0
+UNKNOWN = -1
+
+WR_HIGH = .55
+WR_LOW = .45
+STREAK_MIN = 3
+
+
+def histories_to_arrays(histories: list[list[data_models.Match] | None]) -> dict[str, np.ndarray]:
+    """
+    Packs match histories into padded arrays. Every match is expected to contain only the player the history belongs
+    to, as ActiveMatchModel keeps it.
+    :param histories: List of histories, one per player, most recent match first.
+    :return: Dict with arrays results, champions, kills, deaths, assists, cs, gold (players x games) and lengths.
+    """
+    players = len(histories)
+    games = max((len(h) for h in histories if h), default=0)
+    arrays = {
+        'results': np.full((players, games), UNKNOWN, dtype=np.int8),
+        'champions': np.full((players, games), -1, dtype=np.int32),
+        'lengths': np.array([len(h) if h else 0 for h in histories], dtype=np.int32)
+    }
+    for stat in ('kills', 'deaths', 'assists', 'cs', 'gold'):
+        arrays[stat] = np.full((players, games), np.nan)
+
+    for i, history in enumerate(histories):
+        for j, match in enumerate(history or []):
+            participant = match.participants[0]
+            if match.match_detail and match.match_detail.winning_team_red is not None:
+                arrays['results'][i, j] = participant.team_red == match.match_detail.winning_team_red
+            arrays['champions'][i, j] = participant.champion
+            if participant.stats:
+                arrays['kills'][i, j] = participant.stats.kills
+                arrays['deaths'][i, j] = participant.stats.deaths
+                arrays['assists'][i, j] = participant.stats.assists
+                arrays['cs'][i, j] = participant.stats.cs
+                arrays['gold'][i, j] = participant.stats.total_gold
+
+    return arrays
+
+
+def decided_first(results: np.ndarray) -> np.ndarray:
+    """
+    Moves decided games to the front of every row keeping their order, so undecided games are skipped the same way the
+    per-player loop skipped them.
+    :param results: Results array.
+    :return: Results array with UNKNOWN only at the end of rows.
+    """
+    order = np.argsort(results == UNKNOWN, axis=1, kind='stable')
+    return np.take_along_axis(results, order, axis=1)
+
+
+def win_rates(results: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Counts wins and decided games of every player.
+    :param results: Results array.
+    :return: Wins, decided games and win rate (NaN when no game is decided).
+    """
+    wins = (results == WIN).sum(axis=1)
+    decided = (results != UNKNOWN).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = wins / decided
+    return wins, decided, rates
+
+
+def streaks(results: np.ndarray) -> (np.ndarray, np.ndarray):
+    """
+    Current streak of every player, counted over decided games from the most recent one.
+    :param results: Results array.
+    :return: Streak lengths (0 without decided games) and streak types (WIN, LOSS or UNKNOWN).
+    """
+    packed = decided_first(results)
+    if packed.shape[1] == 0:
+        return np.zeros(packed.shape[0], dtype=np.int64), np.full(packed.shape[0], UNKNOWN, dtype=np.int8)
+
+    types = packed[:, 0]
+    same = (packed == types[:, None]) & (packed != UNKNOWN)
+    lengths = np.where(same.all(axis=1), packed.shape[1], same.argmin(axis=1))
+    return lengths, types
+
+
+def rolling_form(results: np.ndarray, window: int = 5) -> np.ndarray:
+    """
+    Rolling win rate over decided games.
+    :param results: Results array.
+    :param window: Number of decided games in a window.
+    :return: Array players x windows, column 0 being the most recent window. NaN where the window isn't full.
+    """
+    packed = decided_first(results)
+    wins = np.cumsum(np.pad(packed == WIN, ((0, 0), (1, 0))), axis=1)
+    decided = np.cumsum(np.pad(packed != UNKNOWN, ((0, 0), (1, 0))), axis=1)
+    windows = max(packed.shape[1] - window + 1, 0)
+    window_wins = wins[:, window:window + windows] - wins[:, :windows]
+    window_decided = decided[:, window:window + windows] - decided[:, :windows]
+    return np.where(window_decided == window, window_wins / window, np.nan)
+
+
+def averages(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Average stats of every player.
+    :param arrays: Arrays created by histories_to_arrays.
+    :return: Dict with average kills, deaths, assists, cs, gold and KDA per player, NaN without games.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = {stat: np.nanmean(arrays[stat], axis=1) for stat in ('kills', 'deaths', 'assists', 'cs', 'gold')}
+        result['kda'] = (result['kills'] + result['assists']) / np.maximum(result['deaths'], 1)
+    return result
+
+
+def champion_aggregates(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """
+    Aggregates games of every player per champion.
+    :param arrays: Arrays created by histories_to_arrays.
+    :return: Dict of equally long arrays player (row index), champion, games, wins, losses and sums of kills, deaths,
+    assists, cs and gold. Sorted by player and champion.
+    """
+    champions = arrays['champions']
+    valid = champions >= 0
+    players = np.broadcast_to(np.arange(champions.shape[0])[:, None], champions.shape)[valid]
+    keys, inverse = np.unique(np.stack((players, champions[valid])), axis=1, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    groups = keys.shape[1]
+    results = arrays['results'][valid]
+
+    aggregates = {
+        'player': keys[0],
+        'champion': keys[1],
+        'games': np.bincount(inverse, minlength=groups),
+        'wins': np.bincount(inverse, weights=results == WIN, minlength=groups).astype(np.int64),
+        'losses': np.bincount(inverse, weights=results == LOSS, minlength=groups).astype(np.int64)
+    }
+    for stat in ('kills', 'deaths', 'assists', 'cs', 'gold'):
+        aggregates[stat] = np.bincount(inverse, weights=np.nan_to_num(arrays[stat][valid]), minlength=groups)
+
+    return aggregates
+
+
+def results_alerts(results: np.ndarray, lengths: np.ndarray) -> list[list[data_models.Alert]]:
+    """
+    Creates win rate and streak alerts for every player.
+    :param results: Results array.
+    :param lengths: Number of games in history of every player, including undecided ones.
+    :return: List of alerts for every player.
+    """
+    wins, decided, rates = win_rates(results)
+    high = (decided > 0) & (wins > decided * WR_HIGH)
+    low = (decided > 0) & (wins < decided * WR_LOW)
+    streak_lengths, streak_types = streaks(results)
+    streak = streak_lengths >= STREAK_MIN
+
+    # Python lists are much faster to index than NumPy scalars while building the alert objects.
+    rates, lengths, streak_lengths = rates.tolist(), lengths.tolist(), streak_lengths.tolist()
+    high, low, streak, won = high.tolist(), low.tolist(), streak.tolist(), (streak_types == WIN).tolist()
+
+    alerts = [[] for _ in range(results.shape[0])]
+    for i in np.flatnonzero(np.logical_or.reduce((high, low, streak))).tolist():
+        if high[i] or low[i]:
+            alerts[i].append(data_models.Alert(name='WR',
+                                               detail=f'{rates[i]:.0%} WR from last {lengths[i]} ranked games',
+                                               priority=1,
+                                               color='green' if high[i] else 'red'))
+        if streak[i]:
+            alerts[i].append(data_models.Alert(name='STR',
+                                               detail=f'{streak_lengths[i]} ranked games streak of '
+                                                      f'{"wins" if won[i] else "loses"}.',
+                                               priority=2,
+                                               color='green' if won[i] else 'red'))
+
+    return alerts
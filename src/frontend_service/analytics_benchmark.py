@@ -0,0 +1,94 @@
+import analytics
+import common.data_models as data_models
+import numpy as np
+import time
+
+"""
+Compares batch analytics with the per-player loop ActiveMatchModel used before, checking both produce the same alerts.
+Run from frontend_service folder: python analytics_benchmark.py
+"""
+
+GAMES = 20
+REPEATS = 5
+
+
+def loop_alerts(results: list[list[bool | None]]) -> list[list[data_models.Alert]]:
+    """
+    Per-player alerts computed the way ActiveMatchModel._add_alerts_from_results_history used to.
+    :param results: History of every player, None for undecided games.
+    :return: List of alerts for every player.
+    """
+    all_alerts = []
+    for history in results:
+        alerts = []
+        decided = [result for result in history if result is not None]
+        if decided:
+            wins_count = decided.count(True)
+            if wins_count > (len(decided) * .55):
+                alerts.append(data_models.Alert(name='WR',
+                                                detail=f'{(wins_count / len(decided)):.0%} WR from last '
+                                                       f'{len(history)} ranked games',
+                                                priority=1,
+                                                color='green'))
+            if wins_count < (len(decided) * .45):
+                alerts.append(data_models.Alert(name='WR',
+                                                detail=f'{(wins_count / len(decided)):.0%} WR from last '
+                                                       f'{len(history)} ranked games',
+                                                priority=1,
+                                                color='red'))
+
+            streak_length = 1
+            streak_type = decided[0]
+            for match in decided[1:]:
+                if match != streak_type:
+                    break
+                else:
+                    streak_length += 1
+
+            if streak_length > 2:
+                alerts.append(data_models.Alert(name='STR',
+                                                detail=f'{streak_length} ranked games streak of '
+                                                       f'{"wins" if streak_type else "loses"}.',
+                                                priority=2,
+                                                color='green' if streak_type else 'red'))
+        all_alerts.append(alerts)
+
+    return all_alerts
+
+
+def benchmark(players: int) -> None:
+    """
+    Times both implementations for given number of players and checks they agree.
+    :param players: Number of players.
+    """
+    rng = np.random.default_rng(players)
+    results = rng.choice(np.array([analytics.WIN, analytics.LOSS, analytics.UNKNOWN], dtype=np.int8),
+                         size=(players, GAMES), p=[.5, .45, .05])
+    lengths = np.full(players, GAMES)
+    histories = [[None if r == analytics.UNKNOWN else bool(r) for r in row] for row in results.tolist()]
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        expected = loop_alerts(histories)
+    loop_time = (time.perf_counter() - start) / REPEATS
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        analytics.win_rates(results)
+        analytics.streaks(results)
+    stats_time = (time.perf_counter() - start) / REPEATS
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        actual = analytics.results_alerts(results, lengths)
+    batch_time = (time.perf_counter() - start) / REPEATS
+
+    assert expected == actual
+    # Creating the pydantic Alert objects costs the same in both versions and dominates for large batches.
+    print(f'{players:>6} players: loop {loop_time * 1000:9.3f} ms, batch stats {stats_time * 1000:9.3f} ms, '
+          f'batch with alerts {batch_time * 1000:9.3f} ms')
+
+
+if __name__ == '__main__':
+    for count in (10, 10000):
+        benchmark(count)
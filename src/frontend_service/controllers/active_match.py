@@ -31,7 +31,10 @@ class ActiveMatchController:
         Binds all necessary events.
         """
         self.frame.add_event_listener('check_active_match', self._check_active_match)
+        # Updates triggered several times during one poll are redrawn once.
+        self.model.active_match.enable_coalescing(self.frame, ('participants_updated',))
         self.model.active_match.add_event_listener('participants_updated', self._update_participant_frames)
+        self.model.active_match.add_event_listener('participants_found', self._preload_images)
         self.model.active_match.add_event_listener('new_match_found', self._new_match)
         self.model.active_match.add_event_listener('match_ended', self._match_ended)
         self.frame.bind_champframes_events('participant_picked', self._update_infoframe)
@@ -54,6 +57,14 @@ class ActiveMatchController:
 
             self._position += 1
 
+    @utils.logged_func
+    def _preload_images(self, *args, participants_list: list[str], **kwargs) -> None:
+        """
+        Starts decoding images of participants of a new match before their frames are shown.
+        :param participants_list: List of participant puu ids.
+        """
+        self.view.preload_images(self.model.active_match.get_participants(participants_list))
+
     @utils.logged_func
     def _new_match(self, *args, match_id: int, **kwargs) -> None:
         """
@@ -64,6 +75,7 @@ class ActiveMatchController:
         self._match_id = match_id
         participants_dict = self.model.active_match.get_all_participants()
         self._participants = [value.summoner.puu_id for value in participants_dict.values()]
+        self.frame.teardown()
         self.frame.update_champ_frames(update_dict=participants_dict, new_participant=True)
         self._update_infoframe(participant=self.model.active_match.get_participant(self._participants[0])[1])
         self._position = 1
@@ -4,6 +4,9 @@ from models.main import Model
 from views.main import View
 import utils
 import logging
+from typing import Any
+
+STARTUP_REPORT_PATH = 'logs/startup_report.json'
 
 
 class Controller:
@@ -57,11 +60,54 @@ class Controller:
     @utils.logged_func
     def _startup_process(self, *args, **kwargs) -> None:
         """
-        Handles the startup of application up to opening the main window.
+        Handles the startup of application up to opening the main window. Settings and the newest ddragon version are
+        loaded at once, everything else starts as soon as the data it needs are available.
         """
         logging.info('Controller._startup_process starting.')
-        self.settings.init_load()
-        ddragon_result = self.settings.loading_process(loading_object=self.view.loading, force_download=False)
+        pipeline = utils.StartupPipeline(self.view.root, self.view.loading)
+        pipeline.add_stage('settings', lambda progress: self.model.settings.init_load())
+        pipeline.add_stage('ddragon_version', lambda progress: self.settings.latest_ddragon_version())
+        pipeline.add_stage('show_settings', lambda progress, _: self.settings.show_settings(),
+                           requires=('settings',), main_thread=True, weight=.1)
+        pipeline.add_stage('ddragon_data',
+                           lambda progress, _, version: self.settings.update_ddragon(
+                               progress, self.model.settings.get_setting('ddragon_version'), version, False),
+                           requires=('settings', 'ddragon_version'), weight=6)
+        pipeline.add_stage('lazyreaders', self._startup_lazyreaders, requires=('ddragon_data',), weight=3)
+        pipeline.add_stage('start', self._startup_start, requires=('ddragon_data', 'lazyreaders'),
+                           main_thread=True, weight=.1)
+        pipeline.run(lambda results, pipeline=pipeline: self._startup_done(pipeline, results))
+
+    def _startup_lazyreaders(self, progress: utils.TrackingLoadingProgress, ddragon_data: (int, str)) -> None:
+        """
+        Startup stage initializing lazy readers, unless the ddragon data are unusable.
+        :param progress: The object tracking the progress of the stage.
+        :param ddragon_data: Result of the ddragon update and the version to be used.
+        """
+        result, version = ddragon_data
+        if result < 2:
+            self.settings.init_lazyreaders(progress, version)
+
+    def _startup_start(self, progress: utils.TrackingLoadingProgress, ddragon_data: (int, str), _) -> None:
+        """
+        Startup stage starting the lazy readers on the main thread, unless the ddragon data are unusable.
+        :param progress: The object tracking the progress of the stage.
+        :param ddragon_data: Result of the ddragon update and the version to be used.
+        """
+        result, version = ddragon_data
+        if result < 2:
+            self.settings.start_lazyreaders(progress, version, False)
+        progress.update_progress(1, 'All done!')
+
+    @utils.logged_func
+    def _startup_done(self, pipeline: utils.StartupPipeline, results: dict[str, Any]) -> None:
+        """
+        Opens the main window once the startup stages are finished.
+        :param pipeline: The finished startup pipeline.
+        :param results: Results of the startup stages.
+        """
+        pipeline.write_report(STARTUP_REPORT_PATH)
+        ddragon_result = results['ddragon_data'][0] if results['ddragon_data'] else 2
         logging.debug(f'Controller._startup_process ddragon result: {ddragon_result}')
         # If ddragon data end up in unusable state end the application, otherwise start it.
         if ddragon_result < 2:
@@ -69,6 +115,7 @@ class Controller:
             self.view.loading.destroy()
         else:
             self.view.root.destroy()
+            return
 
         settings = self.settings.check_settings()
         logging.info(f'Controller._startup_process settings: {settings}')
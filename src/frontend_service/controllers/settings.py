@@ -4,7 +4,6 @@ from models.main import Model
 import ddragon_updater
 import requests
 import utils
-import time
 import logging
 
 
@@ -74,7 +73,13 @@ class SettingsController:
         Makes model load all settings and passes them to view to display.
         """
         self.model.settings.init_load()
+        self.show_settings()
 
+    @utils.logged_func
+    def show_settings(self, *args, **kwargs) -> None:
+        """
+        Passes loaded settings to view to display. Has to be called from tkinter main thread.
+        """
         user = self.model.settings.get_setting('user')
         self.frame.user_var.set(f'{user.name}#{user.tagline}' if user else '')
         riot_api_key = self.model.settings.get_setting("riot_api_key")
@@ -126,69 +131,121 @@ class SettingsController:
         try:
             logging.info('Start of SettingsController.loading_process')
             logging.debug(loading_object)
-            version = None
             if force_download:
                 loading_object.update_progress(.1, f'Forcing download...')
                 current_version = ''
-                utils.LazyChampions.reset()
-                utils.LazyRunes.reset()
-                utils.LazySummoners.reset()
-                utils.LazyItems.reset()
             else:
                 loading_object.update_progress(.1, f'Checking ddragon version...')
                 current_version = self.model.settings.get_setting('ddragon_version')
 
-            r = requests.get(url='https://ddragon.leagueoflegends.com/api/versions.json')
-            if not r:
-                current_version = self.model.settings.get_setting('ddragon_version')
-                logging.error(f'Failed to acquire newest ddragon version, keeping {current_version}. Some assets might '
-                              f'be missing!')
-            else:
-                version = r.json()[0]
-
-            if version == current_version:
-                logging.info(f'Ddragon version up to date: {version}.')
-                loading_object.update_progress(.75, f'Ddragon version up to date: {version}.')
-                result = 0
-            else:
-                logging.info(f'Current ddragon version is {current_version}, newest available is {version}')
-                loading_object.update_progress(.15, f'Downloading ddragon version {version} ...')
-                if ddragon_updater.download_ddragon_version(version):
-                    try:
-                        loading_object.update_progress(.35, f'Clearing folder...')
-                        ddragon_updater.clear_ddragon_folder()
-                        loading_object.update_progress(.45, f'Unpacking {version}.tgz ...')
-                        ddragon_updater.unpack_file(version)
-                        if force_download:
-                            raise NotImplementedError
-                        result = 0
-                    except Exception as e:
-                        logging.error(f'Error starting with new ddragon data, please try downloading again!')
-                        logging.error(e, exc_info=True)
-                        current_version = None
-                        self.model.settings.switch_ddragon_version(ddragon_version=current_version)
-                        loading_object.update_progress(.99, f'ERROR! Ending download process...')
-                        result = 2
-                else:
-                    logging.warning(f'Keeping ddragon version {current_version}. Some assets might be missing!')
-                    loading_object.update_progress(.8, f'Initializing layzreaders...')
-
+            version = self.latest_ddragon_version()
+            result, version = self.update_ddragon(utils.ProgressRange(loading_object, .1, .8),
+                                                  current_version, version, force_download)
             if result < 2:
-                loading_object.update_progress(.8, f'Initializing layzreaders...')
-                self.view.version = version
-                self.view.init_lazyreaders()
-
-                if force_download:
-                    loading_object.update_progress(.98, f'Restarting...')
-                else:
-                    loading_object.update_progress(.98, f'Starting app...')
-                self.model.settings.switch_ddragon_version(ddragon_version=version)
-                self.frame.ddragon_version_var.set(f'{version}')
-                logging.info(f'Successfully started with version {version}')
-
-            time.sleep(2)
+                self.init_lazyreaders(utils.ProgressRange(loading_object, .8, .98), version)
+                self.start_lazyreaders(loading_object, version, force_download)
+
             loading_object.update_progress(1, f'All done!')
         except Exception as e:
             logging.error(f'Error during ddragon downloading: {e}', exc_info=True)
 
         return result
+
+    def latest_ddragon_version(self) -> str | None:
+        """
+        Asks ddragon for the newest data version.
+        :return: The newest version, None if it couldn't be acquired.
+        """
+        r = requests.get(url='https://ddragon.leagueoflegends.com/api/versions.json')
+        if not r:
+            logging.error(f'Failed to acquire newest ddragon version, keeping '
+                          f'{self.model.settings.get_setting("ddragon_version")}. Some assets might be missing!')
+            return None
+        return r.json()[0]
+
+    def update_ddragon(self,
+                       loading_object: utils.TrackingLoadingProgress,
+                       current_version: str | None,
+                       version: str | None,
+                       force_download: bool) -> (int, str | None):
+        """
+        Brings ddragon data to the newest version, incrementally if possible. Doesn't touch tkinter, so it can run in a
+        worker thread.
+        :param loading_object: The object tracking the progress.
+        :param current_version: Version of the data currently used, empty when forcing download.
+        :param version: The newest version, None if it couldn't be acquired.
+        :param force_download: If True new data is downloaded regardless of the current version.
+        :return: Result as in loading_process and the version to be used.
+        """
+        if force_download:
+            utils.LazyChampions.reset()
+            utils.LazyRunes.reset()
+            utils.LazySummoners.reset()
+            utils.LazyItems.reset()
+
+        if version is None:
+            current_version = self.model.settings.get_setting('ddragon_version')
+            loading_object.update_progress(1, f'Keeping ddragon version {current_version}.')
+            return 1, current_version
+
+        if version == current_version:
+            logging.info(f'Ddragon version up to date: {version}.')
+            loading_object.update_progress(1, f'Ddragon version up to date: {version}.')
+            return 0, version
+
+        if not force_download and ddragon_updater.update_incrementally(current_version, version, loading_object,
+                                                                       (.05, 1)):
+            logging.info(f'Ddragon version {current_version} updated to {version} incrementally.')
+            utils.build_index(version)
+            return 0, version
+
+        logging.info(f'Current ddragon version is {current_version}, newest available is {version}')
+        loading_object.update_progress(.05, f'Downloading ddragon version {version} ...')
+        if not ddragon_updater.download_ddragon_version(version, loading_object, (.05, .4)):
+            logging.warning(f'Keeping ddragon version {current_version}. Some assets might be missing!')
+            return 1, current_version
+
+        try:
+            loading_object.update_progress(.4, f'Clearing folder...')
+            ddragon_updater.clear_ddragon_folder()
+            loading_object.update_progress(.5, f'Unpacking {version}.tgz ...')
+            ddragon_updater.unpack_file(version, loading_object, (.5, 1))
+            utils.build_index(version)
+            if force_download:
+                raise NotImplementedError
+            return 0, version
+        except Exception as e:
+            logging.error(f'Error starting with new ddragon data, please try downloading again!')
+            logging.error(e, exc_info=True)
+            self.model.settings.switch_ddragon_version(ddragon_version=None)
+            loading_object.update_progress(1, f'ERROR! Ending download process...')
+            return 2, None
+
+    def init_lazyreaders(self, loading_object: utils.TrackingLoadingProgress, version: str) -> None:
+        """
+        Inits lazy readers with the version, builds their image cache and stores the version. Doesn't touch tkinter,
+        so it can run in a worker thread.
+        :param loading_object: The object tracking the progress.
+        :param version: Version of ddragon data to be used.
+        """
+        loading_object.update_progress(0, f'Initializing layzreaders...')
+        self.view.version = version
+        self.view.init_lazyreaders()
+        self.view.build_image_cache(loading_object, 0, 1)
+        self.model.settings.switch_ddragon_version(ddragon_version=version)
+
+    def start_lazyreaders(self, loading_object: utils.TrackingLoadingProgress, version: str,
+                          force_download: bool) -> None:
+        """
+        Starts warming lazy readers and shows the version. Has to be called from tkinter main thread.
+        :param loading_object: The object tracking the progress.
+        :param version: Version of ddragon data used.
+        :param force_download: True if the data were repaired.
+        """
+        self.view.warm_lazyreaders()
+        if force_download:
+            loading_object.update_progress(.98, f'Restarting...')
+        else:
+            loading_object.update_progress(.98, f'Starting app...')
+        self.frame.ddragon_version_var.set(f'{version}')
+        logging.info(f'Successfully started with version {version}')
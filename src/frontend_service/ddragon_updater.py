@@ -1,18 +1,119 @@
+import utils
+import gzip
 import logging
+import multiprocessing
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import tarfile
 import shutil
 import os
 
+CDN_URL = 'https://ddragon.leagueoflegends.com/cdn'
+CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_ATTEMPTS = 5
+DATA_FILES = ('champion.json', 'item.json', 'summoner.json', 'runesReforged.json')
+# Incremental update falls back to the full tarball when more files than this changed.
+MAX_INCREMENTAL_FILES = 400
+FETCH_WORKERS = 8
 
-def unpack_file(version: str) -> None:
+
+def extraction_manifest(version: str) -> tuple[str, ...]:
+    """
+    Paths inside the dragontail archive the lazy readers use. Entries ending with / cover whole folders.
+    :param version: Version of the data.
+    :return: Tuple of paths.
+    """
+    return (f'{version}/data/en_US/champion.json',
+            f'{version}/data/en_US/item.json',
+            f'{version}/data/en_US/summoner.json',
+            f'{version}/data/en_US/runesReforged.json',
+            f'{version}/img/champion/',
+            f'{version}/img/item/',
+            f'{version}/img/spell/',
+            'img/champion/loading/',
+            'img/perk-images/')
+
+
+class _ProgressReader:
     """
-    Unpacks .tar file.
+    File wrapper sharing the fraction of the file already read with another process.
+    """
+
+    def __init__(self, file, size: int, progress: multiprocessing.Value):
+        """
+        Inits _ProgressReader.
+        :param file: File opened for binary reading.
+        :param size: Size of the file.
+        :param progress: Shared value the fraction is written to.
+        """
+        self._file = file
+        self._size = size
+        self._read = 0
+        self._progress = progress
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads from the file and updates progress.
+        :param size: Number of bytes to read.
+        :return: Read bytes.
+        """
+        data = self._file.read(size)
+        self._read += len(data)
+        self._progress.value = self._read / self._size
+        return data
+
+
+def _extract(version: str, manifest: tuple[str, ...], progress: multiprocessing.Value) -> None:
+    """
+    Streams through the archive and writes only members covered by the manifest. Runs in a worker process.
     :param version: Version of data to unpack.
+    :param manifest: Paths to extract, see extraction_manifest.
+    :param progress: Shared value with fraction of the archive processed.
+    """
+    extracted = 0
+    path = f'/{version}.tgz'
+    with open(path, 'rb') as f:
+        with tarfile.open(fileobj=_ProgressReader(f, os.path.getsize(path), progress), mode='r|gz') as archive:
+            for member in archive:
+                name = os.path.normpath(member.name)
+                if not member.isfile() or os.path.isabs(name) or name.startswith('..') or \
+                        not name.startswith(manifest):
+                    continue
+
+                target = os.path.join('/ddragon', name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.extractfile(member) as source, open(target, 'wb') as destination:
+                    shutil.copyfileobj(source, destination, CHUNK_SIZE)
+                extracted += 1
+
+    logging.info(f'Extracted {extracted} files from {version}.tgz')
+
+
+def unpack_file(version: str,
+                loading_object: utils.TrackingLoadingProgress = None,
+                progress_range: tuple[float, float] = (0, 1)) -> None:
+    """
+    Unpacks files the app uses from .tar file in a worker process, so the UI keeps updating.
+    :param version: Version of data to unpack.
+    :param loading_object: Object tracking the progress of unpacking.
+    :param progress_range: Progress reported at the start and at the end of unpacking.
     """
     logging.debug(f'Unpacking {version}.tgz')
-    with tarfile.open(f'/{version}.tgz') as f:
-        f.extractall('/ddragon')
+    start, end = progress_range
+    context = multiprocessing.get_context('spawn')
+    progress = context.Value('d', 0.)
+    process = context.Process(target=_extract, args=(version, extraction_manifest(version), progress),
+                              name='ddragon_extract')
+    process.start()
+    while process.is_alive():
+        if loading_object:
+            loading_object.update_progress(start + (end - start) * progress.value,
+                                           f'Unpacking {version}.tgz ... {progress.value:.0%}')
+        process.join(.1)
+
+    if process.exitcode != 0:
+        raise RuntimeError(f'Unpacking of {version}.tgz failed with exit code {process.exitcode}.')
 
 
 def clear_ddragon_folder() -> None:
@@ -28,19 +129,280 @@ def clear_ddragon_folder() -> None:
                 shutil.rmtree(entry.path)
 
 
-def download_ddragon_version(version: str) -> bool:
+def download_ddragon_version(version: str,
+                             loading_object: utils.TrackingLoadingProgress = None,
+                             progress_range: tuple[float, float] = (0, 1)) -> bool:
     """
-    Downloads ddragon data from RIOT.
+    Downloads ddragon data from RIOT. Data is streamed to a temporary file that is kept when download gets interrupted,
+    so the next attempt continues where the last one ended. The file is swapped in only after its integrity is checked.
     :param version: Version fo the data to download.
+    :param loading_object: Object tracking the progress of download.
+    :param progress_range: Progress reported at the start and at the end of download.
+    :return: True if downloaded, False otherwise.
     """
     logging.info(f'Starting downloading ddragon version {version} ...')
-    r = requests.get(url=f'https://ddragon.leagueoflegends.com/cdn/dragontail-{version}.tgz', allow_redirects=True)
+    path = f'/{version}.tgz'
+    part = f'{path}.part'
+    start, end = progress_range
 
-    if r.status_code == 200:
-        logging.info(f'Ddragon version {version} downloaded.')
-        with open(f'/{version}.tgz', 'wb') as f:
-            f.write(r.content)
-        return True
+    def report(progress: float, label: str) -> None:
+        if loading_object:
+            loading_object.update_progress(start + (end - start) * progress, label)
+
+    total = None
+    for attempt in range(DOWNLOAD_ATTEMPTS):
+        downloaded = os.path.getsize(part) if os.path.isfile(part) else 0
+        headers = {}
+        if downloaded and os.path.isfile(f'{part}.etag'):
+            # If-Range makes the server send the whole file again if it changed since the interrupted attempt.
+            with open(f'{part}.etag') as f:
+                headers = {'Range': f'bytes={downloaded}-', 'If-Range': f.read()}
+
+        try:
+            with requests.get(url=f'https://ddragon.leagueoflegends.com/cdn/dragontail-{version}.tgz',
+                              headers=headers, stream=True, allow_redirects=True, timeout=30) as r:
+                if r.status_code == 416:
+                    logging.info(f'Ddragon version {version} already fully downloaded.')
+                    total = downloaded
+                    break
+                if r.status_code == 206:
+                    logging.info(f'Resuming download of ddragon version {version} from {downloaded} bytes.')
+                    mode = 'ab'
+                elif r.status_code == 200:
+                    downloaded = 0
+                    mode = 'wb'
+                    if r.headers.get('ETag'):
+                        with open(f'{part}.etag', 'w') as f:
+                            f.write(r.headers['ETag'])
+                    elif os.path.isfile(f'{part}.etag'):
+                        os.unlink(f'{part}.etag')
+                else:
+                    logging.error(f'Failed to download ddragon version {version}, status code {r.status_code}!')
+                    return False
+
+                length = r.headers.get('Content-Length')
+                total = downloaded + int(length) if length else None
+                with open(part, mode) as f:
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if total:
+                            report(downloaded / total * .9, f'Downloading ddragon version {version} ... '
+                                                            f'{downloaded >> 20}/{total >> 20} MB')
+            break
+        except requests.RequestException as e:
+            logging.warning(f'Download of ddragon version {version} interrupted (attempt {attempt + 1}): {e}')
     else:
         logging.error(f'Failed to download ddragon version {version}!')
         return False
+
+    report(.9, f'Verifying ddragon version {version} ...')
+    if not verify_archive(part, total):
+        logging.error(f'Downloaded ddragon version {version} is corrupted, removing it!')
+        for file in (part, f'{part}.etag'):
+            if os.path.isfile(file):
+                os.unlink(file)
+        return False
+
+    os.replace(part, path)
+    if os.path.isfile(f'{part}.etag'):
+        os.unlink(f'{part}.etag')
+    report(1, f'Ddragon version {version} downloaded.')
+    logging.info(f'Ddragon version {version} downloaded.')
+    return True
+
+
+def verify_archive(path: str, size: int | None) -> bool:
+    """
+    Checks the downloaded archive has expected size and that the whole gzip stream decompresses with valid checksum.
+    :param path: Path to the archive.
+    :param size: Expected size in bytes, None if unknown.
+    :return: True if the archive is valid.
+    """
+    if size is not None and os.path.getsize(path) != size:
+        logging.error(f'Archive {path} has {os.path.getsize(path)} bytes, expected {size}.')
+        return False
+
+    try:
+        with gzip.open(path, 'rb') as f:
+            while f.read(CHUNK_SIZE):
+                pass
+    except (OSError, EOFError) as e:
+        logging.error(f'Archive {path} is not valid: {e}')
+        return False
+
+    return True
+
+
+def update_incrementally(current_version: str,
+                         version: str,
+                         loading_object: utils.TrackingLoadingProgress = None,
+                         progress_range: tuple[float, float] = (0, 1)) -> bool:
+    """
+    Updates ddragon data to a new version by downloading only files that changed since the current version, unchanged
+    files are hard linked from the current version folder. Changes are found by comparing the data JSON files and sizes
+    of the files on the CDN.
+    :param current_version: Version of the data currently unpacked.
+    :param version: Version to update to.
+    :param loading_object: Object tracking the progress of update.
+    :param progress_range: Progress reported at the start and at the end of update.
+    :return: True if updated, False if the full tarball has to be used instead.
+    """
+    start, end = progress_range
+    old_folder = os.path.join('/ddragon', current_version or '')
+    if not current_version or not all(os.path.isfile(os.path.join(old_folder, 'data', 'en_US', file))
+                                      for file in DATA_FILES):
+        logging.info('No usable ddragon data to update incrementally.')
+        return False
+
+    try:
+        new_data = {}
+        for file in DATA_FILES:
+            r = requests.get(url=f'{CDN_URL}/{version}/data/en_US/{file}', timeout=30)
+            r.raise_for_status()
+            new_data[file] = r.json()
+        old_data = {}
+        for file in DATA_FILES:
+            with open(os.path.join(old_folder, 'data', 'en_US', file), encoding='utf-8') as f:
+                old_data[file] = json.load(f)
+    except (requests.RequestException, ValueError, OSError) as e:
+        logging.warning(f'Unable to compare ddragon data of {current_version} and {version}: {e}')
+        return False
+
+    try:
+        changed = changed_assets(current_version, version, old_data, new_data)
+    except requests.RequestException as e:
+        logging.warning(f'Unable to check ddragon files of {version} for changes: {e}')
+        return False
+    if len(changed) > MAX_INCREMENTAL_FILES:
+        logging.info(f'{len(changed)} files changed between {current_version} and {version}, using full download.')
+        return False
+    logging.info(f'Updating ddragon from {current_version} to {version} by downloading {len(changed)} files.')
+
+    staging = os.path.join('/ddragon', f'{version}.partial')
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        # Sprite sheets extracted by older versions of the updater are not used.
+        shutil.copytree(old_folder, staging, copy_function=_link_or_copy, ignore=shutil.ignore_patterns('sprite'))
+        for file, data in new_data.items():
+            path = os.path.join(staging, 'data', 'en_US', file)
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(f'{path}.tmp', path)
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='ddragon_fetch') as executor:
+            futures = [executor.submit(_fetch_file, url, os.path.join(staging, path.removeprefix(f'{version}/'))
+                                       if path.startswith(f'{version}/') else os.path.join('/ddragon', path))
+                       for url, path in changed]
+            for i, future in enumerate(as_completed(futures)):
+                future.result()
+                if loading_object:
+                    loading_object.update_progress(start + (end - start) * (i + 1) / len(futures),
+                                                   f'Updating to ddragon version {version} ... {i + 1}/{len(futures)}')
+    except (requests.RequestException, OSError) as e:
+        logging.warning(f'Incremental update to ddragon version {version} failed: {e}')
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+    shutil.rmtree(os.path.join('/ddragon', version), ignore_errors=True)
+    os.replace(staging, os.path.join('/ddragon', version))
+    shutil.rmtree(old_folder, ignore_errors=True)
+    logging.info(f'Ddragon data updated incrementally to version {version}.')
+    return True
+
+
+def changed_assets(current_version: str, version: str, old_data: dict, new_data: dict) -> list[tuple[str, str]]:
+    """
+    Finds images that are new or changed between two versions. Images of entries whose data changed are always fetched
+    again. Art can change without any change of the data though, so sizes of all other images on the CDN are compared
+    with the local files.
+    :param current_version: Version of the data currently unpacked.
+    :param version: The new version.
+    :param old_data: Data files of the current version, file name: parsed JSON.
+    :param new_data: Data files of the new version, file name: parsed JSON.
+    :return: List of URL and path relative to ddragon folder for every file to download.
+    """
+    changed = []
+    # (URL, path relative to ddragon folder), path of the local file to compare.
+    unchanged = []
+    for file, group in (('champion.json', 'champion'), ('item.json', 'item'), ('summoner.json', 'spell')):
+        old_entries = old_data[file]['data']
+        new_entries = new_data[file]['data']
+        for key, entry in new_entries.items():
+            name = entry['image']['full']
+            asset = (f'{CDN_URL}/{version}/img/{group}/{name}', f'{version}/img/{group}/{name}')
+            entry_changed = key not in old_entries or _entry_content(old_entries[key]) != _entry_content(entry)
+            if entry_changed:
+                changed.append(asset)
+            else:
+                unchanged.append((asset, os.path.join('/ddragon', current_version, 'img', group, name)))
+
+            if group == 'champion':
+                path = f'img/champion/loading/{entry["id"]}_0.jpg'
+                if entry_changed:
+                    changed.append((f'{CDN_URL}/{path}', path))
+                else:
+                    unchanged.append(((f'{CDN_URL}/{path}', path), os.path.join('/ddragon', path)))
+
+    for tree in new_data['runesReforged.json']:
+        for icon in [tree['icon']] + [rune['icon'] for slot in tree['slots'] for rune in slot['runes']]:
+            unchanged.append(((f'{CDN_URL}/img/{icon}', f'img/{icon}'), os.path.join('/ddragon', 'img', icon)))
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='ddragon_check') as executor:
+        for (asset, _), differs in zip(unchanged, executor.map(lambda item: _size_differs(item[0][0], item[1]),
+                                                               unchanged)):
+            if differs:
+                changed.append(asset)
+
+    return changed
+
+
+def _entry_content(entry: dict) -> dict:
+    """
+    Entry of a data file without its version, which is bumped for every champion on every patch.
+    :param entry: The entry.
+    :return: Entry without version.
+    """
+    return {key: value for key, value in entry.items() if key != 'version'}
+
+
+def _size_differs(url: str, path: str) -> bool:
+    """
+    Compares size of a file on the CDN with the local file.
+    :param url: URL of the file.
+    :param path: Path to the local file.
+    :return: True if the local file is missing or its size differs.
+    """
+    if not os.path.isfile(path):
+        return True
+    r = requests.head(url=url, timeout=30, allow_redirects=True)
+    r.raise_for_status()
+    length = r.headers.get('Content-Length')
+    return length is None or int(length) != os.path.getsize(path)
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    """
+    Hard links a file, copies it if linking isn't possible.
+    :param source: Existing file.
+    :param destination: New file.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _fetch_file(url: str, path: str) -> None:
+    """
+    Downloads a single file. Written through a temporary file so hard linked files of the old version stay untouched.
+    :param url: URL of the file.
+    :param path: Where to save the file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with requests.get(url=url, stream=True, timeout=30) as r:
+        r.raise_for_status()
+        with open(f'{path}.tmp', 'wb') as f:
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+    os.replace(f'{path}.tmp', path)
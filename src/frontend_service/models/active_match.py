@@ -1,6 +1,10 @@
 from utils import Observable
+from .participant_cache import ParticipantCache
+import analytics
 import common.data_models as data_models
+import common.timeline as timeline
 import logging
+import numpy as np
 import requests
 
 ROLES_MAPPING = {
@@ -30,7 +34,12 @@ class ActiveMatchModel(Observable):
         self._participants_positions = {}
         self.got_detail = False
         self.got_timeline = False
+        # Decoded timeline frames (minutes x participants x metrics) and puu ids in participant order.
+        self._timeline = None
+        self._timeline_puu_ids = []
         self._updated = []
+        # Kept across matches, so players met again don't have to be loaded from scratch.
+        self._cache = ParticipantCache()
 
     def check_is_life(self) -> None:
         """
@@ -38,15 +47,17 @@ class ActiveMatchModel(Observable):
         """
         r = requests.get(url='http://data_service:4701/match/active_match')
         if r.status_code == 200:
+            # Validating straight from the response bytes skips building intermediate Python dicts.
+            match = data_models.Match.model_validate_json(r.content)
             if self._match is None:
-                self._new_match(data_models.Match(**r.json()))
+                self._new_match(match)
             else:
-                if r.json()['match_id'] == self._match.match_id:
+                if match.match_id == self._match.match_id:
                     logging.info('Match still in progress.')
                     self._find_additional_data()
                 else:
                     logging.info('There is already a different match in progress.')
-                    self._new_match(data_models.Match(**r.json()))
+                    self._new_match(match)
         elif r.status_code == 204:
             if self._match:
                 logging.info('Match ended.')
@@ -64,6 +75,21 @@ class ActiveMatchModel(Observable):
         """
         return self._participants_positions[puu_id], self._participants[puu_id]
 
+    def get_participants(self, puu_ids: list[str]) -> list[data_models.Participant]:
+        """
+        Gets participants data, works also before their positions are known.
+        :param puu_ids: Puu ids of the participants.
+        :return: List of Participant objects.
+        """
+        return [self._participants[puu_id] for puu_id in puu_ids]
+
+    def get_timeline(self) -> tuple[np.ndarray | None, list[str]]:
+        """
+        Gets decoded timeline of the current match, see common.timeline for helpers working with it.
+        :return: Array of shape minutes x 10 x metrics (None if not loaded yet) and puu ids in participant order.
+        """
+        return self._timeline, self._timeline_puu_ids
+
     def get_all_participants(self) -> dict[str: data_models.Participant]:
         """
         Gets all participants and their positions.
@@ -90,6 +116,7 @@ class ActiveMatchModel(Observable):
         if r.status_code == 200:
             logging.info(f'Tag successfully added to {self._participants[puu_id].summoner.name}#'
                          f'{self._participants[puu_id].summoner.name}.')
+            self._cache.invalidate_summoner(puu_id)
             self._load_participant_detail(puu_id)
             self.trigger_event('participants_updated', participants_list=[puu_id])
         else:
@@ -102,11 +129,17 @@ class ActiveMatchModel(Observable):
         """
         if match.match_type == 'CLASSIC':
             logging.info(f'New match found: {match.match_id}!')
+            # Players of the previous match have a new match in their history now.
+            self._cache.invalidate_history(list(self._participants))
             self._match = match
             self._participants = {p.summoner.puu_id: p for p in match.participants}
             self._match_histories = {p.summoner.puu_id: None for p in match.participants}
             self.got_detail = False
             self.got_timeline = False
+            self._timeline = None
+            self._timeline_puu_ids = []
+            # Lets the view start preparing images while the rest of the data is being loaded.
+            self.trigger_event('participants_found', participants_list=list(self._participants))
 
             for participant in self._participants.values():
                 self._load_participant_detail(participant.summoner.puu_id)
@@ -116,6 +149,7 @@ class ActiveMatchModel(Observable):
 
             for participant in self._participants.values():
                 logging.debug(f'Final version of participant: {participant}')
+            logging.info(f'Participant cache: {self._cache.stats()}')
 
             self.trigger_event('new_match_found', match_id=self._match.match_id)
         else:
@@ -166,16 +200,24 @@ class ActiveMatchModel(Observable):
         participant = self._participants[participant_puu_id]
         participant.alerts = []
         participant.has_history = False
-        r = requests.get(url=f'http://data_service:4701/summoner/by-puuid/{participant.summoner.puu_id}')
-        if r.status_code == 200:
-            participant.summoner.profile_icon = r.json()['profile_icon']
-            participant.summoner.revision_date = r.json()['revision_date']
-            participant.summoner.tags = [data_models.AssignedTag(**tag) for tag in r.json()['tags']]
-            self._add_alerts_from_tags(participant_puu_id)
-            return True
-        else:
-            logging.error(f'Unexpected return code from data_service: {r.status_code}.')
-            return False
+        detail = self._cache.get_summoner(participant_puu_id)
+        if detail is None:
+            r = requests.get(url=f'http://data_service:4701/summoner/by-puuid/{participant.summoner.puu_id}')
+            if r.status_code != 200:
+                logging.error(f'Unexpected return code from data_service: {r.status_code}.')
+                return False
+            summoner = data_models.Summoner.model_validate_json(r.content)
+            self._cache.set_summoner(participant_puu_id,
+                                     profile_icon=summoner.profile_icon,
+                                     revision_date=summoner.revision_date,
+                                     tags=summoner.tags or [])
+            detail = self._cache.get_summoner(participant_puu_id)
+
+        participant.summoner.profile_icon = detail['profile_icon']
+        participant.summoner.revision_date = detail['revision_date']
+        participant.summoner.tags = list(detail['tags'])
+        self._add_alerts_from_tags(participant_puu_id)
+        return True
 
     def _load_match_detail(self) -> bool:
         """
@@ -185,11 +227,11 @@ class ActiveMatchModel(Observable):
         logging.debug('ActiveMatchModel._load_match_detail')
         r = requests.get(url=f'http://data_service:4701/match/match_detail/{self._match.match_id}')
         if r.status_code == 200:
-            self._match = data_models.Match(**r.json())
+            self._match = data_models.Match.model_validate_json(r.content)
             for participant in self._match.participants:
                 self._participants[participant.summoner.puu_id] = participant
                 self._load_participant_detail(participant.summoner.puu_id)
-                self._add_alerts_from_results_history(participant.summoner.puu_id)
+            self._add_alerts_from_results_history(list(self._participants))
             self._map_participants_positions()
 
             for participant in self._participants.values():
@@ -205,9 +247,10 @@ class ActiveMatchModel(Observable):
         :return: True if everything was successfully loaded, False otherwise.
         """
         logging.debug('ActiveMatchModel._get_match_timeline')
-        r = requests.get(url=f'http://data_service:4701/match/match_timeline/{self._match.match_id}')
+        r = requests.get(url=f'http://data_service:4701/match/match_timeline/{self._match.match_id}',
+                         headers={'Accept': 'application/octet-stream'})
         if r.status_code == 200:
-            self._match.match_detail.match_timeline = r.json()
+            self._timeline, self._timeline_puu_ids = timeline.from_bytes(r.content)
             return True
         else:
             logging.error(f'Unexpected return code from data_service: {r.status_code}.')
@@ -218,44 +261,65 @@ class ActiveMatchModel(Observable):
         Handles the entire process of getting history for every participant in the match and extracting all the usefull
         data out of it.
         """
+        loaded = []
         for puu_id, history in self._match_histories.items():
             if history is None:
                 logging.info(f'Finding match history for summoner with puu_id {puu_id}.')
 
-                r = requests.get(url=f'http://data_service:4701/summoner/match_history/{puu_id}')
-                if r.status_code == 200:
-                    history = []
+                match_history_ids = self._cache.get_history_ids(puu_id)
+                if match_history_ids is None:
+                    r = requests.get(url=f'http://data_service:4701/summoner/match_history/{puu_id}')
+                    if r.status_code != 200:
+                        logging.error(f'Unexpected return code from data_service when getting match history for '
+                                      f'summoner with puu_id {puu_id}: {r.status_code}.')
+                        continue
                     match_history_ids = r.json()
+                    self._cache.set_history_ids(puu_id, match_history_ids)
+
+                history = []
+                for match_id in match_history_ids:
+                    match_detail = self._cache.get_match(puu_id, match_id)
+                    if match_detail is None:
+                        match_detail = self._load_history_match(puu_id, match_id)
+                    if match_detail is not None:
+                        history.append(match_detail)
+
+                if len(history) == len(match_history_ids):
+                    logging.info(f'History for summoner with puu_id {puu_id} found.')
+                    logging.debug(history)
+                    self._match_histories[puu_id] = history
+                    loaded.append(puu_id)
+                else:
+                    logging.info(f'History for summoner with puu_id {puu_id} not found! Will be attempted later.')
 
-                    for match_id in match_history_ids:
-                        r = requests.get(url=f'http://data_service:4701/match/match_detail/{match_id.split("_")[1]}')
-                        if r.status_code == 200:
-                            match_detail = data_models.Match(**r.json())
-                            our_player = None
-                            for match_participant in match_detail.participants:
-                                if match_participant.summoner.puu_id == puu_id:
-                                    our_player = match_participant
-                                    break
-
-                            match_detail.participants = [our_player]
-
-                            history.append(match_detail)
-                        else:
-                            logging.error(f'Unexpected return code from data_service when getting match '
-                                          f'{match_id.split("_")[1]}: {r.status_code}.')
-
-                    if len(history) == len(match_history_ids):
-                        logging.info(f'History for summoner with puu_id {puu_id} found.')
-                        logging.debug(history)
-                        self._match_histories[puu_id] = history
-                        self._add_alerts_from_results_history(puu_id)
-                        self._updated.append(puu_id)
-                    else:
-                        logging.info(f'History for summoner with puu_id {puu_id} not found! Will be attempted later.')
+        if loaded:
+            self._add_alerts_from_results_history(loaded)
+            self._updated.extend(loaded)
 
-                else:
-                    logging.error(f'Unexpected return code from data_service when getting match history for summoner '
-                                  f'with puu_id {puu_id}: {r.status_code}.')
+    def _load_history_match(self, puu_id: str, match_id: str) -> data_models.Match | None:
+        """
+        Loads a match from history of a player, only the player is requested as a participant, and caches it.
+        :param puu_id: Puu id of the player.
+        :param match_id: Full match id.
+        :return: The match, None if it couldn't be loaded.
+        """
+        r = requests.get(url=f'http://data_service:4701/match/match_detail/{match_id.split("_")[1]}',
+                         params={'puu_id': puu_id, 'lean': 'true'})
+        if r.status_code != 200:
+            logging.error(f'Unexpected return code from data_service when getting match '
+                          f'{match_id.split("_")[1]}: {r.status_code}.')
+            return None
+
+        match_detail = data_models.Match.model_validate_json(r.content)
+        our_player = None
+        for match_participant in match_detail.participants:
+            if match_participant.summoner.puu_id == puu_id:
+                our_player = match_participant
+                break
+
+        match_detail.participants = [our_player]
+        self._cache.set_match(puu_id, match_id, match_detail)
+        return match_detail
 
     def _add_alerts_from_tags(self, participant_puu_id: str) -> bool:
         """
@@ -283,68 +347,25 @@ class ActiveMatchModel(Observable):
 
         return True
 
-    def _add_alerts_from_results_history(self, participant_puu_id: str) -> bool:
+    def _add_alerts_from_results_history(self, participant_puu_ids: list[str]) -> bool:
         """
-        Adds alerts to participant from matches history.
-        :param participant_puu_id: Puu id of the participant processed.
+        Adds alerts to participants from matches history, all histories are processed in one batch.
+        :param participant_puu_ids: Puu ids of the participants processed.
         :return:  True if everything was successfully loaded, False otherwise.
         """
         logging.debug('ActiveMatchModel._add_alerts_from_results_history')
-        alerts = []
-        history = self._match_histories[participant_puu_id]
-        participant = self._participants[participant_puu_id]
-
-        if history:
-            logging.debug(f'For summoner {participant.summoner.name} history has {len(history)} records.')
-            results = []
-            for h in history:
-                if h.match_detail.winning_team_red is not None:
-                    results.append(h.participants[0].team_red == h.match_detail.winning_team_red)
-
-            if len(results) == 0:
-                logging.debug(f'No valid result!')
-            else:
-                logging.debug(f'History results vector: {results}')
-                wins_count = results.count(True)
-
-                logging.debug(f'WR for summoner {participant.summoner.name} > {(wins_count / len(history)):%}')
-
-                if wins_count > (len(results) * .55):
-                    alerts.append(data_models.Alert(name='WR',
-                                                    detail=f'{(wins_count / len(results)):.0%} WR from last '
-                                                           f'{len(history)} ranked games',
-                                                    priority=1,
-                                                    color='green'))
-                if wins_count < (len(results) * .45):
-                    alerts.append(data_models.Alert(name='WR',
-                                                    detail=f'{(wins_count / len(results)):.0%} WR from last '
-                                                           f'{len(history)} ranked games',
-                                                    priority=1,
-                                                    color='red'))
-
-                logging.debug(f'Results: {results}')
-                streak_length = 1
-                streak_type = results[0]
-                for match in results[1:]:
-                    if match != streak_type:
-                        break
-                    else:
-                        streak_length += 1
+        histories = [self._match_histories.get(puu_id) for puu_id in participant_puu_ids]
+        arrays = analytics.histories_to_arrays(histories)
+        logging.debug(f'History results matrix: {arrays["results"].tolist()}')
 
-                if streak_length > 2:
-                    alerts.append(data_models.Alert(name='STR',
-                                                    detail=f'{streak_length} ranked games streak of '
-                                                           f'{"wins" if streak_type else "loses"}.',
-                                                    priority=2,
-                                                    color='green' if streak_type else 'red'))
-
-        else:
-            logging.debug(f'Summoner {participant.summoner.name} has no history.')
+        for puu_id, alerts in zip(participant_puu_ids, analytics.results_alerts(arrays['results'], arrays['lengths'])):
+            participant = self._participants[puu_id]
+            if not self._match_histories.get(puu_id):
+                logging.debug(f'Summoner {participant.summoner.name} has no history.')
+            participant.alerts.extend(alerts)
+            participant.has_history = True
 
-        participant.alerts.extend(alerts)
-        participant.has_history = True
-
-        return participant
+        return True
 
     def _map_participants_positions(self) -> None:
         """
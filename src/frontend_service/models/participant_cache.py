@@ -0,0 +1,146 @@
+import common.data_models as data_models
+from collections import OrderedDict
+from typing import Any
+import logging
+import time
+
+SUMMONER_TTL = 15 * 60
+HISTORY_TTL = 5 * 60
+MAX_PLAYERS = 500
+MAX_MATCHES = 5000
+
+
+class ParticipantCache:
+    """
+    Cache of participant data kept across matches, so duo partners and repeat opponents are not loaded from scratch in
+    every lobby. Summoner detail and match history ids expire after their TTL, history matches never change once played
+    and are only evicted when there are too many of them. Summoner detail and history ids of a player are dropped when
+    they finish a match with the user, summoner detail alone when a new match id shows up in their history.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inits ParticipantCache.
+        """
+        self._summoners = OrderedDict()
+        self._history_ids = OrderedDict()
+        self._matches = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_summoner(self, puu_id: str) -> dict[str, Any] | None:
+        """
+        Gets cached summoner detail.
+        :param puu_id: Puu id of the player.
+        :return: Dict with profile_icon, revision_date and tags, None if not cached or expired.
+        """
+        return self._get(self._summoners, puu_id, SUMMONER_TTL)
+
+    def set_summoner(self,
+                     puu_id: str,
+                     profile_icon: int,
+                     revision_date: Any,
+                     tags: list[data_models.AssignedTag]) -> None:
+        """
+        Caches summoner detail.
+        :param puu_id: Puu id of the player.
+        :param profile_icon: Profile icon id.
+        :param revision_date: Revision date of the summoner.
+        :param tags: Tags of the summoner.
+        """
+        self._set(self._summoners, puu_id,
+                  {'profile_icon': profile_icon, 'revision_date': revision_date, 'tags': list(tags)}, MAX_PLAYERS)
+
+    def invalidate_summoner(self, puu_id: str) -> None:
+        """
+        Drops cached summoner detail, used when their tags change.
+        :param puu_id: Puu id of the player.
+        """
+        self._summoners.pop(puu_id, None)
+
+    def get_history_ids(self, puu_id: str) -> list[str] | None:
+        """
+        Gets cached ids of matches in history of a player.
+        :param puu_id: Puu id of the player.
+        :return: List of full match ids, most recent first, None if not cached or expired.
+        """
+        return self._get(self._history_ids, puu_id, HISTORY_TTL)
+
+    def set_history_ids(self, puu_id: str, match_ids: list[str]) -> None:
+        """
+        Caches ids of matches in history of a player. If the history contains a match not known before, the player has
+        played since the last time and their summoner detail is dropped as well.
+        :param puu_id: Puu id of the player.
+        :param match_ids: List of full match ids, most recent first.
+        """
+        previous = self._history_ids.get(puu_id)
+        if previous is not None and set(match_ids) - set(previous[1]):
+            logging.debug(f'ParticipantCache found new matches in history of {puu_id}.')
+            self.invalidate_summoner(puu_id)
+        self._set(self._history_ids, puu_id, list(match_ids), MAX_PLAYERS)
+
+    def invalidate_history(self, puu_ids: list[str]) -> None:
+        """
+        Drops cached history ids and summoner detail of players, used when they just finished a match. Their summoner
+        detail is loaded before their history, so it can't wait for the new match id to show up there.
+        :param puu_ids: Puu ids of the players.
+        """
+        for puu_id in puu_ids:
+            self._history_ids.pop(puu_id, None)
+            self.invalidate_summoner(puu_id)
+
+    def get_match(self, puu_id: str, match_id: str) -> data_models.Match | None:
+        """
+        Gets a cached history match of a player.
+        :param puu_id: Puu id of the player.
+        :param match_id: Full match id.
+        :return: Match with the player as the only participant, None if not cached.
+        """
+        return self._get(self._matches, (puu_id, match_id), None)
+
+    def set_match(self, puu_id: str, match_id: str, match: data_models.Match) -> None:
+        """
+        Caches a history match of a player.
+        :param puu_id: Puu id of the player.
+        :param match_id: Full match id.
+        :param match: Match with the player as the only participant.
+        """
+        self._set(self._matches, (puu_id, match_id), match, MAX_MATCHES)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Gets cache statistics.
+        :return: Dict with hits, misses and number of cached players and matches.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'summoners': len(self._summoners),
+                'histories': len(self._history_ids), 'matches': len(self._matches)}
+
+    def _get(self, cache: OrderedDict, key: Any, ttl: float | None) -> Any:
+        """
+        Gets a value from one of the caches, dropping it if expired.
+        :param cache: The cache.
+        :param key: Key of the value.
+        :param ttl: Seconds the value stays valid, None if it never expires.
+        :return: The value, None if not cached or expired.
+        """
+        entry = cache.get(key)
+        if entry is None or (ttl is not None and time.monotonic() - entry[0] > ttl):
+            self.misses += 1
+            return None
+        cache.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    @staticmethod
+    def _set(cache: OrderedDict, key: Any, value: Any, max_size: int) -> None:
+        """
+        Stores a value in one of the caches, evicting the least recently used values over its size.
+        :param cache: The cache.
+        :param key: Key of the value.
+        :param value: The value.
+        :param max_size: Maximum number of values in the cache.
+        """
+        cache[key] = (time.monotonic(), value)
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
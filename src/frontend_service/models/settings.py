@@ -2,6 +2,7 @@ import common.data_models as data_models
 import utils
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 
@@ -24,19 +25,20 @@ class SettingsModel(utils.Observable):
         Loads the settings values at start.
         """
 
-        r = requests.get(url='http://data_service:4701/config/summoner')
+        # The settings are independent, so they are requested at once.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            r, r2, r3 = executor.map(lambda setting: requests.get(url=f'http://data_service:4701/config/{setting}'),
+                                     ('summoner', 'riot_api_key', 'ddragon_version'))
         if r and r.status_code == 200:
             self._settings['user'] = data_models.Summoner(name=r.json()['name'],
                                                           tagline=r.json()['tagline'],
                                                           server=r.json()['server'])
             logging.debug(f'SettingsModel User loaded: {self._settings["user"].name}#{self._settings["user"].tagline}')
 
-        r2 = requests.get(url='http://data_service:4701/config/riot_api_key')
         if r2 and r2.status_code == 200:
             self._settings['riot_api_key'] = r2.json()['riot_api_key']
             logging.debug(f'SettingsModel RIOT API key loaded: {self._settings["riot_api_key"]}')
 
-        r3 = requests.get(url='http://data_service:4701/config/ddragon_version')
         if r3 and r3.status_code == 200:
             self._settings['ddragon_version'] = r3.json()['ddragon_version']
             logging.debug(f'SettingsModel current ddragon version: {self._settings["ddragon_version"]}')
@@ -1,9 +1,19 @@
 import os
 import json
+import mmap
+import shutil
 import logging
+import time
+import threading
+import inspect
+import weakref
+from collections import OrderedDict
+from collections.abc import KeysView
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from abc import ABC, abstractmethod
 import customtkinter as ctk
+import tkinter as tk
 from typing import Callable, Any, Protocol
 from abc import abstractmethod
 
@@ -33,23 +43,44 @@ class Observable:
         Inits Observable.
         """
         self._event_listeners = {}
+        self._coalesce_widget = None
+        self._coalesced_events = ()
+        self._pending_events = {}
         super().__init__(*args, **kwargs)
 
     def add_event_listener(self, event: str, fn: Callable) -> Callable:
         """
-        Adds a function to be called when event is triggered.
+        Adds a function to be called when event is triggered. Bound methods are held by weak reference, so listening
+        doesn't keep destroyed objects alive.
         :param event: The event to be listened to.
         :param fn: Function to be called when event is triggered.
-        :return: Self.
+        :return: Function removing the listener, calling it more than once is harmless.
         """
+        listener = weakref.WeakMethod(fn) if inspect.ismethod(fn) else lambda: fn
         try:
-            self._event_listeners[event].append(fn)
+            self._event_listeners[event].append(listener)
         except KeyError:
-            self._event_listeners[event] = [fn]
+            self._event_listeners[event] = [listener]
 
         logging.debug(f'Subscribed to event {event} on {self.__class__.__name__} with function {fn}.')
 
-        return lambda: self._event_listeners[event].remove(fn)
+        def remove() -> None:
+            # Listener of a destroyed object may have been dropped by dispatch already, removing twice does nothing.
+            listeners = self._event_listeners.get(event, [])
+            if listener in listeners:
+                listeners.remove(listener)
+
+        return remove
+
+    def enable_coalescing(self, widget: tk.Misc, events: tuple[str, ...]) -> None:
+        """
+        Makes listed events dispatched once per tkinter tick. Events of the same type triggered before the dispatch are
+        merged into one, list arguments are joined and other arguments take the most recent value.
+        :param widget: Any widget, used to schedule the dispatch on the Tk loop.
+        :param events: Events to be coalesced.
+        """
+        self._coalesce_widget = widget
+        self._coalesced_events = tuple(events)
 
     def trigger_event(self, event: str, *args, **kwargs) -> None:
         """
@@ -60,7 +91,57 @@ class Observable:
         if event not in self._event_listeners.keys():
             return
 
-        for func in self._event_listeners[event]:
+        if event in self._coalesced_events:
+            self._queue_event(event, args, kwargs)
+        else:
+            self._dispatch(event, args, kwargs)
+
+    def _queue_event(self, event: str, args: tuple, kwargs: dict) -> None:
+        """
+        Merges an event into the pending one of the same type and schedules the dispatch.
+        :param event: Event triggered.
+        :param args: Positional arguments of the event.
+        :param kwargs: Keyword arguments of the event.
+        """
+        if not self._pending_events:
+            self._coalesce_widget.after_idle(self._dispatch_pending)
+
+        if event not in self._pending_events:
+            self._pending_events[event] = (args, {k: list(v) if isinstance(v, (list, tuple, KeysView)) else v
+                                                  for k, v in kwargs.items()})
+            return
+
+        pending_kwargs = self._pending_events[event][1]
+        for k, v in kwargs.items():
+            if isinstance(v, (list, tuple, KeysView)) and isinstance(pending_kwargs.get(k), list):
+                pending_kwargs[k].extend(item for item in v if item not in pending_kwargs[k])
+            else:
+                pending_kwargs[k] = v
+        self._pending_events[event] = (args, pending_kwargs)
+
+    def _dispatch_pending(self) -> None:
+        """
+        Dispatches all pending coalesced events in the order they were first triggered.
+        """
+        pending, self._pending_events = self._pending_events, {}
+        for event, (args, kwargs) in pending.items():
+            try:
+                self._dispatch(event, args, kwargs)
+            except Exception as e:
+                logging.error(f'{self.__class__.__name__} failed dispatching event {event}: {e}', exc_info=True)
+
+    def _dispatch(self, event: str, args: tuple, kwargs: dict) -> None:
+        """
+        Calls all live listeners of an event, dropping the ones whose objects no longer exist.
+        :param event: Event triggered.
+        :param args: Positional arguments of the event.
+        :param kwargs: Keyword arguments of the event.
+        """
+        for listener in list(self._event_listeners.get(event, [])):
+            func = listener()
+            if func is None:
+                self._event_listeners[event].remove(listener)
+                continue
             logging.debug(f'{self.__class__.__name__} triggers event {event} with function {func}')
             if kwargs:
                 func(self, *args, **kwargs)
@@ -84,11 +165,272 @@ def logged_func(func: Callable) -> Callable:
     return result
 
 
+class ProgressRange:
+    """
+    Maps progress between 0 and 1 onto a part of the progress of another loading object.
+    """
+
+    def __init__(self, loading_object: TrackingLoadingProgress, start: float = 0, end: float = 1):
+        """
+        Inits ProgressRange.
+        :param loading_object: The object tracking the whole progress.
+        :param start: Progress of the whole shown at 0.
+        :param end: Progress of the whole shown at 1.
+        """
+        self.loading_object = loading_object
+        self.start = start
+        self.end = end
+
+    def update_progress(self, progress: float, label: str) -> None:
+        """
+        Updates the progress of the whole.
+        :param progress: Float between 0 and 1 showing the progress of this part.
+        :param label: Text to be displayed as a progress message.
+        """
+        self.loading_object.update_progress(self.start + (self.end - self.start) * progress, label)
+
+
+class StartupPipeline:
+    """
+    Runs startup stages as soon as the stages they depend on are finished, independent stages run concurrently in
+    worker threads. Stages touching tkinter are run on the main thread. Progress of all stages is merged and shown on
+    the loading object from the main thread, so stages can report progress from any thread.
+    """
+
+    poll_interval = 50
+
+    def __init__(self, widget: tk.Misc, loading_object: TrackingLoadingProgress, max_workers: int = 4):
+        """
+        Inits StartupPipeline.
+        :param widget: Widget used to schedule work on the tkinter main thread.
+        :param loading_object: The object showing the overall progress.
+        :param max_workers: Number of worker threads.
+        """
+        self.widget = widget
+        self.loading_object = loading_object
+        self.max_workers = max_workers
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._label = ''
+        self._shown = None
+        self._executor = None
+        self._futures = {}
+        self._on_done = None
+        self._started = None
+
+    def add_stage(self,
+                  name: str,
+                  fn: Callable,
+                  requires: tuple[str, ...] = (),
+                  main_thread: bool = False,
+                  weight: float = 1) -> None:
+        """
+        Adds a stage to the pipeline. Stage function is called with an object tracking the progress of the stage and
+        results of the stages it requires, in the order they are listed.
+        :param name: Name of the stage.
+        :param fn: Function of the stage.
+        :param requires: Names of the stages that have to finish before this one starts.
+        :param main_thread: True if the stage has to run on tkinter main thread.
+        :param weight: Share of the stage on the overall progress.
+        """
+        missing = [stage for stage in requires if stage not in self._stages]
+        if missing:
+            raise ValueError(f'Stage {name} requires unknown stages {missing}.')
+        self._stages[name] = {'fn': fn, 'requires': tuple(requires), 'main_thread': main_thread, 'weight': weight,
+                              'status': 'pending', 'result': None, 'error': None,
+                              'ready': None, 'start': None, 'end': None, 'thread': None}
+        self._progress[name] = 0
+
+    def run(self, on_done: Callable[[dict[str, Any]], None]) -> None:
+        """
+        Starts the pipeline without blocking the main thread.
+        :param on_done: Called on the main thread with results of all stages once every stage is finished or skipped.
+            Results of failed and skipped stages are None.
+        """
+        self._on_done = on_done
+        self._started = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='startup')
+        self._poll()
+
+    def report(self) -> dict[str, Any]:
+        """
+        Timings of all stages, times are in seconds from the start of the pipeline.
+        :return: Dict with total duration, sum of durations of all stages and the per stage timings.
+        """
+        stages = {}
+        for name, stage in self._stages.items():
+            stages[name] = {
+                'status': stage['status'],
+                'requires': list(stage['requires']),
+                'thread': stage['thread'],
+                'ready': self._relative(stage['ready']),
+                'start': self._relative(stage['start']),
+                'end': self._relative(stage['end']),
+                'duration': round(stage['end'] - stage['start'], 4) if stage['start'] and stage['end'] else None,
+                'error': stage['error']
+            }
+        ends = [stage['end'] for stage in self._stages.values() if stage['end']]
+        return {
+            'total': self._relative(max(ends)) if ends else 0,
+            'sequential': round(sum(stage['duration'] or 0 for stage in stages.values()), 4),
+            'stages': stages
+        }
+
+    def write_report(self, path: str) -> None:
+        """
+        Writes the report of stage timings into JSON file and logs it.
+        :param path: Path of the file.
+        """
+        report = self.report()
+        logging.info(f'Startup took {report["total"]} s, stages would take {report["sequential"]} s one after '
+                     f'another: ' + ', '.join(f'{name} {stage["duration"]} s ({stage["status"]})'
+                                              for name, stage in report['stages'].items()))
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            logging.warning(f'Unable to write startup report to {path}: {e}')
+
+    def _relative(self, moment: float | None) -> float | None:
+        """
+        Converts a moment to seconds from the start of the pipeline.
+        :param moment: The moment from time.perf_counter.
+        :return: Seconds from the start rounded to tenths of millisecond, None if moment is None.
+        """
+        return round(moment - self._started, 4) if moment is not None else None
+
+    def _stage_progress(self, name: str) -> TrackingLoadingProgress:
+        """
+        Creates an object tracking progress of a stage, safe to be called from any thread.
+        :param name: Name of the stage.
+        :return: The object tracking progress.
+        """
+        pipeline = self
+
+        class StageProgress:
+            def update_progress(self, progress: float, label: str) -> None:
+                with pipeline._lock:
+                    pipeline._progress[name] = min(max(progress, 0), 1)
+                    pipeline._label = label
+
+        return StageProgress()
+
+    def _run_stage(self, name: str) -> Any:
+        """
+        Runs a stage, recording its timings.
+        :param name: Name of the stage.
+        :return: Result of the stage function.
+        """
+        stage = self._stages[name]
+        stage['thread'] = threading.current_thread().name
+        stage['start'] = time.perf_counter()
+        try:
+            arguments = [self._stages[required]['result'] for required in stage['requires']]
+            return stage['fn'](self._stage_progress(name), *arguments)
+        finally:
+            stage['end'] = time.perf_counter()
+
+    def _finish(self, name: str, result: Any = None, error: BaseException | None = None) -> None:
+        """
+        Marks a stage as finished.
+        :param name: Name of the stage.
+        :param result: Result of the stage.
+        :param error: Exception raised by the stage, if any.
+        """
+        stage = self._stages[name]
+        if error is None:
+            stage['status'] = 'done'
+            stage['result'] = result
+        else:
+            stage['status'] = 'failed'
+            stage['error'] = repr(error)
+            logging.error(f'Startup stage {name} failed: {error}', exc_info=error)
+        with self._lock:
+            self._progress[name] = 1
+
+    def _poll(self) -> None:
+        """
+        Collects finished stages, starts the ones that are ready and shows progress. Reschedules itself until all stages
+        are finished.
+        """
+        try:
+            for name, future in list(self._futures.items()):
+                if future.done():
+                    del self._futures[name]
+                    if future.exception():
+                        self._finish(name, error=future.exception())
+                    else:
+                        self._finish(name, future.result())
+
+            main_thread_stages = []
+            for name, stage in self._stages.items():
+                if stage['status'] != 'pending':
+                    continue
+                statuses = [self._stages[required]['status'] for required in stage['requires']]
+                if any(status in ('failed', 'skipped') for status in statuses):
+                    stage['status'] = 'skipped'
+                    with self._lock:
+                        self._progress[name] = 1
+                    logging.warning(f'Startup stage {name} skipped, a stage it requires did not finish.')
+                elif all(status == 'done' for status in statuses):
+                    stage['ready'] = time.perf_counter()
+                    stage['status'] = 'running'
+                    if stage['main_thread']:
+                        main_thread_stages.append(name)
+                    else:
+                        self._futures[name] = self._executor.submit(self._run_stage, name)
+
+            for name in main_thread_stages:
+                try:
+                    self._finish(name, self._run_stage(name))
+                except Exception as e:
+                    self._finish(name, error=e)
+
+            self._show_progress()
+        except Exception as e:
+            logging.error(f'Startup pipeline encountered an error: {e}', exc_info=True)
+
+        if any(stage['status'] in ('pending', 'running') for stage in self._stages.values()):
+            self.widget.after(self.poll_interval, self._poll)
+        else:
+            self._executor.shutdown(wait=False)
+            self._on_done({name: stage['result'] for name, stage in self._stages.items()})
+
+    def _show_progress(self) -> None:
+        """
+        Shows the weighted progress of all stages on the loading object, if it changed.
+        """
+        with self._lock:
+            total = sum(stage['weight'] for stage in self._stages.values()) or 1
+            progress = sum(self._progress[name] * stage['weight'] for name, stage in self._stages.items()) / total
+            shown = (round(progress, 3), self._label)
+        if shown != self._shown:
+            self._shown = shown
+            self.loading_object.update_progress(*shown)
+
+
 class LazyReader(ABC):
     """
-    Abstract singleton lazy reader for often reused images to load these only once.
+    Abstract singleton lazy reader for often reused images to load these only once. Images can be decoded and resized
+    ahead of time in worker threads, the UI thread then only wraps the ready bitmaps into CTkImage.
     """
     _instance = None
+    # Kinds of images and the size they are displayed at.
+    sizes = {'ctkimage': (64, 64)}
+    # Kinds of images that are never evicted from memory, other kinds are kept in LRU limited by the values below.
+    pinned_kinds = ('ctkimage',)
+    max_images = None
+    max_bytes = None
+    # Kinds of images small enough to have all of them decoded while the UI is idle.
+    warm_kinds = ('ctkimage',)
+    # Images with more pixels than this are cached as WebP files, smaller ones as raw RGBA packed into one file per kind.
+    raw_cache_limit = 128 * 128
+    # Raised whenever the way cached images are produced changes, so caches written before are rebuilt.
+    cache_revision = 3
+    _preload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='lazyreader_preload')
+    _warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='lazyreader_warm')
 
     def __new__(cls, version: str | None):
         """
@@ -109,7 +451,20 @@ class LazyReader(ABC):
             return
 
         self.images = {}
+        # (id, kind): Future of a bitmap being decoded in a worker thread. Only touched from the UI thread.
+        self._pending = {}
+        # (id, kind): (CTkImage, approximate bytes held). Evictable images are ordered from least recently used.
+        self._pinned = {}
+        self._lru = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+        self._lru_bytes = 0
         self.version = version
+        # kind: (dict of id: slot, mapped pack file) of packed kinds, opened on first use.
+        self._packs = {}
+        self._packs_lock = threading.Lock()
         self.load_list()
         self.__initialized = True
 
@@ -120,10 +475,29 @@ class LazyReader(ABC):
         """
         cls._instance = None
 
-    @abstractmethod
     def load_list(self):
         """
-        Abstract method loading the list of images from data file.
+        Loads the list of images from the prebuilt index of the data version.
+        """
+        self.images = load_index(self.version)[self.__class__.__name__]
+
+    @staticmethod
+    @abstractmethod
+    def read_data(version: str) -> dict[str, dict]:
+        """
+        Abstract method reading the list of images from data file, used to build the index.
+        :param version: Version of the data.
+        :return: Dictionary of id: entry with file name and display name.
+        """
+        pass
+
+    @abstractmethod
+    def image_path(self, id: str, kind: str) -> str:
+        """
+        Abstract method returning path to the image file.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Path to the file.
         """
         pass
 
@@ -136,6 +510,321 @@ class LazyReader(ABC):
         """
         pass
 
+    def get_display_name(self, id: str) -> str:
+        """
+        Gets the in game name of the object the image belongs to.
+        :param id: Id of the image.
+        :return: Display name.
+        """
+        return self.images[id].get('display_name', '')
+
+    def preload(self, ids: list[str], kind: str = 'ctkimage') -> None:
+        """
+        Starts decoding images in worker threads so they are ready once they are shown.
+        :param ids: Ids of the images.
+        :param kind: Kind of the images.
+        """
+        for id in ids:
+            # Images waiting in the slow warming queue are moved to the preload workers.
+            future = self._pending.get((id, kind))
+            if future and future.cancel():
+                del self._pending[(id, kind)]
+            self._submit(id, kind, self._preload_executor)
+
+        logging.debug(f'{self.__class__.__name__} image cache stats: {self.stats()}')
+
+    def warm(self, widget: tk.Misc, budget: float = .01) -> None:
+        """
+        Decodes all small images in a background thread and wraps them into CTkImage while Tk is idle.
+        :param widget: Any widget, used to schedule work on the Tk loop.
+        :param budget: Maximum number of seconds spent wrapping images in one idle callback.
+        """
+        for id in self.images:
+            for kind in self.warm_kinds:
+                self._submit(id, kind, self._warm_executor)
+
+        widget.after_idle(self._warm_step, widget, budget)
+
+    def _warm_step(self, widget: tk.Misc, budget: float) -> None:
+        """
+        Wraps decoded small images until the time budget runs out, reschedules itself until all are done.
+        :param widget: Any widget, used to schedule work on the Tk loop.
+        :param budget: Maximum number of seconds spent wrapping images in one idle callback.
+        """
+        if self is not type(self)._instance:
+            return
+
+        deadline = time.perf_counter() + budget
+        for (id, kind), future in list(self._pending.items()):
+            if time.perf_counter() > deadline:
+                break
+            if kind not in self.warm_kinds or not future.done():
+                continue
+            if future.cancelled() or future.exception():
+                logging.warning(f'{self.__class__.__name__} failed to decode image {id}: {future.exception()}')
+                del self._pending[(id, kind)]
+                continue
+            self._get(id, kind)
+
+        if any(kind in self.warm_kinds for _, kind in self._pending):
+            widget.after(50, lambda: widget.after_idle(self._warm_step, widget, budget))
+        else:
+            logging.info(f'{self.__class__.__name__} finished warming images.')
+
+    def _submit(self, id: str, kind: str, executor: ThreadPoolExecutor) -> None:
+        """
+        Submits decoding of an image unless it's already loaded or being loaded.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :param executor: Executor decoding the image.
+        """
+        key = (id, kind)
+        if id in self.images and key not in self._pinned and key not in self._lru and key not in self._pending:
+            self._pending[(id, kind)] = executor.submit(self._decode, id, kind)
+
+    def cache_path(self, id: str, kind: str) -> str:
+        """
+        Path to the pre-resized image in the disk cache, the cache is kept per data version and image size.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Path to the file.
+        """
+        width, height = self.sizes[kind]
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', 'cache', self._cache_folder_name(), f'{width}x{height}',
+                            self.__class__.__name__, f'{id}.webp')
+
+    def pack_path(self, kind: str) -> str:
+        """
+        Path to the file all small pre-resized images of a kind are packed into, the index of the pack is next to it.
+        :param kind: Kind of the images.
+        :return: Path to the file.
+        """
+        width, height = self.sizes[kind]
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', 'cache', self._cache_folder_name(), f'{width}x{height}',
+                            f'{self.__class__.__name__}.rgba')
+
+    def _is_packed(self, kind: str) -> bool:
+        """
+        Checks whether images of a kind are small enough to be packed as raw RGBA.
+        :param kind: Kind of the images.
+        :return: True if packed.
+        """
+        width, height = self.sizes[kind]
+        return width * height <= self.raw_cache_limit
+
+    def _cache_folder_name(self) -> str:
+        """
+        Name of the disk cache folder of this data version and cache revision.
+        :return: Name of the folder.
+        """
+        return f'{self.version}-r{self.cache_revision}'
+
+    def build_cache(self, progress: Callable[[float], None] = None) -> int:
+        """
+        Writes all images resized to their displayed size to the disk cache. Caches of other versions and revisions are
+        removed.
+        :param progress: Function called with the fraction of images already processed.
+        :return: Number of newly cached images.
+        """
+        cache_folder = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'ddragon', 'cache')
+        if os.path.isdir(cache_folder):
+            with os.scandir(cache_folder) as entries:
+                for entry in entries:
+                    if entry.is_dir() and entry.name != self._cache_folder_name():
+                        shutil.rmtree(entry.path, ignore_errors=True)
+
+        # Packs are written whole, so a pack missing any image is built again.
+        packed = [kind for kind in self.sizes if self._is_packed(kind) and not self._pack_complete(kind)]
+        missing = [(id, kind) for kind in packed for id in self.images]
+        missing += [(id, kind) for id in self.images for kind in self.sizes
+                    if not self._is_packed(kind) and not os.path.isfile(self.cache_path(id, kind))]
+        bitmaps = {kind: {} for kind in packed}
+        built = 0
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix='lazyreader_cache') as executor:
+            for i, ((id, kind), result) in enumerate(zip(missing, executor.map(lambda key: self._write_cache(*key),
+                                                                               missing))):
+                if isinstance(result, bytes):
+                    bitmaps[kind][id] = result
+                built += bool(result)
+                if progress:
+                    progress((i + 1) / len(missing))
+
+        for kind, kind_bitmaps in bitmaps.items():
+            self._write_pack(kind, kind_bitmaps)
+        logging.info(f'{self.__class__.__name__} cached {built} of {len(missing)} missing images.')
+        return built
+
+    def _write_cache(self, id: str, kind: str) -> bool | bytes:
+        """
+        Writes one pre-resized image to the disk cache, images of packed kinds are returned to be packed instead.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Raw RGBA bytes for packed kinds, otherwise True if written. False if the source image couldn't be read.
+        """
+        try:
+            image = self._decode_source(id, kind)
+        except OSError as e:
+            logging.warning(f'{self.__class__.__name__} failed to cache image {id}: {e}')
+            return False
+
+        if self._is_packed(kind):
+            return image.convert('RGBA').tobytes()
+
+        path = self.cache_path(id, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image.save(f'{path}.tmp', format='WEBP', quality=90, method=4)
+        os.replace(f'{path}.tmp', path)
+        return True
+
+    def _write_pack(self, kind: str, bitmaps: dict[str, bytes]) -> None:
+        """
+        Writes raw RGBA images of a kind one after another into the pack file, with index of their positions.
+        :param kind: Kind of the images.
+        :param bitmaps: Dictionary of id: raw RGBA bytes.
+        """
+        path = self.pack_path(kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        ids = sorted(bitmaps)
+        with open(f'{path}.tmp', 'wb') as f:
+            for id in ids:
+                f.write(bitmaps[id])
+        with open(f'{path}.json.tmp', 'w', encoding='utf-8') as f:
+            json.dump(ids, f)
+        os.replace(f'{path}.tmp', path)
+        # Index is replaced last, a pack without up to date index is treated as incomplete.
+        os.replace(f'{path}.json.tmp', f'{path}.json')
+        with self._packs_lock:
+            self._packs.pop(kind, None)
+
+    def _pack_complete(self, kind: str) -> bool:
+        """
+        Checks whether the pack of a kind holds every image.
+        :param kind: Kind of the images.
+        :return: True if nothing is missing.
+        """
+        try:
+            with open(f'{self.pack_path(kind)}.json', encoding='utf-8') as f:
+                return set(json.load(f)) >= set(self.images)
+        except (OSError, ValueError):
+            return False
+
+    def _read_packed(self, id: str, kind: str) -> Image.Image | None:
+        """
+        Reads an image from the pack of its kind. The pack is mapped into memory on first use, so all images of the kind
+        are served from a single open file. Safe to run outside the UI thread.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Decoded image, None if it isn't packed.
+        """
+        with self._packs_lock:
+            if kind not in self._packs:
+                try:
+                    with open(f'{self.pack_path(kind)}.json', encoding='utf-8') as f:
+                        slots = {id: slot for slot, id in enumerate(json.load(f))}
+                    with open(self.pack_path(kind), 'rb') as f:
+                        self._packs[kind] = (slots, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                except (OSError, ValueError):
+                    self._packs[kind] = ({}, None)
+            slots, data = self._packs[kind]
+
+        if id not in slots:
+            return None
+        size = self.sizes[kind][0] * self.sizes[kind][1] * 4
+        return Image.frombytes('RGBA', self.sizes[kind], data[slots[id] * size:(slots[id] + 1) * size])
+
+    def _decode(self, id: str, kind: str) -> Image.Image:
+        """
+        Reads the image in its displayed size, from the disk cache if possible. Safe to run outside the UI thread.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Decoded image.
+        """
+        try:
+            if self._is_packed(kind):
+                image = self._read_packed(id, kind)
+                if image is not None:
+                    return image
+                return self._decode_source(id, kind)
+            image = Image.open(self.cache_path(id, kind))
+            image.load()
+            return image
+        except (OSError, ValueError):
+            return self._decode_source(id, kind)
+
+    def _decode_source(self, id: str, kind: str) -> Image.Image:
+        """
+        Reads the original image and resizes it to displayed size. Safe to run outside the UI thread.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Decoded image.
+        """
+        image = Image.open(self.image_path(id, kind))
+        if image.mode == 'P':
+            image = image.convert('RGBA')
+        if image.size != self.sizes[kind]:
+            image = image.resize(self.sizes[kind], Image.LANCZOS)
+        image.load()
+        return image
+
+    def _get(self, id: str, kind: str) -> ctk.CTkImage:
+        """
+        Loading the image if it wasn't loaded already, otherwise returning it. Uses the preloaded bitmap if there is one.
+        :param id: Id of the image.
+        :param kind: Kind of the image.
+        :return: Image.
+        """
+        key = (id, kind)
+        if key in self._pinned:
+            self.hits += 1
+            return self._pinned[key][0]
+        if key in self._lru:
+            self.hits += 1
+            self._lru.move_to_end(key)
+            return self._lru[key][0]
+
+        self.misses += 1
+        future = self._pending.pop(key, None)
+        bitmap = future.result() if future and not future.cancelled() else self._decode(id, kind)
+        image = ctk.CTkImage(bitmap, size=self.sizes[kind])
+        # Decoded bitmap plus the Tk photo image created once it is displayed.
+        size = bitmap.width * bitmap.height * (len(bitmap.getbands()) + 4)
+        self.bytes_held += size
+
+        if kind in self.pinned_kinds:
+            self._pinned[key] = (image, size)
+        else:
+            self._lru[key] = (image, size)
+            self._lru_bytes += size
+            self._evict()
+        return image
+
+    def _evict(self) -> None:
+        """
+        Drops least recently used evictable images until the limits are met.
+        """
+        while self._lru and ((self.max_images is not None and len(self._lru) > self.max_images) or
+                             (self.max_bytes is not None and self._lru_bytes > self.max_bytes)):
+            key, (_, size) = self._lru.popitem(last=False)
+            self._lru_bytes -= size
+            self.bytes_held -= size
+            self.evictions += 1
+            logging.debug(f'{self.__class__.__name__} evicted image {key}.')
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Counters of the in memory image cache.
+        :return: Dictionary with hits, misses, hit rate, evictions, number of images and approximate bytes held.
+        """
+        requests = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.,
+                'evictions': self.evictions,
+                'images': len(self._pinned) + len(self._lru),
+                'bytes': self.bytes_held}
+
 
 class LazySummoners(LazyReader):
     """
@@ -149,16 +838,31 @@ class LazySummoners(LazyReader):
         """
         super().__init__(version)
 
-    def load_list(self):
+    @staticmethod
+    def read_data(version: str) -> dict[str, dict]:
         """
-        Load list of summoner spells.
+        Read list of summoner spells.
+        :param version: Version of the data.
+        :return: Dictionary of id: entry.
         """
+        images = {}
         with open(os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                               'ddragon', self.version, 'data', 'en_US', 'summoner.json')) as f:
+                               'ddragon', version, 'data', 'en_US', 'summoner.json'), encoding='utf-8') as f:
             data = json.load(f)
             for spell in data['data'].items():
-                self.images[spell[1]['key']] = {'name': spell[1]['image']['full'],
-                                                'ctkimage': None}
+                images[spell[1]['key']] = {'name': spell[1]['image']['full'],
+                                           'display_name': spell[1]['name']}
+        return images
+
+    def image_path(self, id: str, kind: str) -> str:
+        """
+        Path to the summoner spell image.
+        :param id: Id of the summoner spell.
+        :param kind: Kind of the image.
+        :return: Path to the file.
+        """
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', self.version, 'img', 'spell', self.images[id]["name"])
 
     def get_image(self, id: str) -> ctk.CTkImage:
         """
@@ -166,20 +870,14 @@ class LazySummoners(LazyReader):
         :param id: Id of the summoner spell.
         :return: Image.
         """
-        if self.images[id]['ctkimage']:
-            pass
-        else:
-            self.images[id]['ctkimage'] = ctk.CTkImage(Image.open(
-                os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                             'ddragon', self.version, 'img', 'spell', self.images[id]["name"])),
-                size=(64, 64))
-        return self.images[id]['ctkimage']
+        return self._get(id, 'ctkimage')
 
 
 class LazyRunes(LazyReader):
     """
     Lazy reads runes images.
     """
+    sizes = {'ctkimage': (32, 32)}
 
     def __init__(self, version: str | None):
         """
@@ -188,20 +886,35 @@ class LazyRunes(LazyReader):
         """
         super().__init__(version)
 
-    def load_list(self):
+    @staticmethod
+    def read_data(version: str) -> dict[str, dict]:
         """
-        Load list of runes.
+        Read list of runes.
+        :param version: Version of the data.
+        :return: Dictionary of id: entry.
         """
+        images = {}
         with open(os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                               'ddragon', self.version, 'data', 'en_US', 'runesReforged.json')) as f:
+                               'ddragon', version, 'data', 'en_US', 'runesReforged.json'), encoding='utf-8') as f:
             data = json.load(f)
             for tree in data:
-                self.images[str(tree['id'])] = {'name': tree['icon'],
-                                                'ctkimage': None}
+                images[str(tree['id'])] = {'name': tree['icon'],
+                                           'display_name': tree['name']}
                 for slot in tree['slots']:
                     for rune in slot['runes']:
-                        self.images[str(rune['id'])] = {'name': rune['icon'],
-                                                        'ctkimage': None}
+                        images[str(rune['id'])] = {'name': rune['icon'],
+                                                   'display_name': rune['name']}
+        return images
+
+    def image_path(self, id: str, kind: str) -> str:
+        """
+        Path to the rune image.
+        :param id: Id of the rune.
+        :param kind: Kind of the image.
+        :return: Path to the file.
+        """
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', 'img', self.images[id]["name"])
 
     def get_image(self, id: str) -> ctk.CTkImage:
         """
@@ -209,20 +922,19 @@ class LazyRunes(LazyReader):
         :param id: Id of the rune.
         :return: Image.
         """
-        if self.images[id]['ctkimage']:
-            pass
-        else:
-            self.images[id]['ctkimage'] = ctk.CTkImage(Image.open(
-                os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                             'ddragon', 'img', self.images[id]["name"])),
-                size=(32, 32))
-        return self.images[id]['ctkimage']
+        return self._get(id, 'ctkimage')
 
 
 class LazyChampions(LazyReader):
     """
     Lazy reads champions images.
     """
+    sizes = {'ctkimage': (308, 560), 'iconimage': (120, 120)}
+    warm_kinds = ('iconimage',)
+    # Loading screen images are big, only the ones of the last two matches are kept.
+    pinned_kinds = ('iconimage',)
+    max_images = 20
+    max_bytes = 20 * 308 * 560 * 7
 
     def __init__(self, version: str | None):
         """
@@ -231,17 +943,34 @@ class LazyChampions(LazyReader):
         """
         super().__init__(version)
 
-    def load_list(self):
+    @staticmethod
+    def read_data(version: str) -> dict[str, dict]:
         """
-        Load list of champions.
+        Read list of champions.
+        :param version: Version of the data.
+        :return: Dictionary of id: entry.
         """
+        images = {}
         with open(os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                               'ddragon', self.version, 'data', 'en_US', 'champion.json')) as f:
+                               'ddragon', version, 'data', 'en_US', 'champion.json'), encoding='utf-8') as f:
             data = json.load(f)
             for champ in data['data'].items():
-                self.images[champ[1]['key']] = {'name': champ[1]['id'],
-                                                'ctkimage': None,
-                                                'iconimage': None}
+                images[champ[1]['key']] = {'name': champ[1]['id'],
+                                           'display_name': champ[1]['name']}
+        return images
+
+    def image_path(self, id: str, kind: str) -> str:
+        """
+        Path to the champion loading screen image or icon.
+        :param id: Id of the champion.
+        :param kind: Kind of the image, ctkimage for loading screen image, iconimage for icon.
+        :return: Path to the file.
+        """
+        if kind == 'iconimage':
+            return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'ddragon', self.version, 'img', 'champion', f'{self.images[id]["name"]}.png')
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', 'img', 'champion', 'loading', f'{self.images[id]["name"]}_0.jpg')
 
     def get_image(self, id: str) -> ctk.CTkImage:
         """
@@ -249,14 +978,7 @@ class LazyChampions(LazyReader):
         :param id: Id of the champion.
         :return: Image.
         """
-        if self.images[id]['ctkimage']:
-            pass
-        else:
-            self.images[id]['ctkimage'] = ctk.CTkImage(Image.open(
-                os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                             'ddragon', 'img', 'champion', 'loading', f'{self.images[id]["name"]}_0.jpg')),
-                size=(308, 560))
-        return self.images[id]['ctkimage']
+        return self._get(id, 'ctkimage')
 
     def get_icon_image(self, id: str) -> ctk.CTkImage:
         """
@@ -264,14 +986,7 @@ class LazyChampions(LazyReader):
         :param id: Id of the champion.
         :return: Image of the icon.
         """
-        if self.images[id]['iconimage']:
-            pass
-        else:
-            self.images[id]['iconimage'] = ctk.CTkImage(Image.open(
-                os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                             'ddragon', self.version, 'img', 'champion', f'{self.images[id]["name"]}.png')),
-                size=(120, 120))
-        return self.images[id]['iconimage']
+        return self._get(id, 'iconimage')
 
 
 class LazyItems(LazyReader):
@@ -286,16 +1001,31 @@ class LazyItems(LazyReader):
         """
         super().__init__(version)
 
-    def load_list(self):
+    @staticmethod
+    def read_data(version: str) -> dict[str, dict]:
         """
-        Load list of items.
+        Read list of items.
+        :param version: Version of the data.
+        :return: Dictionary of id: entry.
         """
+        images = {}
         with open(os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                               'ddragon', self.version, 'data', 'en_US', 'item.json')) as f:
+                               'ddragon', version, 'data', 'en_US', 'item.json'), encoding='utf-8') as f:
             data = json.load(f)
-            for item in data['data'].keys():
-                self.images[item] = {'name': item,
-                                     'ctkimage': None}
+            for item in data['data'].items():
+                images[item[0]] = {'name': item[0],
+                                   'display_name': item[1]['name']}
+        return images
+
+    def image_path(self, id: str, kind: str) -> str:
+        """
+        Path to the item image.
+        :param id: Id of the item.
+        :param kind: Kind of the image.
+        :return: Path to the file.
+        """
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                            'ddragon', self.version, 'img', 'item', f'{self.images[id]["name"]}.png')
 
     def get_image(self, id: str) -> ctk.CTkImage:
         """
@@ -304,11 +1034,48 @@ class LazyItems(LazyReader):
         :return: Image.
         """
         id = '7050' if id == '0' else id
-        if self.images[id]['ctkimage']:
-            pass
-        else:
-            self.images[id]['ctkimage'] = ctk.CTkImage(Image.open(
-                os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                             'ddragon', self.version, 'img', 'item', f'{self.images[id]["name"]}.png')),
-                size=(64, 64))
-        return self.images[id]['ctkimage']
+        return self._get(id, 'ctkimage')
+
+
+LAZY_READERS = (LazySummoners, LazyRunes, LazyChampions, LazyItems)
+_indexes = {}
+
+
+def index_path(version: str) -> str:
+    """
+    Path to the prebuilt index of ddragon data.
+    :param version: Version of the data.
+    :return: Path to the file.
+    """
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), 'ddragon', version, 'index.json')
+
+
+def build_index(version: str) -> dict[str, dict[str, dict]]:
+    """
+    Builds compact index of everything the lazy readers need from the data files and saves it next to them.
+    :param version: Version of the data.
+    :return: Dictionary of lazy reader class name: its list of images.
+    """
+    index = {reader.__name__: reader.read_data(version) for reader in LAZY_READERS}
+    path = index_path(version)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(f'{path}.tmp', path)
+    _indexes[version] = index
+    logging.info(f'Ddragon index of version {version} built.')
+    return index
+
+
+def load_index(version: str) -> dict[str, dict[str, dict]]:
+    """
+    Loads prebuilt index of ddragon data with a single read, builds it if it doesn't exist yet.
+    :param version: Version of the data.
+    :return: Dictionary of lazy reader class name: its list of images.
+    """
+    if version not in _indexes:
+        try:
+            with open(index_path(version), encoding='utf-8') as f:
+                _indexes[version] = json.load(f)
+        except (OSError, ValueError):
+            return build_index(version)
+    return _indexes[version]
@@ -0,0 +1,100 @@
+import common.data_models as data_models
+from datetime import datetime, timedelta
+from typing import Callable
+import json
+import os
+import sys
+import time
+
+"""
+Compares building data models from parsed JSON with validating them straight from response bytes.
+Run from frontend_service folder: python validation_benchmark.py [folder]
+The folder may contain recorded match_detail responses as .json files, representative matches are generated without it.
+"""
+
+PAYLOADS = 100
+REPEATS = 15
+
+
+def generated_payloads(count: int) -> list[bytes]:
+    """
+    Generates match_detail responses with ten participants having stats and tags.
+    :param count: Number of payloads.
+    :return: List of JSON encoded matches.
+    """
+    server = data_models.Server(id=1, cluster='europe', server='EUW1')
+    payloads = []
+    for i in range(count):
+        participants = []
+        for j in range(10):
+            participants.append(data_models.Participant(
+                summoner=data_models.Summoner(
+                    puu_id=f'{i:040d}{j:038d}', name=f'Player{j}', tagline='EUW', server=server, profile_icon=4000 + j,
+                    summoner_level=100 + j, revision_date=datetime(2024, 3, 1, 12, j),
+                    tags=[data_models.AssignedTag(tag=data_models.Tag.TILTER, added=datetime(2024, 2, 1, 10, j),
+                                                  severity=data_models.Severity.LOW, note='Gave up after first drake.')]
+                ),
+                team_red=j >= 5, role=data_models.Role(id=j % 5, name='TOP'), summ_spell1=4, summ_spell2=14,
+                champion=j + 1, mastery_points=123456, bot=False, primary_runes=8000, secondary_runes=8100,
+                runes=[8005, 9111, 9104, 8299, 8139, 8135], small_runes=[5005, 5008, 5001],
+                stats=data_models.ParticipantStats(kills=j, deaths=3, assists=7, item0=3078, item1=3053, item2=3071,
+                                                   item3=3047, item4=6333, item5=0, item6=3364, total_gold=12000,
+                                                   cs=180)
+            ))
+        match = data_models.Match(
+            server=server, match_id=6800000000 + i, match_type='CLASSIC', match_start=datetime(2024, 3, 1, 12),
+            participants=participants,
+            match_detail=data_models.MatchDetail(match_creation=datetime(2024, 3, 1, 11, 58),
+                                                 match_end=datetime(2024, 3, 1, 12, 31),
+                                                 match_duration=timedelta(minutes=31), game_version='14.4.1',
+                                                 winning_team_red=bool(i % 2))
+        )
+        payloads.append(match.model_dump_json().encode())
+    return payloads
+
+
+def recorded_payloads(folder: str) -> list[bytes]:
+    """
+    Reads recorded match_detail responses.
+    :param folder: Folder with .json files.
+    :return: List of JSON encoded matches.
+    """
+    payloads = []
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith('.json'):
+            with open(os.path.join(folder, filename), 'rb') as f:
+                payloads.append(f.read())
+    return payloads
+
+
+def best_time(fn: Callable) -> float:
+    """
+    Runs a function REPEATS times.
+    :param fn: The function.
+    :return: The shortest run in seconds, the least affected by other load on the machine.
+    """
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark(payloads: list[bytes]) -> None:
+    """
+    Times both ways of building the models and checks they agree.
+    :param payloads: JSON encoded matches.
+    """
+    dict_time = best_time(lambda: [data_models.Match(**json.loads(payload)) for payload in payloads])
+    bytes_time = best_time(lambda: [data_models.Match.model_validate_json(payload) for payload in payloads])
+
+    assert [data_models.Match(**json.loads(payload)) for payload in payloads] == \
+           [data_models.Match.model_validate_json(payload) for payload in payloads]
+    size = sum(len(payload) for payload in payloads)
+    print(f'{len(payloads):>4} payloads, {size / 1024:8.1f} kB: json + dict {dict_time * 1000:8.3f} ms, '
+          f'from bytes {bytes_time * 1000:8.3f} ms ({dict_time / bytes_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    benchmark(recorded_payloads(sys.argv[1]) if len(sys.argv) > 1 else generated_payloads(PAYLOADS))
@@ -1,4 +1,5 @@
-from .shared import TagFrame, ParticipantStatsFrame, AlertFrame
+from .shared import TagFrame, ParticipantStatsFrame, AlertFrame, VirtualList, configure_changed, set_visible, \
+    count_widgets
 import customtkinter as ctk
 import common.data_models as data_models
 from typing import Callable
@@ -14,41 +15,61 @@ class ParticipantAlertsBar(ctk.CTkScrollableFrame):
     The horizontal bar under Participant that shows alerts.
     """
 
-    def __init__(self, container: ctk.CTkFrame, participant: data_models.Participant, *args, **kwargs):
+    def __init__(self, container: ctk.CTkFrame, *args, **kwargs):
         """
         Inits ParticipantAlertsBar.
         :param container: Parent container.
-        :param participant: The participant object.
         """
         super().__init__(container,
                          height=28,
                          width=288,
                          orientation='horizontal',
-                         scrollbar_button_color=None if participant.has_history else 'red',
                          *args,
                          **kwargs)
 
         self._obj_list = []
-        alerts = []
+        self._tooltips = []
 
+    def show_alerts(self, participant: data_models.Participant) -> None:
+        """
+        Shows alerts of a participant. Labels are reused and reconfigured only when the alert they show changed.
+        :param participant: The participant object.
+        """
+        configure_changed(self, scrollbar_button_color=ctk.ThemeManager.theme['CTkScrollbar']['button_color']
+                          if participant.has_history else 'red')
+
+        alerts = []
         if participant.alerts:
             alerts = sorted(participant.alerts, key=lambda x: x.priority, reverse=False)
 
         logging.debug(f'Alerts to display for summoner {participant.summoner.name}: {alerts}')
 
         for i, alert in enumerate(alerts):
-            alertlabel = ctk.CTkLabel(self,
-                                      text=f'{alert.name}',
-                                      text_color='white',
-                                      fg_color=alert.color,
-                                      font=('Tahoma', 16),
-                                      width=40,
-                                      height=20)
-            alertlabel.grid(row=0, column=i, padx=(5, 5), sticky='NSEW')
+            if i == len(self._obj_list):
+                alertlabel = ctk.CTkLabel(self,
+                                          text='',
+                                          text_color='white',
+                                          font=('Tahoma', 16),
+                                          width=40,
+                                          height=20)
+                alertlabel.grid(row=0, column=i, padx=(5, 5), sticky='NSEW')
+                self._obj_list.append(alertlabel)
+                self._tooltips.append(CTkToolTip(alertlabel, delay=.5, message=alert.detail))
+            elif self._tooltips[i].get() != alert.detail:
+                self._tooltips[i].configure(message=alert.detail)
 
-            detail_tooltip = CTkToolTip(alertlabel, delay=.5, message=alert.detail)
+            configure_changed(self._obj_list[i], text=f'{alert.name}', fg_color=alert.color)
+            set_visible(self._obj_list[i], True)
 
-            self._obj_list.append(alertlabel)
+        for alertlabel in self._obj_list[len(alerts):]:
+            set_visible(alertlabel, False)
+
+    def teardown(self) -> None:
+        """
+        Hides all alerts.
+        """
+        for alertlabel in self._obj_list:
+            set_visible(alertlabel, False)
 
 
 class AddTagWindow(utils.Observable, ctk.CTkToplevel):
@@ -141,9 +162,6 @@ class ChampFrame(utils.Observable, ctk.CTkFrame):
         """
         super().__init__(container, height=588, width=308, *args, **kwargs)
 
-        self.summ2_frame = None
-        self.summ1_frame = None
-        self.summ_button = None
         self.rowconfigure(0, weight=20)
         self.rowconfigure(1, weight=1)
         self.lazychampions = None
@@ -151,7 +169,7 @@ class ChampFrame(utils.Observable, ctk.CTkFrame):
         self.lazysummoners = None
 
         self._participant = None
-        self._obj_list = []
+        self._tag_window = None
 
         self.init_image = ctk.CTkImage(Image.open(os.path.join(
             os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'),
@@ -162,102 +180,143 @@ class ChampFrame(utils.Observable, ctk.CTkFrame):
                                         text='')
         self.champ_frame.grid(row=0)
 
-    @utils.logged_func
-    def show_new_participant(self, participant: data_models.Participant) -> None:
-        """
-        Show data for a new participant.
-        :param participant: The Participant object.
-        """
-        self._get_lazyreaders()
-
-        logging.debug(f'Showing new participant {participant.summoner.name}#{participant.summoner.tagline}')
-        self._participant = participant
-
-        self.champ_frame = ctk.CTkLabel(self,
-                                        image=self.lazychampions.get_image(str(self._participant.champion)),
-                                        text='')
-        self.champ_frame.grid(row=0)
-
+        # All widgets are created once and only reconfigured for every participant, so nothing piles up over matches.
         self.summ_button = ctk.CTkButton(self.champ_frame,
-                                         text=self._participant.summoner.name,
-                                         fg_color='red' if self._participant.team_red else 'blue',
-                                         hover_color='dark red' if self._participant.team_red else 'dark blue',
+                                         text='',
                                          border_width=0,
-                                         font=('Tahoma', 16))
-        self.summ_button.configure(command=lambda: self.select_participant(self._participant))
+                                         font=('Tahoma', 16),
+                                         command=lambda: self.select_participant(self._participant))
         self.summ_button.grid(row=0, column=0, sticky='s', pady=(20, 20))
 
-        self.summ1_frame = ctk.CTkLabel(self.champ_frame,
-                                        image=self.lazysummoners.get_image(str(self._participant.summ_spell1)),
-                                        text='')
+        self.summ1_frame = ctk.CTkLabel(self.champ_frame, text='')
         self.summ1_frame.grid(row=0, column=0, sticky='sw', pady=(63, 63), padx=(5, 5))
 
-        self.summ2_frame = ctk.CTkLabel(self.champ_frame,
-                                        image=self.lazysummoners.get_image(str(self._participant.summ_spell2)),
-                                        text='')
+        self.summ2_frame = ctk.CTkLabel(self.champ_frame, text='')
         self.summ2_frame.grid(row=0, column=0, sticky='sw', pady=(63, 63), padx=(75, 75))
 
-        for i, rune in enumerate(self._participant.runes[:4]):
-            runeframe = ctk.CTkLabel(self,
-                                     image=self.lazyrunes.get_image(str(rune)),
-                                     text='')
+        self.rune_frames = []
+        for i in range(4):
+            runeframe = ctk.CTkLabel(self, text='')
             runeframe.grid(row=0, column=0, sticky='se', pady=(128, 128), padx=(0, 5 + 40 * i))
-
-        for i, rune in enumerate(self._participant.runes[4:6]):
-            runeframe = ctk.CTkLabel(self,
-                                     image=self.lazyrunes.get_image(str(rune)),
-                                     text='')
+            self.rune_frames.append(runeframe)
+        for i in range(2):
+            runeframe = ctk.CTkLabel(self, text='')
             runeframe.grid(row=0, column=0, sticky='se', pady=(88, 88), padx=(0, 45 + 40 * i))
+            self.rune_frames.append(runeframe)
 
-        self.update_mutable_objects()
+        self.info_label = ctk.CTkLabel(self.champ_frame,
+                                       text='',
+                                       text_color='white',
+                                       font=('Tahoma', 16))
+        self.info_label.grid(row=0, column=0, sticky='n', pady=(20, 20))
+
+        self.tag_button = ctk.CTkButton(self,
+                                        text='ADD TAG',
+                                        border_width=0,
+                                        font=('Tahoma', 16),
+                                        command=self._open_tag_window)
+        self.tag_button.grid(row=1, column=0, sticky='NSEW', padx=(10, 10))
+
+        self.alertbar = ParticipantAlertsBar(self)
+        self.alertbar.grid(row=1, column=0, sticky='NSEW')
+
+        self._participant_widgets = [self.summ_button, self.summ1_frame, self.summ2_frame, *self.rune_frames,
+                                     self.info_label, self.tag_button, self.alertbar]
+        self.teardown()
 
     @utils.logged_func
-    def update_mutable_objects(self, participant: data_models.Participant = None) -> None:
+    def mount(self, participant: data_models.Participant) -> None:
         """
-        Updates the objects that change during lifecycle of a match.
+        Shows a new participant on the existing widgets.
         :param participant: The Participant object.
         """
+        self._get_lazyreaders()
+
+        logging.debug(f'Showing new participant {participant.summoner.name}#{participant.summoner.tagline}')
+        self._close_tag_window()
+        self._participant = participant
+
+        configure_changed(self.champ_frame, image=self.lazychampions.get_image(str(self._participant.champion)))
 
-        for obj in self._obj_list:
-            obj.destroy()
+        configure_changed(self.summ_button,
+                          text=self._participant.summoner.name,
+                          fg_color='red' if self._participant.team_red else 'blue',
+                          hover_color='dark red' if self._participant.team_red else 'dark blue')
+        set_visible(self.summ_button, True)
 
+        configure_changed(self.summ1_frame, image=self.lazysummoners.get_image(str(self._participant.summ_spell1)))
+        set_visible(self.summ1_frame, True)
+        configure_changed(self.summ2_frame, image=self.lazysummoners.get_image(str(self._participant.summ_spell2)))
+        set_visible(self.summ2_frame, True)
+
+        runes = self._participant.runes[:6]
+        for runeframe, rune in zip(self.rune_frames, runes):
+            configure_changed(runeframe, image=self.lazyrunes.get_image(str(rune)))
+            set_visible(runeframe, True)
+        for runeframe in self.rune_frames[len(runes):]:
+            set_visible(runeframe, False)
+
+        self.update_data()
+
+    @utils.logged_func
+    def update_data(self, participant: data_models.Participant = None) -> None:
+        """
+        Updates the objects that change during lifecycle of a match. Widgets are reused and only the values that
+        changed are reconfigured.
+        :param participant: The Participant object.
+        """
         if participant:
             self._participant = participant
             logging.debug(f'Updating displayed objects for {participant.summoner.name}#{participant.summoner.tagline}')
 
+        team_red = self._participant.team_red
         if self._participant.stats:
-            stats_label = ctk.CTkLabel(self.champ_frame,
-                                       text=f'{self._participant.stats.kills}/'
-                                            f'{self._participant.stats.deaths}/'
-                                            f'{self._participant.stats.assists}',
-                                       bg_color='red' if self._participant.team_red else 'blue',
-                                       text_color='white',
-                                       font=('Tahoma', 16))
-            stats_label.grid(row=0, column=0, sticky='n', pady=(20, 20))
-            self._obj_list.append(stats_label)
-
-            tag_button = ctk.CTkButton(self,
-                                       text='ADD TAG',
-                                       fg_color='red' if self._participant.team_red else 'blue',
-                                       hover_color='dark red' if self._participant.team_red else 'dark blue',
-                                       border_width=0,
-                                       font=('Tahoma', 16))
-            tag_button.configure(command=lambda participant=self._participant,
-                                                parent=self: AddTagWindow(parent, participant))
-            tag_button.grid(row=1, column=0, sticky='NSEW', padx=(10, 10))
-            self._obj_list.append(tag_button)
+            configure_changed(self.info_label,
+                              text=f'{self._participant.stats.kills}/'
+                                   f'{self._participant.stats.deaths}/'
+                                   f'{self._participant.stats.assists}',
+                              bg_color='red' if team_red else 'blue')
+            configure_changed(self.tag_button,
+                              fg_color='red' if team_red else 'blue',
+                              hover_color='dark red' if team_red else 'dark blue')
+            set_visible(self.alertbar, False)
+            set_visible(self.tag_button, True)
         else:
-            mastery_label = ctk.CTkLabel(self.champ_frame,
-                                         text=f'{self._participant.mastery_points:,}',
-                                         bg_color='red' if self._participant.team_red else 'blue',
-                                         text_color='white',
-                                         font=('Tahoma', 16))
-            mastery_label.grid(row=0, column=0, sticky='n', pady=(20, 20))
-            self._obj_list.append(mastery_label)
-
-            alertbar = ParticipantAlertsBar(self, self._participant)
-            alertbar.grid(row=1, column=0, sticky='NSEW')
-            self._obj_list.append(alertbar)
+            configure_changed(self.info_label,
+                              text=f'{self._participant.mastery_points:,}',
+                              bg_color='red' if team_red else 'blue')
+            self.alertbar.show_alerts(self._participant)
+            set_visible(self.tag_button, False)
+            set_visible(self.alertbar, True)
+        set_visible(self.info_label, True)
+
+    @utils.logged_func
+    def teardown(self) -> None:
+        """
+        Hides everything shown for the current participant and closes its windows, leaving the frame as it was created.
+        """
+        self._close_tag_window()
+        self._participant = None
+        configure_changed(self.champ_frame, image=self.init_image)
+        self.alertbar.teardown()
+        for widget in self._participant_widgets:
+            set_visible(widget, False)
+
+    @utils.logged_func
+    def _open_tag_window(self) -> None:
+        """
+        Opens a window for adding a tag to the current participant, closing the previous one.
+        """
+        self._close_tag_window()
+        self._tag_window = AddTagWindow(self, self._participant)
+
+    def _close_tag_window(self) -> None:
+        """
+        Destroys the window for adding a tag, if it is still open.
+        """
+        if self._tag_window is not None and self._tag_window.winfo_exists():
+            self._tag_window.destroy()
+        self._tag_window = None
 
     @utils.logged_func
     def select_participant(self, participant: data_models.Participant):
@@ -308,66 +367,80 @@ class ParticipantInfoFrame(ctk.CTkScrollableFrame):
         super().__init__(*args, height=1176, width=438, **kwargs)
 
         self.lazychampions = None
-        self._obj_list = []
+        self.statsframe = None
+
+        # Tags and alerts can be hundreds, so only the rows in view get a frame.
+        self.rows = VirtualList(self,
+                                {
+                                    data_models.AssignedTag: (TagFrame, TagFrame.show_tag),
+                                    data_models.Alert: (AlertFrame, AlertFrame.show_alert)
+                                },
+                                row_height=150,
+                                width=438)
+        self.rows.grid(row=10, column=0, sticky='nw')
+
+        self.nameframe = ctk.CTkFrame(self,
+                                      height=130,
+                                      width=418)
+        self.nameframe.grid(row=0, column=0, pady=(10, 10), padx=(10, 10), sticky='w')
+        self.nameframe.grid_remove()
+
+        self.champ_icon = ctk.CTkLabel(self.nameframe, text='')
+        self.champ_icon.grid(row=0, sticky='nw', pady=(5, 5), padx=(10, 10))
+
+        self.namelabel = ctk.CTkLabel(self.nameframe,
+                                      text='',
+                                      text_color='white',
+                                      width=278,
+                                      height=21
+                                      )
+        self.namelabel.grid(row=0, sticky='ns', pady=(5, 5), padx=(140, 10))
 
     @utils.logged_func
     def show_data(self, participant: data_models.Participant) -> None:
         """
-        Show data about provided participant.
+        Show data about provided participant. Frames shown for the previous participant are reused and only the values
+        that differ are reconfigured.
         :param participant: The Participant object.
         """
         logging.debug(f'show_data participant: {participant}')
 
-        for obj in self._obj_list:
-            obj.destroy()
-
-        nameframe = ctk.CTkFrame(self,
-                                 height=130,
-                                 width=418,
-                                 fg_color='red' if participant.team_red else 'blue'
-                                 )
-        nameframe.grid(row=0, column=0, pady=(10, 10), padx=(10, 10), sticky='w')
-
         self.lazychampions = utils.LazyChampions(None)
 
-        champ_icon = ctk.CTkLabel(nameframe,
-                                  image=self.lazychampions.get_icon_image(str(participant.champion)),
-                                  text='')
-        champ_icon.grid(row=0, sticky='nw', pady=(5, 5), padx=(10, 10))
-
-        namelabel = ctk.CTkLabel(nameframe,
-                                 text=f'Information about: {participant.summoner.name}#'
-                                      f'{participant.summoner.tagline}',
-                                 text_color='white',
-                                 fg_color='red' if participant.team_red else 'blue',
-                                 width=278,
-                                 height=21
-                                 )
-        namelabel.grid(row=0, sticky='ns', pady=(5, 5), padx=(140, 10))
-        self._obj_list.append(nameframe)
+        team_color = 'red' if participant.team_red else 'blue'
+        configure_changed(self.nameframe, fg_color=team_color)
+        configure_changed(self.champ_icon, image=self.lazychampions.get_icon_image(str(participant.champion)))
+        configure_changed(self.namelabel,
+                          text=f'Information about: {participant.summoner.name}#{participant.summoner.tagline}',
+                          fg_color=team_color)
+        set_visible(self.nameframe, True)
 
         if participant.stats:
-            statsframe = ParticipantStatsFrame(self,
-                                               participant,
-                                               border_color='goldenrod',
-                                               border_width=1)
-            statsframe.grid(row=1, column=0, pady=(10, 10), padx=(10, 10))
-            self._obj_list.append(statsframe)
-
-        if participant.summoner.tags:
-            for i, tag in enumerate(participant.summoner.tags):
-                logging.debug(f'tag: {tag}')
-                tagframe = TagFrame(self, tag)
-                tagframe.grid(row=10 + i, column=0, pady=(10, 10), padx=(10, 10), sticky='w')
-                self._obj_list.append(tagframe)
+            if self.statsframe is None:
+                self.statsframe = ParticipantStatsFrame(self,
+                                                        participant,
+                                                        border_color='goldenrod',
+                                                        border_width=1)
+                self.statsframe.grid(row=1, column=0, pady=(10, 10), padx=(10, 10))
+            else:
+                self.statsframe.show_stats(participant)
+                set_visible(self.statsframe, True)
+        elif self.statsframe is not None:
+            set_visible(self.statsframe, False)
 
-        if participant.alerts:
-            already_there = len(self._obj_list)
-            for i, alert in enumerate(participant.alerts):
-                if alert.priority < 10:
-                    alertframe = AlertFrame(self, alert)
-                    alertframe.grid(row=10 + i + already_there, column=0, pady=(10, 10), padx=(10, 10), sticky='w')
-                    self._obj_list.append(alertframe)
+        tags = participant.summoner.tags or []
+        alerts = [alert for alert in participant.alerts or [] if alert.priority < 10]
+        self.rows.set_items(tags + alerts)
+
+    @utils.logged_func
+    def teardown(self) -> None:
+        """
+        Hides data of the previous match.
+        """
+        set_visible(self.nameframe, False)
+        if self.statsframe is not None:
+            set_visible(self.statsframe, False)
+        self.rows.set_items([])
 
 
 class ActiveMatchView(utils.Observable, ctk.CTkFrame):
@@ -375,6 +448,9 @@ class ActiveMatchView(utils.Observable, ctk.CTkFrame):
     The Frame showing information about match currently played by the user, or the most recently finished one.
     """
 
+    # Walking the whole widget tree is slow, so widget leaks are only logged when asked for explicitly.
+    log_live_widgets = os.getenv('LOG_LIVE_WIDGETS', '0') == '1'
+
     def __init__(self, *args, **kwargs):
         """
         Inits ActiveMatchView.
@@ -433,9 +509,31 @@ class ActiveMatchView(utils.Observable, ctk.CTkFrame):
         for k, v in update_dict.items():
             logging.debug(f'ActiveMatchView.update_champ_frames tries to update frame for frame {k}')
             if new_participant:
-                self._champ_frames[k].show_new_participant(v)
+                self._champ_frames[k].mount(v)
             else:
-                self._champ_frames[k].update_mutable_objects(v)
+                self._champ_frames[k].update_data(v)
+
+        if new_participant and self.log_live_widgets:
+            logging.info(f'ActiveMatchView live widgets: {self.live_widgets()}')
+
+    @utils.logged_func
+    def teardown(self) -> None:
+        """
+        Tears down everything shown for the previous match.
+        """
+        for champ_frame in self._champ_frames.values():
+            champ_frame.teardown()
+        self.infoframe.teardown()
+
+    def live_widgets(self) -> dict[str, int]:
+        """
+        Counts widgets currently alive under every frame, used for debugging widget leaks.
+        :return: Dictionary with frame name as key and number of its widgets as value.
+        """
+        counts = {k: count_widgets(v) for k, v in self._champ_frames.items()}
+        counts['infoframe'] = count_widgets(self.infoframe)
+        counts['total'] = count_widgets(self.winfo_toplevel())
+        return counts
 
     def bind_champframes_events(self, event: str, fn: Callable) -> None:
         """
@@ -2,6 +2,7 @@ from .root import RootView
 from .loading import LoadingView
 from .active_match import ActiveMatchView
 from .settings import SettingsView
+import common.data_models as data_models
 import customtkinter as ctk
 import utils
 import logging
@@ -63,6 +64,45 @@ class View (utils.Observable):
         self.lazyitems = utils.LazyItems(self.version)
         logging.info(f'Lazyreaders initialized with version {self.version}')
 
+    @utils.logged_func
+    def build_image_cache(self, loading_object: utils.TrackingLoadingProgress, start: float, end: float) -> None:
+        """
+        Builds disk cache of resized images for all lazy readers, reporting progress between start and end.
+        :param loading_object: The object tracking the progress.
+        :param start: Progress at the start of building.
+        :param end: Progress at the end of building.
+        """
+        lazyreaders = (self.lazychampions, self.lazysummoners, self.lazyrunes, self.lazyitems)
+        step = (end - start) / len(lazyreaders)
+        for i, lazyreader in enumerate(lazyreaders):
+            name = lazyreader.__class__.__name__
+            lazyreader.build_cache(
+                lambda fraction, i=i, name=name: loading_object.update_progress(start + step * (i + fraction),
+                                                                                f'Caching images of {name}...'))
+
+    @utils.logged_func
+    def warm_lazyreaders(self) -> None:
+        """
+        Starts decoding small images of all lazy readers while the UI is idle.
+        """
+        for lazyreader in (self.lazychampions, self.lazysummoners, self.lazyrunes, self.lazyitems):
+            lazyreader.warm(self.root)
+
+    @utils.logged_func
+    def preload_images(self, participants: list[data_models.Participant]) -> None:
+        """
+        Starts decoding images shown for participants in worker threads.
+        :param participants: Participants of the match.
+        """
+        if self.lazychampions is None:
+            return
+
+        champions = [str(p.champion) for p in participants]
+        self.lazychampions.preload(champions, 'ctkimage')
+        self.lazychampions.preload(champions, 'iconimage')
+        self.lazysummoners.preload([str(spell) for p in participants for spell in (p.summ_spell1, p.summ_spell2)])
+        self.lazyrunes.preload([str(rune) for p in participants for rune in p.runes[:6]])
+
     @utils.logged_func
     def _startup_process(self) -> None:
         """
@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from tkinter import messagebox
+import tkinter as tk
 import common.data_models as data_models
 import utils
 import logging
@@ -24,32 +25,208 @@ def enable_button(*args, button: ctk.CTkButton, **kwargs) -> None:
         button.configure(state='disabled')
 
 
+def configure_changed(widget: ctk.CTkBaseClass, **options) -> bool:
+    """
+    Configures only the options of a widget whose values differ from the ones set by the previous call, so reused
+    widgets are not redrawn when their data didn't change.
+    :param widget: The widget to be configured.
+    :param options: Options to be set.
+    :return: True if any option was changed.
+    """
+    shown = widget.__dict__.setdefault('_shown_options', {})
+    changed = {k: v for k, v in options.items() if k not in shown or not (shown[k] is v or shown[k] == v)}
+    if changed:
+        widget.configure(**changed)
+        shown.update(changed)
+    return bool(changed)
+
+
+def set_text(textbox: ctk.CTkTextbox, text: str) -> bool:
+    """
+    Replaces text of a read only textbox if it differs from the shown one.
+    :param textbox: The textbox.
+    :param text: Text to be shown.
+    :return: True if the text was changed.
+    """
+    if textbox.__dict__.get('_shown_text') == text:
+        return False
+    textbox.configure(state='normal')
+    textbox.delete('0.0', 'end')
+    textbox.insert(index='0.0', text=text)
+    textbox.configure(state='disabled')
+    textbox._shown_text = text
+    return True
+
+
+def set_visible(widget: ctk.CTkBaseClass, visible: bool) -> None:
+    """
+    Shows or hides a widget managed by grid, keeping its grid options. Does nothing when the widget is already in the
+    requested state.
+    :param widget: The widget gridded at least once before.
+    :param visible: True to show the widget, False to hide it.
+    """
+    if visible and not widget.grid_info():
+        widget.grid()
+    elif not visible and widget.grid_info():
+        widget.grid_remove()
+
+
+def count_widgets(widget: tk.Misc) -> int:
+    """
+    Counts all widgets under a widget, including toplevel windows it owns.
+    :param widget: The widget.
+    :return: Number of descendant widgets.
+    """
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Column of equally tall rows inside a CTkScrollableFrame that creates widgets only for rows in the visible part of
+    the scrollable frame. Rows scrolled out of view are recycled for the rows scrolled in, so the number of widgets
+    doesn't depend on the number of items.
+    """
+
+    overscan = 1
+
+    def __init__(self,
+                 container: ctk.CTkScrollableFrame,
+                 rows: dict[type, tuple[Callable, Callable]],
+                 row_height: int,
+                 width: int,
+                 padding: int = 10,
+                 *args,
+                 **kwargs):
+        """
+        Inits VirtualList.
+        :param container: The scrollable frame the list is gridded in.
+        :param rows: For every type of item a function creating a row widget from the list and an item, and a function
+            showing an item on an existing row widget.
+        :param row_height: Height of a row including its padding.
+        :param width: Width of the list.
+        :param padding: Space left of every row and above it.
+        """
+        super().__init__(container, height=0, width=width, fg_color='transparent', *args, **kwargs)
+
+        self.container = container
+        self.rows = rows
+        self.row_height = row_height
+        self.padding = padding
+        self._items = []
+        self._shown = {}
+        self._free = {row_type: [] for row_type in rows}
+        self._refresh_pending = False
+
+        # Refresh whenever the view of the scrollable frame moves, keeping its scrollbar updated. CTkScrollableFrame
+        # has no public hook for scrolling, so its private _parent_canvas and _scrollbar are used, as laid out in
+        # customtkinter 5.2.2 pinned in requirements.txt. Check them when upgrading customtkinter.
+        scrollbar_set = container._scrollbar.set
+
+        def yscrollcommand(*scroll_args) -> None:
+            scrollbar_set(*scroll_args)
+            self._schedule_refresh()
+
+        container._parent_canvas.configure(yscrollcommand=yscrollcommand)
+        self.bind('<Configure>', lambda e: self._schedule_refresh(), add='+')
+
+    def set_items(self, items: list) -> None:
+        """
+        Sets items of the list. Rows already shown are reused and reconfigured for the new items.
+        :param items: Items to be shown.
+        """
+        self._items = list(items)
+        configure_changed(self, height=max(len(self._items) * self.row_height, 1))
+        for index, (row_type, row) in list(self._shown.items()):
+            if index < len(self._items) and type(self._items[index]) is row_type:
+                self.rows[row_type][1](row, self._items[index])
+            else:
+                self._release(index)
+        self._refresh()
+
+    def _schedule_refresh(self) -> None:
+        """
+        Refreshes the rows once tkinter is idle, merging many scroll events into one refresh.
+        """
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._refresh)
+
+    def _visible_range(self) -> range:
+        """
+        Indices of items in the visible part of the scrollable frame, extended by overscan rows on both sides.
+        :return: Range of item indices.
+        """
+        canvas = self.container._parent_canvas
+        row_height = self._apply_widget_scaling(self.row_height)
+        top = canvas.canvasy(0) - self.winfo_y()
+        bottom = top + canvas.winfo_height()
+        first = max(int(top // row_height) - self.overscan, 0)
+        last = min(int(bottom // row_height) + self.overscan, len(self._items) - 1)
+        return range(first, last + 1)
+
+    def _refresh(self) -> None:
+        """
+        Shows rows for items in the visible range, recycling rows of items that got out of it.
+        """
+        self._refresh_pending = False
+        if not self.winfo_exists():
+            return
+
+        visible = self._visible_range()
+        for index in list(self._shown):
+            if index not in visible:
+                self._release(index)
+
+        for index in visible:
+            if index in self._shown:
+                continue
+            item = self._items[index]
+            create, show = self.rows[type(item)]
+            free = self._free[type(item)]
+            if free:
+                row = free.pop()
+                show(row, item)
+            else:
+                row = create(self, item)
+            row.place(x=self.padding, y=index * self.row_height + self.padding)
+            self._shown[index] = (type(item), row)
+
+    def _release(self, index: int) -> None:
+        """
+        Hides the row of an item and keeps it for reuse.
+        :param index: Index of the item.
+        """
+        row_type, row = self._shown.pop(index)
+        row.place_forget()
+        self._free[row_type].append(row)
+
+
 class TagFrame(ctk.CTkFrame):
     """
     Frame showing all the information about a tag.
     """
 
+    INNER_COLOR = {
+        data_models.Severity.LOW: 'salmon',
+        data_models.Severity.MEDIUM: 'indian red',
+        data_models.Severity.HIGH: 'red3'
+    }
+
+    OUTER_COLOR = {
+        data_models.Tag.INTER: 'firebrick4',
+        data_models.Tag.TILTER: 'purple4',
+        data_models.Tag.FLAMER: 'orange red',
+        data_models.Tag.UNDERPERFORMER: 'DodgerBlue4',
+        data_models.Tag.OVERPERFORMER: 'dark green',
+        data_models.Tag.ONETRICK: 'goldenrod1'
+    }
+
     def __init__(self, container: ctk.CTkFrame, tag: data_models.AssignedTag, *args, **kwargs):
         """
         Inits TagFrame.
         :param container: Parent container.
         :param tag: Tag to be displayed.
         """
-        self.INNER_COLOR = {
-            tag.severity.LOW: 'salmon',
-            tag.severity.MEDIUM: 'indian red',
-            tag.severity.HIGH: 'red3'
-        }
-
-        self.OUTER_COLOR = {
-            tag.tag.INTER: 'firebrick4',
-            tag.tag.TILTER: 'purple4',
-            tag.tag.FLAMER: 'orange red',
-            tag.tag.UNDERPERFORMER: 'DodgerBlue4',
-            tag.tag.OVERPERFORMER: 'dark green',
-            tag.tag.ONETRICK: 'goldenrod1'
-        }
-
         super().__init__(container, height=130, width=418, fg_color=self.OUTER_COLOR[tag.tag], *args, **kwargs)
 
         self.grid_propagate(False)
@@ -62,26 +239,22 @@ class TagFrame(ctk.CTkFrame):
         self.columnconfigure(1, weight=2)
 
         self.datetimelabel = ctk.CTkLabel(self,
-                                          text=f'{tag.added.strftime("%d.%m.%Y")}\n'
-                                               f'{tag.added.strftime("%H:%M:%S")}',
+                                          text='',
                                           text_color='white',
-                                          fg_color=self.INNER_COLOR[tag.severity],
                                           width=114,
                                           height=41)
         self.datetimelabel.grid(row=0, column=0, pady=(2, 2), padx=(2, 2), sticky='NSEW')
 
         self.taglabel = ctk.CTkLabel(self,
-                                     text=f'{tag.tag}',
+                                     text='',
                                      text_color='white',
-                                     fg_color=self.INNER_COLOR[tag.severity],
                                      width=114,
                                      height=41)
         self.taglabel.grid(row=1, column=0, pady=(2, 2), padx=(2, 2), sticky='NSEW')
 
         self.severitylabel = ctk.CTkLabel(self,
-                                          text=f'{tag.severity}',
+                                          text='',
                                           text_color='white',
-                                          fg_color=self.INNER_COLOR[tag.severity],
                                           width=114,
                                           height=41)
         self.severitylabel.grid(row=2, column=0, pady=(2, 2), padx=(2, 2), sticky='NSEW')
@@ -89,13 +262,27 @@ class TagFrame(ctk.CTkFrame):
         self.note_text = ctk.CTkTextbox(self,
                                         text_color='white',
                                         wrap='word',
-                                        fg_color=self.INNER_COLOR[tag.severity],
                                         width=280,
                                         height=128)
         self.note_text.grid(row=0, column=1, rowspan=3, pady=(2, 2), padx=(2, 2), sticky='NSEW')
         self.note_text.grid_propagate(False)
-        self.note_text.insert(index="0.0", text=f'{tag.note}')
-        self.note_text.configure(state='disabled')
+
+        self.show_tag(tag)
+
+    def show_tag(self, tag: data_models.AssignedTag) -> None:
+        """
+        Shows a tag, reconfiguring only what differs from the tag shown before.
+        :param tag: Tag to be displayed.
+        """
+        inner_color = self.INNER_COLOR[tag.severity]
+        configure_changed(self, fg_color=self.OUTER_COLOR[tag.tag])
+        configure_changed(self.datetimelabel,
+                          text=f'{tag.added.strftime("%d.%m.%Y")}\n{tag.added.strftime("%H:%M:%S")}',
+                          fg_color=inner_color)
+        configure_changed(self.taglabel, text=f'{tag.tag}', fg_color=inner_color)
+        configure_changed(self.severitylabel, text=f'{tag.severity}', fg_color=inner_color)
+        configure_changed(self.note_text, fg_color=inner_color)
+        set_text(self.note_text, f'{tag.note}')
 
 
 class AlertFrame(ctk.CTkFrame):
@@ -120,9 +307,8 @@ class AlertFrame(ctk.CTkFrame):
         self.columnconfigure(0, weight=1)
 
         self.alertlabel = ctk.CTkLabel(self,
-                                       text=f'{alert.name}',
+                                       text='',
                                        text_color='white',
-                                       fg_color=alert.color,
                                        width=114,
                                        height=41)
         self.alertlabel.grid(row=0, column=0, pady=(2, 2), padx=(2, 2), sticky='NSEW')
@@ -130,13 +316,22 @@ class AlertFrame(ctk.CTkFrame):
         self.note_text = ctk.CTkTextbox(self,
                                         text_color='white',
                                         wrap='word',
-                                        fg_color=alert.color,
                                         width=260,
                                         height=128)
         self.note_text.grid(row=1, column=0, rowspan=2, pady=(2, 2), padx=(2, 2), sticky='NSEW')
         self.note_text.grid_propagate(False)
-        self.note_text.insert(index="0.0", text=f'{alert.detail}')
-        self.note_text.configure(state='disabled')
+
+        self.show_alert(alert)
+
+    def show_alert(self, alert: data_models.Alert) -> None:
+        """
+        Shows an alert, reconfiguring only what differs from the alert shown before.
+        :param alert: Alert to be displayed.
+        """
+        configure_changed(self, fg_color=alert.color)
+        configure_changed(self.alertlabel, text=f'{alert.name}', fg_color=alert.color)
+        configure_changed(self.note_text, fg_color=alert.color)
+        set_text(self.note_text, f'{alert.detail}')
 
 
 class ItemsFrame(ctk.CTkFrame):
@@ -162,22 +357,24 @@ class ItemsFrame(ctk.CTkFrame):
 
         self.lazyitems = utils.LazyItems('')
 
-        for i, item in enumerate(items[:3]):
-            itemframe = ctk.CTkLabel(self,
-                                     image=self.lazyitems.get_image(str(item)),
-                                     text='')
-            itemframe.grid(row=0, column=i, pady=(1, 1), padx=(1, 1))
+        self._item_labels = []
+        for i in range(7):
+            itemframe = ctk.CTkLabel(self, text='')
+            if i < 6:
+                itemframe.grid(row=i // 3, column=i % 3, pady=(1, 1), padx=(1, 1))
+            else:
+                itemframe.grid(row=0, column=4, rowspan=2, pady=(1, 1), padx=(1, 1))
+            self._item_labels.append(itemframe)
 
-        for i, item in enumerate(items[3:6]):
-            itemframe = ctk.CTkLabel(self,
-                                     image=self.lazyitems.get_image(str(item)),
-                                     text='')
-            itemframe.grid(row=1, column=i, pady=(1, 1), padx=(1, 1))
+        self.show_items(items)
 
-        itemframe = ctk.CTkLabel(self,
-                                 image=self.lazyitems.get_image(str(items[6])),
-                                 text='')
-        itemframe.grid(row=0, column=4, rowspan=2, pady=(1, 1), padx=(1, 1))
+    def show_items(self, items: list) -> None:
+        """
+        Shows items, reconfiguring only the slots whose item changed.
+        :param items: List of items built.
+        """
+        for itemframe, item in zip(self._item_labels, items):
+            configure_changed(itemframe, image=self.lazyitems.get_image(str(item)))
 
 
 class ParticipantStatsFrame(ctk.CTkFrame):
@@ -199,9 +396,7 @@ class ParticipantStatsFrame(ctk.CTkFrame):
         self.columnconfigure(1, weight=1)
 
         self.items = ItemsFrame(self,
-                                [participant.stats.item0, participant.stats.item1, participant.stats.item2,
-                                 participant.stats.item3, participant.stats.item4, participant.stats.item5,
-                                 participant.stats.item6],
+                                self._items(participant),
                                 border_color='goldenrod',
                                 border_width=1)
         self.items.grid(row=0, column=0, pady=(0, 0), padx=(0, 0))
@@ -222,22 +417,43 @@ class ParticipantStatsFrame(ctk.CTkFrame):
         self.additional_frame.columnconfigure(0, weight=1)
 
         self.goldlabel = ctk.CTkLabel(self.additional_frame,
-                                      text=f'{participant.stats.total_gold} GOLD',
+                                      text='',
                                       text_color='yellow')
         self.goldlabel.grid(row=2, column=0, pady=(1, 1), padx=(1, 1), sticky='nswe')
 
         self.cslabel = ctk.CTkLabel(self.additional_frame,
-                                    text=f'{participant.stats.cs} CS',
+                                    text='',
                                     text_color='yellow')
         self.cslabel.grid(row=3, column=0, pady=(1, 1), padx=(1, 1), sticky='nswe')
 
         self.kdalabel = ctk.CTkLabel(self.additional_frame,
-                                     text=f'{participant.stats.kills}/'
-                                          f'{participant.stats.deaths}/'
-                                          f'{participant.stats.assists} KDA',
+                                     text='',
                                      text_color='yellow')
         self.kdalabel.grid(row=1, column=0, pady=(1, 1), padx=(1, 1), sticky='nswe')
 
+        self.show_stats(participant)
+
+    @staticmethod
+    def _items(participant: data_models.Participant) -> list[int]:
+        """
+        Lists items of a participant in the order they are shown.
+        :param participant: The participant.
+        :return: List of item ids.
+        """
+        return [participant.stats.item0, participant.stats.item1, participant.stats.item2, participant.stats.item3,
+                participant.stats.item4, participant.stats.item5, participant.stats.item6]
+
+    def show_stats(self, participant: data_models.Participant) -> None:
+        """
+        Shows stats of a participant, reconfiguring only what differs from the stats shown before.
+        :param participant: The participant.
+        """
+        self.items.show_items(self._items(participant))
+        configure_changed(self.goldlabel, text=f'{participant.stats.total_gold} GOLD')
+        configure_changed(self.cslabel, text=f'{participant.stats.cs} CS')
+        configure_changed(self.kdalabel,
+                          text=f'{participant.stats.kills}/{participant.stats.deaths}/{participant.stats.assists} KDA')
+
 
 class ChangeUserWindow(ctk.CTkToplevel):
     """